@@ -1,19 +1,20 @@
 # alerts/email_alerts.py
 
-import smtplib
-from email.message import EmailMessage
+from alerts.notifiers import Alert, EmailNotifier
+
 
 def send_alert(subject, body, to_email):
-    msg = EmailMessage()
-    msg.set_content(body)
-    msg["Subject"] = subject
-    msg["From"] = "youremail@gmail.com"
-    msg["To"] = to_email
+    """
+    Send one email right away using the BTC_SMTP_* settings.
+    For rate-limited, retried delivery to every channel use alerts.notifiers.Dispatcher.
+    """
+    notifier = EmailNotifier.from_env(recipients=[to_email])
+    if notifier is None:
+        print("❌ Failed to send email: BTC_SMTP_HOST is not set")
+        return
 
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-            smtp.login("youremail@gmail.com", "your-app-password")
-            smtp.send_message(msg)
-            print("✅ Alert sent to", to_email)
+        notifier.send(Alert(subject, body))
+        print("✅ Alert sent to", to_email)
     except Exception as e:
         print("❌ Failed to send email:", e)
@@ -0,0 +1,493 @@
+"""
+Multi-channel alert delivery: email, generic webhooks and chat webhooks.
+
+Alerts are first written to a SQLite `Outbox` (one row per channel), then a
+`Dispatcher` drains it on an asyncio loop. Each channel has its own token-bucket
+`RateLimiter` and the blocking SMTP/HTTP calls run on a thread pool, so a slow
+SMTP server never holds up a Slack message. Failed deliveries are retried with
+exponential backoff. A drain claims the rows it sends with a lease, so two
+drains running at once (say the background worker and a `Dispatcher.notify`)
+never send the same row; rows left pending, or claimed by a drain that
+crashed, are picked up by a later drain once due or once the lease expires
+(delivery is at-least-once).
+
+Channels are configured from the environment (see `notifiers_from_env`)::
+
+    BTC_SMTP_HOST, BTC_SMTP_PORT, BTC_SMTP_USER, BTC_SMTP_PASSWORD,
+    BTC_ALERT_FROM, BTC_ALERT_TO            # email (comma-separated recipients)
+    BTC_WEBHOOK_URL                         # JSON POST of the alert
+    BTC_SLACK_WEBHOOK_URL, BTC_DISCORD_WEBHOOK_URL
+
+    python -m alerts.notifiers --every 5    # background delivery worker
+    python -m benchmarks.notification_latency    # signal-to-delivery latency
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from utils.instrumentation import record
+
+DEFAULT_OUTBOX_PATH = Path(
+    os.environ.get("BTC_OUTBOX_DB", Path(__file__).resolve().parent / "outbox.sqlite3")
+)
+# (connect, read) seconds, as for the FRED fetcher
+WEBHOOK_TIMEOUT = (3.05, 10)
+PENDING, SENDING, DELIVERED, FAILED = "pending", "sending", "delivered", "failed"
+# Seconds a drain owns the rows it claimed; a row still 'sending' after this
+# (its drain crashed) is due again. Longer than any rate-limited send.
+LEASE = 600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    delivered_at REAL,
+    last_error TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt);
+"""
+
+
+@dataclass(frozen=True)
+class Alert:
+    """
+    One notification. ``created`` is when the triggering signal changed, so
+    delivery latency is measured from the market event, not from enqueueing.
+    """
+
+    subject: str
+    body: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    created: float = field(default_factory=time.time)
+
+
+@dataclass(frozen=True)
+class OutboxRow:
+    id: int
+    channel: str
+    alert: Alert
+    attempts: int
+
+
+class Notifier:
+    """
+    A delivery channel. `send` blocks and raises on failure; ``rate`` (messages
+    per second) and ``burst`` configure the channel's `RateLimiter`.
+    """
+
+    name = "notifier"
+    rate: Optional[float] = None
+    burst = 1
+
+    def send(self, alert: Alert) -> None:
+        raise NotImplementedError
+
+
+class EmailNotifier(Notifier):
+    """SMTP delivery; port 465 uses implicit TLS, ``starttls`` upgrades plain ports."""
+
+    name = "email"
+
+    def __init__(
+        self,
+        host: str,
+        recipients: Sequence[str],
+        sender: str,
+        port: int = 465,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = 10.0,
+        rate: Optional[float] = 1.0,
+        burst: int = 5,
+        name: str = "email",
+    ):
+        self.host, self.port = host, port
+        self.recipients = list(recipients)
+        self.sender = sender
+        self.username, self.password = username, password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.rate, self.burst = rate, burst
+        self.name = name
+
+    @classmethod
+    def from_env(cls, recipients: Optional[Sequence[str]] = None) -> Optional["EmailNotifier"]:
+        """None unless ``BTC_SMTP_HOST`` is set."""
+        host = os.environ.get("BTC_SMTP_HOST")
+        if not host:
+            return None
+        username = os.environ.get("BTC_SMTP_USER")
+        if recipients is None:
+            recipients = [addr.strip() for addr in os.environ.get("BTC_ALERT_TO", "").split(",") if addr.strip()]
+        return cls(
+            host,
+            recipients,
+            sender=os.environ.get("BTC_ALERT_FROM") or username or f"alerts@{host}",
+            port=int(os.environ.get("BTC_SMTP_PORT", 465)),
+            username=username,
+            password=os.environ.get("BTC_SMTP_PASSWORD"),
+            starttls=os.environ.get("BTC_SMTP_STARTTLS", "") not in ("", "0"),
+        )
+
+    def message(self, alert: Alert) -> EmailMessage:
+        msg = EmailMessage()
+        msg.set_content(alert.body)
+        msg["Subject"] = alert.subject
+        msg["From"] = self.sender
+        msg["To"] = ", ".join(self.recipients)
+        return msg
+
+    def send(self, alert: Alert) -> None:
+        if not self.recipients:
+            raise ValueError("EmailNotifier has no recipients (set BTC_ALERT_TO)")
+        smtp_class = smtplib.SMTP_SSL if self.port == 465 else smtplib.SMTP
+        with smtp_class(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+            smtp.send_message(self.message(alert))
+
+
+class WebhookNotifier(Notifier):
+    """POST the alert as JSON; any non-2xx response is a failure."""
+
+    name = "webhook"
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout=WEBHOOK_TIMEOUT,
+        rate: Optional[float] = 10.0,
+        burst: int = 10,
+        name: Optional[str] = None,
+    ):
+        self.url = url
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.rate, self.burst = rate, burst
+        self.name = name or type(self).name
+        self._local = threading.local()
+
+    def payload(self, alert: Alert) -> Dict[str, Any]:
+        return {"subject": alert.subject, "body": alert.body, "created": alert.created, **alert.data}
+
+    def _session(self):
+        # One keep-alive session per worker thread
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests  # imported lazily, as in data.fetch_fred
+
+            session = self._local.session = requests.Session()
+        return session
+
+    def send(self, alert: Alert) -> None:
+        response = self._session().post(self.url, json=self.payload(alert), headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class ChatWebhookNotifier(WebhookNotifier):
+    """
+    Slack- or Discord-style incoming webhook. Defaults follow their published
+    limits: about one message per second (Slack), five per two seconds (Discord).
+    """
+
+    STYLES = {"slack": ("text", 1.0, 1), "discord": ("content", 2.5, 5)}
+
+    def __init__(self, url: str, style: str = "slack", **options):
+        if style not in self.STYLES:
+            raise ValueError(f"Unknown chat style '{style}'. Use one of {', '.join(self.STYLES)}.")
+        self.style = style
+        key, rate, burst = self.STYLES[style]
+        self._key = key
+        options.setdefault("rate", rate)
+        options.setdefault("burst", burst)
+        options.setdefault("name", style)
+        super().__init__(url, **options)
+
+    def payload(self, alert: Alert) -> Dict[str, Any]:
+        bold = "*" if self.style == "slack" else "**"
+        return {self._key: f"{bold}{alert.subject}{bold}\n{alert.body}"}
+
+
+def notifiers_from_env() -> List[Notifier]:
+    """Every channel whose environment variables are set."""
+    notifiers: List[Notifier] = []
+    email = EmailNotifier.from_env()
+    if email is not None:
+        notifiers.append(email)
+    if os.environ.get("BTC_WEBHOOK_URL"):
+        notifiers.append(WebhookNotifier(os.environ["BTC_WEBHOOK_URL"]))
+    for style in ChatWebhookNotifier.STYLES:
+        url = os.environ.get(f"BTC_{style.upper()}_WEBHOOK_URL")
+        if url:
+            notifiers.append(ChatWebhookNotifier(url, style))
+    return notifiers
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all sends of one channel.
+
+    Each `acquire` reserves a token immediately (the bucket may go into debt)
+    and sleeps until it is due, so concurrent callers are spaced out. Tokens
+    are reserved under a thread lock, never held while sleeping, so the
+    limiter works across event loops running on different threads.
+    """
+
+    def __init__(self, rate: Optional[float], burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; seconds to wait before using it."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate) - 1
+            self._updated = now
+            tokens = self._tokens
+        return -tokens / self.rate if tokens < 0 else 0.0
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class Outbox:
+    """Persistent per-channel delivery queue in SQLite (WAL mode, thread-safe)."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else DEFAULT_OUTBOX_PATH
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}
+            if "lease_until" not in columns:  # outbox written before rows were claimed
+                conn.execute("ALTER TABLE outbox ADD COLUMN lease_until REAL")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def add(self, alert: Alert, channels: Iterable[str]) -> List[int]:
+        data = json.dumps(alert.data, default=str)
+        now = time.time()
+        ids = []
+        with self._connect() as conn:
+            for channel in channels:
+                cursor = conn.execute(
+                    "INSERT INTO outbox (channel, subject, body, data, created, next_attempt) VALUES (?, ?, ?, ?, ?, ?)",
+                    (channel, alert.subject, alert.body, data, alert.created, now),
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def due(
+        self,
+        channels: Iterable[str],
+        now: Optional[float] = None,
+        limit: int = 1000,
+        ids: Optional[Iterable[int]] = None,
+        lease: float = LEASE,
+    ) -> List[OutboxRow]:
+        """
+        Claim the rows for ``channels`` (only ``ids``, if given) that are due,
+        oldest first: pending rows whose next attempt has come and rows whose
+        lease has expired. Claimed rows are 'sending' for ``lease`` seconds, so
+        a concurrent drain does not get them too.
+        """
+        channels = list(channels)
+        ids = None if ids is None else list(ids)
+        if not channels or ids == []:
+            return []
+        now = time.time() if now is None else now
+        only = f"AND id IN ({', '.join('?' * len(ids))}) " if ids else ""
+        conn = self._connect()
+        with conn:
+            # Take the write lock first so the select and the update see the same rows
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"UPDATE outbox SET status = 'sending', lease_until = ? WHERE id IN ("
+                f"SELECT id FROM outbox WHERE ((status = 'pending' AND next_attempt <= ?) "
+                f"OR (status = 'sending' AND lease_until <= ?)) "
+                f"AND channel IN ({', '.join('?' * len(channels))}) {only}ORDER BY id LIMIT ?"
+                f") RETURNING id, channel, subject, body, data, created, attempts",
+                (now + lease, now, now, *channels, *(ids or ()), limit),
+            ).fetchall()
+        return [
+            OutboxRow(id_, channel, Alert(subject, body, json.loads(data), created), attempts)
+            for id_, channel, subject, body, data, created, attempts in sorted(rows)
+        ]
+
+    def delivered(self, row_id: int, at: Optional[float] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'delivered', attempts = attempts + 1, delivered_at = ?, lease_until = NULL "
+                "WHERE id = ?",
+                (time.time() if at is None else at, row_id),
+            )
+
+    def failed(self, row_id: int, error: str, retry_at: Optional[float]) -> None:
+        """Record a failed attempt; ``retry_at=None`` gives up on the row."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, next_attempt = ?, last_error = ?, "
+                "lease_until = NULL WHERE id = ?",
+                (PENDING if retry_at is not None else FAILED, retry_at or 0.0, error[:500], row_id),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {PENDING: 0, DELIVERED: 0, FAILED: 0, **dict(rows)}
+
+    def latencies(self, since: float = 0.0) -> List[Tuple[str, float]]:
+        """(channel, seconds from alert creation to delivery) for delivered rows."""
+        return self._connect().execute(
+            "SELECT channel, delivered_at - created FROM outbox WHERE status = 'delivered' AND created >= ? ORDER BY id",
+            (since,),
+        ).fetchall()
+
+
+class Dispatcher:
+    """
+    Fan alerts out to every channel concurrently.
+
+    `notify` enqueues and delivers one alert in one call (for scripts and the
+    Streamlit app; `notify_async` from code already on an event loop); `run`
+    is the long-lived worker loop that drains everything due.
+    """
+
+    def __init__(
+        self,
+        notifiers: Iterable[Notifier],
+        outbox: Optional[Outbox] = None,
+        max_attempts: int = 5,
+        base_retry: float = 2.0,
+        max_retry: float = 300.0,
+        max_concurrency: int = 16,
+        lease: float = LEASE,
+    ):
+        self.notifiers = {notifier.name: notifier for notifier in notifiers}
+        self.outbox = outbox or Outbox()
+        self.max_attempts = max_attempts
+        self.base_retry = base_retry
+        self.max_retry = max_retry
+        self.lease = lease
+        self.limiters = {name: RateLimiter(n.rate, n.burst) for name, n in self.notifiers.items()}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="notify")
+
+    def enqueue(self, alert: Alert, channels: Optional[Iterable[str]] = None) -> List[int]:
+        channels = list(self.notifiers) if channels is None else [c for c in channels if c in self.notifiers]
+        return self.outbox.add(alert, channels)
+
+    async def _deliver(self, row: OutboxRow) -> bool:
+        notifier = self.notifiers[row.channel]
+        await self.limiters[row.channel].acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, notifier.send, row.alert)
+        except Exception as exc:
+            attempts = row.attempts + 1
+            retry_at = None
+            if attempts < self.max_attempts:
+                retry_at = time.time() + min(self.base_retry * 2 ** (attempts - 1), self.max_retry)
+            self.outbox.failed(row.id, f"{type(exc).__name__}: {exc}", retry_at)
+            if retry_at is None:
+                print(f"❌ Giving up on {row.channel} alert '{row.alert.subject}': {exc}")
+            return False
+        delivered_at = time.time()
+        self.outbox.delivered(row.id, delivered_at)
+        record(f"alerts.deliver.{row.channel}", delivered_at - row.alert.created)
+        return True
+
+    async def drain(self, ids: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """
+        Deliver every due row (only ``ids``, if given) once; returns how many
+        were delivered and how many failed.
+        """
+        rows = self.outbox.due(self.notifiers, ids=ids, lease=self.lease)
+        results = await asyncio.gather(*(self._deliver(row) for row in rows))
+        delivered = sum(results)
+        return {"delivered": delivered, "failed": len(results) - delivered}
+
+    async def notify_async(self, alert: Alert, channels: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        # Only this alert's rows: the rest of the outbox belongs to the delivery worker
+        return await self.drain(self.enqueue(alert, channels))
+
+    def notify(self, alert: Alert, channels: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Blocking `notify_async`, for callers that are not on an event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.notify_async(alert, channels))
+        raise RuntimeError("Dispatcher.notify was called on a running event loop; await notify_async instead")
+
+    async def run(self, every: float = 5.0) -> None:
+        """Drain the outbox forever, once per ``every`` seconds."""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.drain()
+            except Exception as exc:  # pragma: no cover - keep the worker alive
+                print(f"Alert delivery failed: {exc}")
+            await asyncio.sleep(max(0.0, every - (time.monotonic() - started)))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "Dispatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == "__main__":  # pragma: no cover - background worker entry point
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deliver queued alerts.")
+    parser.add_argument("--every", type=float, default=5.0, help="seconds between outbox drains")
+    parser.add_argument("--db", default=None, help=f"SQLite path (default {DEFAULT_OUTBOX_PATH})")
+    parser.add_argument("--test", metavar="SUBJECT", help="queue a test alert on every channel first")
+    args = parser.parse_args()
+    channels = notifiers_from_env()
+    if not channels:
+        parser.error("No channels configured; set BTC_SMTP_HOST, BTC_WEBHOOK_URL or a chat webhook URL.")
+    dispatcher = Dispatcher(channels, Outbox(args.db))
+    if args.test:
+        dispatcher.enqueue(Alert(args.test, "Test alert from BTCpriceAlerts."))
+    print(f"Delivering to {', '.join(dispatcher.notifiers)} every {args.every:g}s")
+    asyncio.run(dispatcher.run(args.every))
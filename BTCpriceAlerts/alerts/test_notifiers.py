@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from alerts.email_alerts import send_alert
+from alerts.notifiers import (
+    Alert,
+    ChatWebhookNotifier,
+    Dispatcher,
+    EmailNotifier,
+    Outbox,
+    RateLimiter,
+    WebhookNotifier,
+)
+from alerts.testing import LocalSMTP, LocalWebhook
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def webhook():
+    server = LocalWebhook()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def smtp():
+    server = LocalSMTP()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return Outbox(tmp_path / "outbox.sqlite3")
+
+
+def test_fans_out_to_every_channel(webhook, smtp, outbox):
+    chat = LocalWebhook()
+    channels = [
+        EmailNotifier(smtp.host, ["a@example.com"], "alerts@example.com", port=smtp.port),
+        WebhookNotifier(webhook.url),
+        ChatWebhookNotifier(chat.url, "discord"),
+    ]
+    try:
+        with Dispatcher(channels, outbox) as dispatcher:
+            result = dispatcher.notify(Alert("RSI oversold", "RSI 27.5 on BTC-USD", {"ticker": "BTC-USD"}))
+    finally:
+        chat.close()
+    assert result == {"delivered": 3, "failed": 0}
+    assert b"Subject: RSI oversold" in smtp.received[0][1]
+    assert webhook.received[0][1]["ticker"] == "BTC-USD"
+    assert chat.received[0][1] == {"content": "**RSI oversold**\nRSI 27.5 on BTC-USD"}
+    assert outbox.counts()["delivered"] == 3
+    assert len(outbox.latencies()) == 3
+
+
+def test_slow_channel_does_not_delay_the_others(webhook, outbox):
+    slow = LocalWebhook(latency=0.3)
+    try:
+        with Dispatcher([WebhookNotifier(webhook.url), WebhookNotifier(slow.url, name="slow")], outbox) as dispatcher:
+            started = time.time()
+            dispatcher.notify(Alert("x", "y", created=started))
+    finally:
+        slow.close()
+    assert webhook.received[0][0] - started < 0.2
+    assert slow.received[0][0] - started >= 0.3
+
+
+def test_rate_limiter_spaces_out_sends():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2.0, burst=2, clock=clock)
+    assert [limiter.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now = 10.0
+    assert limiter.reserve() == 0.0
+    assert RateLimiter(None).reserve() == 0.0
+
+
+def test_rate_limiter_is_shared_safely_between_threads():
+    limiter = RateLimiter(rate=1.0, burst=1, clock=FakeClock())
+    delays = []
+
+    def reserve_many():
+        delays.extend(limiter.reserve() for _ in range(500))
+
+    threads = [threading.Thread(target=reserve_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Every token handed out exactly once: delays 0, 1, 2, ... with no repeats
+    assert sorted(delays) == [float(i) for i in range(4000)]
+
+
+def test_chat_channel_is_rate_limited(webhook, outbox):
+    with Dispatcher([ChatWebhookNotifier(webhook.url, "slack", rate=20.0, burst=1)], outbox) as dispatcher:
+        for i in range(4):
+            dispatcher.enqueue(Alert(f"alert {i}", "body"))
+        asyncio.run(dispatcher.drain())
+    times = sorted(at for at, _ in webhook.received)
+    assert len(times) == 4
+    assert times[-1] - times[0] >= 0.14
+
+
+def test_failures_are_retried_then_given_up(webhook, outbox):
+    webhook.fail = True
+    with Dispatcher([WebhookNotifier(webhook.url)], outbox, max_attempts=2, base_retry=0.0) as dispatcher:
+        assert dispatcher.notify(Alert("x", "y")) == {"delivered": 0, "failed": 1}
+        assert outbox.counts()["pending"] == 1
+        assert asyncio.run(dispatcher.drain()) == {"delivered": 0, "failed": 1}
+        assert outbox.counts() == {"pending": 0, "delivered": 0, "failed": 1}
+
+        webhook.fail = False
+        dispatcher.enqueue(Alert("retry", "z"))
+        webhook.fail = True
+        asyncio.run(dispatcher.drain())
+        webhook.fail = False
+        assert asyncio.run(dispatcher.drain()) == {"delivered": 1, "failed": 0}
+
+
+def test_outbox_survives_restart(webhook, tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+    with Dispatcher([WebhookNotifier(webhook.url)], Outbox(path)) as before_restart:
+        before_restart.enqueue(Alert("queued", "before restart"))
+    assert webhook.received == []
+    with Dispatcher([WebhookNotifier(webhook.url)], Outbox(path)) as after_restart:
+        assert asyncio.run(after_restart.drain()) == {"delivered": 1, "failed": 0}
+    assert webhook.received[0][1]["subject"] == "queued"
+
+
+def test_concurrent_drains_claim_disjoint_rows(tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+    first, second = Outbox(path), Outbox(path)
+    ids = [first.add(Alert(f"alert {i}", "body"), ["webhook"])[0] for i in range(4)]
+
+    claimed = first.due(["webhook"], limit=2)
+    assert [row.id for row in claimed] == ids[:2]
+    assert [row.id for row in second.due(["webhook"])] == ids[2:]
+    assert second.due(["webhook"]) == []
+    assert first.counts()["sending"] == 4
+
+    # A drain that died without reporting: its rows are due again after the lease
+    assert [row.id for row in second.due(["webhook"], now=time.time() + 3600)] == ids
+
+
+def test_notify_delivers_only_its_own_alert(webhook, outbox):
+    with Dispatcher([WebhookNotifier(webhook.url)], outbox) as dispatcher:
+        dispatcher.enqueue(Alert("queued", "for the worker"))
+        assert dispatcher.notify(Alert("now", "body")) == {"delivered": 1, "failed": 0}
+        assert [payload["subject"] for _, payload in webhook.received] == ["now"]
+        assert outbox.counts()["pending"] == 1
+
+
+def test_notify_async_runs_on_the_callers_loop(webhook, outbox):
+    with Dispatcher([WebhookNotifier(webhook.url)], outbox) as dispatcher:
+
+        async def from_a_loop():
+            with pytest.raises(RuntimeError):
+                dispatcher.notify(Alert("blocking", "body"))
+            return await dispatcher.notify_async(Alert("awaited", "body"))
+
+        assert asyncio.run(from_a_loop()) == {"delivered": 1, "failed": 0}
+    assert [payload["subject"] for _, payload in webhook.received] == ["awaited"]
+
+
+def test_unconfigured_channels_are_ignored(webhook, outbox):
+    with Dispatcher([WebhookNotifier(webhook.url)], outbox) as dispatcher:
+        assert dispatcher.enqueue(Alert("x", "y"), channels=["webhook", "email"]) == [1]
+
+
+def test_send_alert_uses_smtp_settings(smtp, monkeypatch, capsys):
+    monkeypatch.delenv("BTC_SMTP_HOST", raising=False)
+    send_alert("subject", "body", "a@example.com")
+    assert "BTC_SMTP_HOST is not set" in capsys.readouterr().out
+
+    monkeypatch.setenv("BTC_SMTP_HOST", smtp.host)
+    monkeypatch.setenv("BTC_SMTP_PORT", str(smtp.port))
+    send_alert("subject", "body", "a@example.com")
+    assert "Alert sent to a@example.com" in capsys.readouterr().out
+    assert b"To: a@example.com" in smtp.received[0][1]
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from alerts.rules import RuleError, RuleSet, evaluate_rule, stack_frames
+from data.synthetic import generate_ohlcv
+from signals.indicators import add_rsi
+from signals.registry import LazyIndicatorFrame
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return {
+        f"T{i}": LazyIndicatorFrame(generate_ohlcv(300, seed=i), ["rsi", "macd", "ma_cross", "bbands"]).to_frame()
+        for i in range(3)
+    }
+
+
+def test_matches_pandas(frames):
+    frame = frames["T0"]
+    rule = 'RSI < 45 and MACD_signal == "Buy" or Close > SMA_short * 1.01'
+    expected = ((frame["RSI"] < 45) & (frame["MACD_signal"] == "Buy")) | (frame["Close"] > frame["SMA_short"] * 1.01)
+    result = evaluate_rule(rule, frame)
+    assert result.any()
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+def test_dotted_columns_and_chained_compare(frames):
+    frame = frames["T1"]
+    result = evaluate_rule("BBL_20_2.0 < Close < BBU_20_2.0", frame)
+    expected = (frame["BBL_20_2.0"] < frame["Close"]) & (frame["Close"] < frame["BBU_20_2.0"])
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+def test_shared_subexpressions_are_computed_once():
+    rules = RuleSet({"a": "RSI < 28 and Close > SMA_long", "b": "RSI < 28 or Close > SMA_long", "c": "RSI < 28"})
+    # RSI, 28, RSI < 28, Close, SMA_long, Close > SMA_long, a, b
+    assert rules.subexpressions == 8
+    assert rules.columns == {"RSI", "Close", "SMA_long"}
+
+
+def test_block_evaluation_per_ticker(frames):
+    rules = RuleSet({"oversold": "RSI < 40", "sell": 'MACD_signal == "Sell"'})
+    block = stack_frames(frames, rules.columns)
+    result = rules.evaluate(block)
+    assert result["oversold"].shape == (300, 3)
+    for column, ticker in enumerate(block.tickers):
+        np.testing.assert_array_equal(result["oversold"][:, column], (frames[ticker]["RSI"] < 40).to_numpy())
+        np.testing.assert_array_equal(result["sell"][:, column], (frames[ticker]["MACD_signal"] == "Sell").to_numpy())
+
+
+def test_triggered_uses_lookback_for_crossovers():
+    index = pd.date_range("2024-01-01", periods=5, freq="D")
+    frames = {
+        "up": pd.DataFrame({"Close": [1, 1, 1, 1, 3.0], "SMA_short": 2.0}, index=index),
+        "flat": pd.DataFrame({"Close": [3, 3, 3, 3, 3.0], "SMA_short": 2.0}, index=index),
+    }
+    rules = RuleSet({"cross": "crosses_above(Close, SMA_short)", "jump": "Close / prev(Close) > 2"})
+    assert rules.lookback == 1
+    assert rules.triggered(stack_frames(frames)) == {"cross": ["up"], "jump": ["up"]}
+
+
+def test_triggered_adds_up_nested_lookbacks():
+    index = pd.date_range("2024-01-01", periods=5, freq="D")
+    frames = {
+        "T": pd.DataFrame({"Close": [1, 2, 3, 10, 5.0], "SMA_short": 5.0}, index=index),
+        # prev(Close) was already above SMA_short a bar earlier: no cross on the last bar
+        "U": pd.DataFrame({"Close": [1, 2, 10, 10, 5.0], "SMA_short": 5.0}, index=index),
+    }
+    rules = RuleSet({"twice": "prev(prev(Close)) > 2", "cross": "crosses_above(prev(Close), SMA_short)"})
+    assert rules.lookback == 2
+    block = stack_frames(frames)
+    last = {name: result[-1].tolist() for name, result in rules.evaluate(block).items()}
+    assert last == {"twice": [True, True], "cross": [True, False]}
+    assert rules.triggered(block) == {"twice": ["T", "U"], "cross": ["T"]}
+
+
+def test_rsi_thresholds_are_configurable():
+    df = generate_ohlcv(300, seed=4)
+    default = add_rsi(df.copy())
+    wide = add_rsi(df.copy(), lower=45, upper=55)
+    assert (wide["RSI_signal"] == "Buy").sum() > (default["RSI_signal"] == "Buy").sum()
+    assert ((wide["RSI_signal"] == "Buy") == (wide["RSI"] < 45)).all()
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        "__import__('os').system('true')",
+        "Close.real > 1",
+        "[RSI][0] < 30",
+        "RSI < 30 if Close else RSI",
+        "lambda: RSI",
+        "RSI ** 2 > 900",
+        "RSI in (1, 2)",
+        'MACD_signal == "Hold"',
+        '"Buy" < 3',
+        "RSI <",
+    ],
+)
+def test_rejects_disallowed_rules(rule):
+    with pytest.raises(RuleError):
+        RuleSet({"r": rule})
+
+
+def test_missing_columns_are_reported(frames):
+    rules = RuleSet({"r": "VWAP > Close"})
+    with pytest.raises(RuleError, match="VWAP"):
+        rules.evaluate(stack_frames(frames, ["Close"]))
@@ -0,0 +1,97 @@
+"""
+Local stand-ins for the alert channels' endpoints, for the tests in
+alerts/test_notifiers.py and benchmarks/notification_latency.py.
+
+`LocalWebhook` is an HTTP server recording JSON posts (for the generic and
+the chat channels) and `LocalSMTP` a minimal SMTP server; both listen on a
+free localhost port until `close`.
+"""
+
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+
+class LocalWebhook:
+    """Record JSON posts on localhost, optionally slow and failing."""
+
+    def __init__(self, latency: float = 0.0, fail: bool = False):
+        self.latency = latency
+        self.fail = fail
+        self.received: List[Tuple[float, dict]] = []
+        hook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(hook.latency)
+                if hook.fail:
+                    self.send_error(503, "unavailable")
+                    return
+                hook.received.append((time.time(), json.loads(body)))
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/hook"
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class LocalSMTP:
+    """Just enough of SMTP for smtplib.send_message; ``latency`` delays each reply to DATA."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.received: List[Tuple[float, bytes]] = []
+        smtp = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                self.reply("220 localhost ready")
+                for raw in self.rfile:
+                    command = raw.decode(errors="replace").strip().upper()
+                    if command.startswith(("EHLO", "HELO")):
+                        self.reply("250 localhost")
+                    elif command == "DATA":
+                        self.reply("354 end with <CRLF>.<CRLF>")
+                        lines = []
+                        for data in self.rfile:
+                            if data in (b".\r\n", b".\n"):
+                                break
+                            lines.append(data)
+                        time.sleep(smtp.latency)
+                        smtp.received.append((time.time(), b"".join(lines)))
+                        self.reply("250 queued")
+                    elif command == "QUIT":
+                        self.reply("221 bye")
+                        return
+                    else:
+                        self.reply("250 ok")
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from utils.instrumentation import record_cache
+
+
+class CoalescingCache:
+    """
+    TTL + LRU cache for async handlers that computes each key at most once.
+
+    Concurrent requests for a key that is being computed await the same task
+    instead of starting their own, and the blocking computation runs in a worker
+    thread so the event loop keeps serving cached responses meanwhile.
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024, name: str = "api.cache"):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: Hashable, func: Callable[..., Any], *args) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            record_cache(self.name, True)
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            record_cache(self.name, True)
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        record_cache(self.name, False)
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        self._inflight[key] = task
+
+        def _done(finished: asyncio.Future) -> None:
+            self._inflight.pop(key, None)
+            if not finished.cancelled() and finished.exception() is None:
+                self._store(key, finished.result())
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,117 @@
+"""
+Open-loop load test for the signal API reporting latency percentiles.
+
+    python -m api.loadtest --serve --qps 500 --duration 10
+    python -m api.loadtest --url http://127.0.0.1:8000 --qps 200 --tickers BTC-USD,ETH-USD
+
+Requests are fired on a fixed schedule regardless of how fast responses come
+back, so queueing delay shows up in the percentiles instead of silently
+lowering the offered load. ``--serve`` starts the service in-process on the
+offline synthetic loader so results do not depend on Yahoo or FRED.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+from typing import List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+
+async def _get(host: str, port: int, path: str) -> Tuple[int, float]:
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - started
+
+
+async def run_load(url: str, paths: Sequence[str], qps: float, duration: float) -> dict:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    total = int(qps * duration)
+    began = time.perf_counter()
+
+    async def fire(i: int):
+        delay = began + i / qps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            return await _get(host, port, paths[i % len(paths)])
+        except OSError:
+            return 0, float("nan")
+
+    results = await asyncio.gather(*(fire(i) for i in range(total)))
+    elapsed = time.perf_counter() - began
+    latencies = np.array([lat for status, lat in results if status == 200])
+    errors = sum(1 for status, _ in results if status != 200)
+    report = {"requests": total, "errors": errors, "achieved_qps": total / elapsed}
+    if len(latencies):
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+        report.update(p50_ms=p50, p90_ms=p90, p99_ms=p99, max_ms=latencies.max() * 1000)
+    return report
+
+
+def _offline_loader(days: int, interval: str, ticker: str):
+    from data.fetch_btc import _fallback_series
+
+    return _fallback_series(days * 24 if interval == "1h" else days, interval)
+
+
+def _serve_in_background(tickers: List[str]) -> str:
+    import uvicorn
+
+    from api.service import SignalService, create_app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    app = create_app(SignalService(loader=_offline_loader, tickers=tickers))
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def _paths(tickers: List[str], interval: str) -> List[str]:
+    paths = []
+    for ticker in tickers:
+        query = f"interval={interval}&days=365"
+        paths.append(f"/signals/{ticker}/latest?{query}")
+        paths.append(f"/signals/{ticker}/history?{query}&limit=200")
+    return paths
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Load test the signal API.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="start an offline server in-process")
+    parser.add_argument("--qps", type=float, default=200.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--tickers", default="BTC-USD,ETH-USD,SOL-USD")
+    parser.add_argument("--interval", default="1d")
+    args = parser.parse_args(argv)
+
+    tickers = args.tickers.split(",")
+    url = _serve_in_background(tickers) if args.serve else args.url
+    report = asyncio.run(run_load(url, _paths(tickers, args.interval), args.qps, args.duration))
+    print(f"{report['requests']} requests, {report['errors']} errors, {report['achieved_qps']:.0f} req/s")
+    if "p50_ms" in report:
+        print(
+            f"latency p50 {report['p50_ms']:.2f} ms | p90 {report['p90_ms']:.2f} ms | "
+            f"p99 {report['p99_ms']:.2f} ms | max {report['max_ms']:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
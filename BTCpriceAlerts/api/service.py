@@ -0,0 +1,294 @@
+"""
+Async HTTP service exposing latest and historical signals per ticker.
+
+    uvicorn --factory api.service:create_app --port 8000      # from the BTCpriceAlerts directory
+
+Endpoints (all GET):
+    /health
+    /signals/{ticker}/latest?interval=1d&days=180&indicators=rsi,macd,ma_cross
+    /signals/{ticker}/history?...&columns=Close,RSI&limit=500&format=json|arrow   # limit 1..100000
+    /backtest/{ticker}?...&signal=MA_signal&stop_loss=0.05&take_profit=0.1&trailing_stop=0.03
+    /metrics                                  # Prometheus text
+
+Only the tickers in ``BTC_API_TICKERS`` (default BTC-USD,ETH-USD,SOL-USD) are
+served; others get a 400.
+
+Price frames and encoded responses are cached per ticker/interval/params, and
+concurrent identical requests share one computation (see `CoalescingCache`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from api.cache import CoalescingCache
+from backtest.backtester import backtest_signals
+from backtest.intrabar import backtest_intrabar
+from data.fetch_btc import get_btc_price_data
+from data.snapshot_store import SnapshotStore
+from signals.registry import INDICATORS, LazyIndicatorFrame
+from utils import instrumentation
+
+DEFAULT_INDICATORS = ("rsi", "macd", "ma_cross")
+# Tickers the service answers for; anything else is a 400 before any download
+TICKERS = tuple(
+    t.strip().upper() for t in os.environ.get("BTC_API_TICKERS", "BTC-USD,ETH-USD,SOL-USD").split(",") if t.strip()
+)
+INTERVALS = ("1d", "1h")
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+# Largest /history page; ten years of hourly bars
+MAX_HISTORY_LIMIT = 100_000
+
+
+@dataclass(frozen=True)
+class SignalQuery:
+    """Normalized request parameters; also the cache key prefix."""
+
+    ticker: str
+    interval: str = "1d"
+    days: int = 180
+    indicators: Tuple[str, ...] = DEFAULT_INDICATORS
+
+    @classmethod
+    def from_request(cls, request: Request, tickers: Collection[str] = TICKERS) -> "SignalQuery":
+        ticker = request.path_params["ticker"].upper()
+        if ticker not in tickers:
+            raise ValueError(f"Unknown ticker '{ticker}'; this service covers {', '.join(sorted(tickers))}.")
+        params = request.query_params
+        interval = params.get("interval", "1d")
+        if interval not in INTERVALS:
+            raise ValueError(f"`interval` must be one of {', '.join(INTERVALS)}.")
+        try:
+            days = int(params.get("days", 180))
+        except ValueError:
+            raise ValueError("`days` must be an integer.") from None
+        if not 1 <= days <= 3650:
+            raise ValueError("`days` must be between 1 and 3650.")
+        names = params.get("indicators")
+        indicators = tuple(sorted(n for n in names.split(",") if n)) if names else DEFAULT_INDICATORS
+        unknown = [name for name in indicators if name not in INDICATORS]
+        if unknown:
+            raise ValueError(f"Unknown indicators: {', '.join(unknown)}.")
+        return cls(ticker, interval, days, indicators)
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, "item"):  # NumPy scalar
+        return _jsonable(value.item())
+    return value
+
+
+def to_columnar_json(df: pd.DataFrame) -> bytes:
+    """Encode ``df`` as ``{"index": [...], "columns": {name: [...]}}`` with NaN as null."""
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        columns[name] = series.astype(object).where(series.notna(), None).tolist()
+    payload = {"index": [ts.isoformat() for ts in df.index], "columns": columns}
+    return json.dumps(payload, default=_jsonable).encode()
+
+
+def to_arrow_stream(df: pd.DataFrame) -> bytes:
+    """Encode ``df`` as an Arrow IPC stream (requires pyarrow)."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+class SignalService:
+    """Fetch → indicators → payload pipeline behind two coalescing caches."""
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        loader: Callable[..., pd.DataFrame] = get_btc_price_data,
+        snapshots: Optional[SnapshotStore] = None,
+        tickers: Iterable[str] = TICKERS,
+    ):
+        self.frames = CoalescingCache(ttl=ttl, maxsize=256, name="api.frames")
+        self.responses = CoalescingCache(ttl=ttl, maxsize=4096, name="api.responses")
+        self.snapshots = snapshots
+        self.tickers = frozenset(ticker.upper() for ticker in tickers)
+        self._loader = loader
+
+    def _load_frame(self, query: SignalQuery) -> LazyIndicatorFrame:
+        prices = self._loader(days=query.days, interval=query.interval, ticker=query.ticker)
+        return LazyIndicatorFrame(prices, query.indicators)
+
+    async def frame(self, query: SignalQuery) -> LazyIndicatorFrame:
+        return await self.frames.get_or_compute(query, self._load_frame, query)
+
+    async def _respond(self, key, build: Callable[..., Any], *args) -> Any:
+        return await self.responses.get_or_compute(key, build, *args)
+
+    @staticmethod
+    def _latest_payload(query: SignalQuery, frame: LazyIndicatorFrame) -> bytes:
+        columns = ["Close"] + [col for ind in frame.indicators for col in ind.outputs]
+        values = {col: _jsonable(frame.latest(col)) for col in columns}
+        payload = {
+            "ticker": query.ticker,
+            "interval": query.interval,
+            "timestamp": frame.index[-1].isoformat() if len(frame) else None,
+            "price_source": frame.base.attrs.get("price_source", "unknown"),
+            "values": values,
+        }
+        return json.dumps(payload).encode()
+
+    @staticmethod
+    def _history_payload(frame: LazyIndicatorFrame, columns: Optional[List[str]], limit: int, fmt: str) -> bytes:
+        columns = columns or ["Close"] + frame.signal_columns
+        missing = [col for col in columns if col not in frame]
+        if missing:
+            raise ValueError(f"Unknown columns: {', '.join(missing)}.")
+        df = frame.to_frame(columns).tail(limit)
+        return to_arrow_stream(df) if fmt == "arrow" else to_columnar_json(df)
+
+    @staticmethod
+    def _backtest_payload(frame: LazyIndicatorFrame, signal: str, levels: Dict[str, Optional[float]]) -> bytes:
+        if signal not in frame.signal_columns:
+            raise ValueError(f"`signal` must be one of {', '.join(frame.signal_columns)}.")
+        if any(value is not None for value in levels.values()):
+            columns = [col for col in ("Open", "High", "Low", "Close") if col in frame] + [signal]
+            trades, final_value = backtest_intrabar(frame.to_frame(columns), signal, **levels)
+            rows = [
+                {"side": side, "price": price, "timestamp": ts, "reason": reason}
+                for side, price, ts, reason in trades
+            ]
+        else:
+            trades, final_value = backtest_signals(frame.to_frame(["Close", signal]), signal)
+            rows = [{"side": side, "price": price, "timestamp": ts} for side, price, ts in trades]
+        payload = {"signal": signal, "final_value": final_value, "trades": rows, **levels}
+        return json.dumps(payload, default=_jsonable).encode()
+
+    @staticmethod
+    def _snapshot_payload(query: SignalQuery, snapshot) -> Optional[bytes]:
+        columns = ["Close"]
+        for name in query.indicators:
+            columns.extend(INDICATORS[name].resolve().outputs)
+        if any(col not in snapshot.values for col in columns):
+            return None
+        payload = {
+            "ticker": query.ticker,
+            "interval": query.interval,
+            "timestamp": snapshot.bar_time.isoformat(),
+            "price_source": snapshot.price_source,
+            "values": {col: snapshot.values[col] for col in columns},
+        }
+        return json.dumps(payload).encode()
+
+    async def latest(self, query: SignalQuery) -> bytes:
+        if self.snapshots is not None:
+            # SQLite read: keep it off the event loop
+            snapshot = await asyncio.to_thread(self.snapshots.get, query.ticker, query.interval)
+            if snapshot is not None and not snapshot.is_stale():
+                body = self._snapshot_payload(query, snapshot)
+                if body is not None:
+                    return body
+        frame = await self.frame(query)
+        return await self._respond(("latest", query), self._latest_payload, query, frame)
+
+    async def history(self, query: SignalQuery, columns: Optional[List[str]], limit: int, fmt: str) -> bytes:
+        # tail() of a negative count drops rows instead, and an empty page would be cached
+        if not 1 <= limit <= MAX_HISTORY_LIMIT:
+            raise ValueError(f"`limit` must be between 1 and {MAX_HISTORY_LIMIT}.")
+        frame = await self.frame(query)
+        key = ("history", query, tuple(columns or ()), limit, fmt)
+        return await self._respond(key, self._history_payload, frame, columns, limit, fmt)
+
+    async def backtest(self, query: SignalQuery, signal: str, levels: Optional[Dict[str, Optional[float]]] = None) -> bytes:
+        levels = levels or {}
+        frame = await self.frame(query)
+        key = ("backtest", query, signal, tuple(sorted(levels.items())))
+        return await self._respond(key, self._backtest_payload, frame, signal, levels)
+
+
+def create_app(service: Optional[SignalService] = None) -> Starlette:
+    """
+    Build the Starlette application around ``service``. The default service
+    answers /latest from the snapshot store the background job keeps fresh
+    (see data/snapshot_store.py); nothing is opened until this is called.
+    """
+    service = service or SignalService(snapshots=SnapshotStore())
+
+    def _error(exc: Exception) -> JSONResponse:
+        return JSONResponse({"error": str(exc)}, status_code=400)
+
+    async def health(request: Request) -> Response:
+        return JSONResponse(
+            {"status": "ok", "frames": service.frames.stats(), "responses": service.responses.stats()}
+        )
+
+    async def latest(request: Request) -> Response:
+        try:
+            body = await service.latest(SignalQuery.from_request(request, service.tickers))
+        except ValueError as exc:
+            return _error(exc)
+        return Response(body, media_type="application/json")
+
+    async def history(request: Request) -> Response:
+        params = request.query_params
+        fmt = params.get("format", "json")
+        try:
+            if fmt not in ("json", "arrow"):
+                raise ValueError("`format` must be 'json' or 'arrow'.")
+            try:
+                limit = int(params.get("limit", 500))
+            except ValueError:
+                raise ValueError("`limit` must be an integer.") from None
+            columns = [col for col in params.get("columns", "").split(",") if col] or None
+            body = await service.history(SignalQuery.from_request(request, service.tickers), columns, limit, fmt)
+        except ValueError as exc:
+            return _error(exc)
+        media_type = ARROW_MEDIA_TYPE if fmt == "arrow" else "application/json"
+        return Response(body, media_type=media_type)
+
+    async def backtest(request: Request) -> Response:
+        try:
+            query = SignalQuery.from_request(request, service.tickers)
+            params = request.query_params
+            levels = {
+                name: float(params[name]) if params.get(name) else None
+                for name in ("stop_loss", "take_profit", "trailing_stop")
+            }
+            body = await service.backtest(query, params.get("signal", "MA_signal"), levels)
+        except ValueError as exc:
+            return _error(exc)
+        return Response(body, media_type="application/json")
+
+    async def metrics(request: Request) -> Response:
+        return PlainTextResponse(instrumentation.export_prometheus())
+
+    app = Starlette(
+        routes=[
+            Route("/health", health),
+            Route("/signals/{ticker}/latest", latest),
+            Route("/signals/{ticker}/history", history),
+            Route("/backtest/{ticker}", backtest),
+            Route("/metrics", metrics),
+        ]
+    )
+    app.state.service = service
+    return app
+
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient
+
+from api.cache import CoalescingCache
+from api.service import SignalService, create_app
+from data import snapshot_store
+from data.snapshot_store import SnapshotStore, build_snapshot_values
+from data.synthetic import generate_ohlcv
+
+
+def _loader(days, interval, ticker):
+    return generate_ohlcv(days, end="2024-06-30", seed=len(ticker))
+
+
+@pytest.fixture()
+def client():
+    return TestClient(create_app(SignalService(loader=_loader)))
+
+
+def test_latest_and_history(client):
+    latest = client.get("/signals/btc-usd/latest", params={"days": 300}).json()
+    assert latest["ticker"] == "BTC-USD"
+    assert set(latest["values"]) >= {"Close", "RSI", "MACD_signal", "MA_signal"}
+
+    history = client.get(
+        "/signals/BTC-USD/history", params={"days": 300, "columns": "Close,RSI", "limit": 50}
+    ).json()
+    assert list(history["columns"]) == ["Close", "RSI"]
+    assert len(history["index"]) == 50
+    assert history["columns"]["RSI"][-1] == pytest.approx(latest["values"]["RSI"])
+
+
+def test_arrow_format(client):
+    pa = pytest.importorskip("pyarrow")
+    response = client.get("/signals/BTC-USD/history", params={"format": "arrow", "limit": 10})
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 10
+
+
+def test_default_app_serves_latest_from_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_store, "DEFAULT_DB_PATH", tmp_path / "snapshots.sqlite3")
+    app = create_app()  # what `uvicorn --factory api.service:create_app` serves
+    service = app.state.service
+    assert service.snapshots.path == tmp_path / "snapshots.sqlite3"
+
+    prices = generate_ohlcv(400, end="2024-06-30")
+    service.snapshots.put("BTC-USD", "1d", prices.index[-1], build_snapshot_values(prices), "snapshot-job")
+    monkeypatch.setattr(service, "_loader", lambda **kwargs: pytest.fail("fetched prices despite a fresh snapshot"))
+
+    latest = TestClient(app).get("/signals/BTC-USD/latest").json()
+    assert latest["price_source"] == "snapshot-job"
+    assert latest["values"]["Close"] == pytest.approx(float(prices["Close"].iloc[-1]))
+
+
+def test_bad_parameters(client):
+    assert client.get("/signals/BTC-USD/latest", params={"interval": "5m"}).status_code == 400
+    assert client.get("/signals/BTC-USD/latest", params={"indicators": "nope"}).status_code == 400
+    assert client.get("/backtest/BTC-USD", params={"signal": "RSI"}).status_code == 400
+    unknown = client.get("/signals/BAD-USD/latest")
+    assert unknown.status_code == 400 and "Unknown ticker" in unknown.json()["error"]
+    for limit in (-5, 0, "ten", 10**6):
+        response = client.get("/signals/BTC-USD/history", params={"limit": limit})
+        assert response.status_code == 400 and "limit" in response.json()["error"]
+
+
+def test_backtest(client):
+    body = client.get("/backtest/BTC-USD", params={"days": 365, "signal": "MACD_signal"}).json()
+    assert body["final_value"] > 0
+    assert all(trade["side"] in ("Buy", "Sell") for trade in body["trades"])
+
+
+def test_backtest_with_stops(client):
+    params = {"days": 365, "signal": "MACD_signal", "stop_loss": 0.02, "trailing_stop": 0.03}
+    body = client.get("/backtest/BTC-USD", params=params).json()
+    assert body["stop_loss"] == 0.02
+    assert {trade["reason"] for trade in body["trades"]} <= {"signal", "stop_loss", "trailing_stop", "open"}
+    assert client.get("/backtest/BTC-USD", params={"stop_loss": "-1"}).status_code == 400
+
+
+def test_concurrent_identical_requests_compute_once():
+    cache = CoalescingCache(ttl=60)
+    calls = []
+    lock = threading.Lock()
+
+    def slow(value):
+        with lock:
+            calls.append(value)
+        time.sleep(0.05)
+        return value * 2
+
+    async def scenario():
+        results = await asyncio.gather(*(cache.get_or_compute("k", slow, 21) for _ in range(10)))
+        results.append(await cache.get_or_compute("k", slow, 21))
+        return results
+
+    assert asyncio.run(scenario()) == [42] * 11
+    assert calls == [21]
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "coalesced": 9}
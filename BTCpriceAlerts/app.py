@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+from typing import Optional
 
 BASE_DIR = Path(__file__).resolve().parent
 if str(BASE_DIR) not in sys.path:
@@ -9,16 +10,67 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from data.circuit_breaker import breaker_status
 from data.fetch_btc import get_btc_price_data
+from data.prewarm import (
+    DEFAULT_INDICATORS,
+    IDLE_AFTER,
+    PREWARM,
+    Prewarmer,
+    default_targets,
+    fetch_prices,
+    frame_version,
+    indicator_memo,
+    price_frame_name,
+    price_max_age,
+)
+from data.shared_frames import shared_frame
+from data.snapshot_store import DEFAULT_DAYS, SnapshotStore, latest_snapshot
+from macro.correlation import MacroCorrelation, build_macro_correlation
 from macro.fetch_cpi import get_cpi
 from macro.fetch_m2 import get_m2
 from macro.fetch_policy import get_policy_rate
-from signals.indicators import add_macd, add_ma_cross, add_rsi
-from utils.plotting import plot_candlestick
+from signals.archive import DIRECTIONS, SignalArchive, archivable
+from signals.indicators import RSI_OVERBOUGHT, RSI_OVERSOLD
+from signals.registry import INDICATORS, LazyIndicatorFrame
+from utils import instrumentation
+from utils.plotting import add_indicator_traces, plot_candlestick
 
 
 st.set_page_config(page_title="BTC Signal & Macro Dashboard", layout="wide")
 
+
+@st.cache_resource
+def snapshot_store() -> SnapshotStore:
+    return SnapshotStore()
+
+
+@st.cache_resource
+def signal_archive() -> SignalArchive:
+    return SignalArchive()
+
+
+@st.cache_resource
+def prewarmer() -> Prewarmer:
+    """Keeps every sidebar depth x interval published ahead of expiry (data/prewarm.py)."""
+    return Prewarmer(default_targets(), idle_after=IDLE_AFTER).start()
+
+
+@st.cache_data(ttl=3600)
+def macro_series(name: str) -> pd.DataFrame:
+    loaders = {"cpi": get_cpi, "m2": get_m2, "policy": get_policy_rate}
+    return loaders[name]()
+
+
+@st.cache_resource(ttl=3600)
+def macro_correlation() -> MacroCorrelation:
+    # Monthly statistics need years of history, independent of the sidebar depth.
+    # The object memoizes each window, so switching windows does not recompute.
+    prices = get_btc_price_data(days=3650, interval="1d")
+    macro = pd.concat([macro_series(name) for name in ("cpi", "m2", "policy")], axis=1)
+    return build_macro_correlation(prices, macro)
+
+
 # Inject a lightweight pro-style theme (deep navy background, accent green)
 st.markdown(
     """
@@ -105,11 +157,44 @@ st.markdown(
 st.title("BTC Market Signal Desk")
 st.caption("Institutional-grade overview powered by live market data and macro context.")
 
+signal_palette = {
+    "Buy": "bullish",
+    "Sell": "bearish",
+    "Neutral": "neutral",
+    None: "neutral",
+}
+
+
+def load_prices(days: int, interval: str, max_age: Optional[float] = None) -> pd.DataFrame:
+    """BTC history published once for every session and server process."""
+    max_age = price_max_age(interval) if max_age is None else max_age
+    return shared_frame(price_frame_name(days, interval), lambda: fetch_prices(days, interval), max_age=max_age)
+
+
+def session_cache(price_df: pd.DataFrame) -> dict:
+    """Per-session indicator memo and figures, reset when new bars arrive."""
+    version = frame_version(price_df)
+    cache = st.session_state.get("price_cache")
+    if cache is None or cache["version"] != version:
+        # Start from the default overlays the prewarmer computed on this frame, if any
+        cache = st.session_state["price_cache"] = {"version": version, "memo": indicator_memo(price_df)}
+    return cache
+
+
+def selected_indicators() -> dict:
+    """Indicator overrides chosen in the overlay picker (defaults before first render)."""
+    names = st.session_state.get("overlays", DEFAULT_INDICATORS)
+    return {
+        name: {
+            param: st.session_state.get(f"{name}_{param}", options[0])
+            for param, options in INDICATORS[name].choices.items()
+        }
+        for name in names
+    }
+
+
 # Sidebar configuration (filters, toggles)
 st.sidebar.header("Market Settings")
-if st.sidebar.button("🔄 Refresh data"):
-    st.experimental_rerun()
-
 date_range = st.sidebar.selectbox(
     "Historical depth",
     options=["90", "180", "365"],
@@ -119,212 +204,289 @@ date_range = st.sidebar.selectbox(
 interval = st.sidebar.selectbox(
     "Sampling interval", options=["1d", "1h"], index=0
 )
+days = int(date_range)
 
-st.sidebar.header("Technical Stack")
-show_rsi = st.sidebar.checkbox("Relative Strength Index", True)
-show_macd = st.sidebar.checkbox("MACD (12-26-9)", True)
-show_ma = st.sidebar.checkbox("Moving Average Crossover", True)
+if st.sidebar.button("🔄 Refresh data"):
+    load_prices(days, interval, max_age=0)
+    st.rerun()
+auto_refresh = st.sidebar.toggle("Auto-refresh", False)
+refresh_every = st.sidebar.select_slider(
+    "Refresh every", options=[15, 30, 60, 300], value=60, format_func=lambda s: f"{s}s", disabled=not auto_refresh
+)
+# Only the KPI strip and the overlay chart rerun on the timer
+run_every = refresh_every if auto_refresh else None
+
+st.sidebar.header("Diagnostics")
+show_debug = st.sidebar.checkbox("Performance debug panel", False)
+# The panel shows this session's calls during this rerun: capture them on the
+# script thread (other sessions and BTC_METRICS are unaffected). Close any
+# capture a rerun cut short by st.stop/st.rerun left open first.
+instrumentation.end_capture()
+if show_debug:
+    instrumentation.begin_capture()
+
+# Background refresh of the default frames, so reruns map a published one;
+# it pauses once no session has rerun for IDLE_AFTER seconds
+if PREWARM:
+    prewarmer().touch()
 
 # Pull BTC price history (with offline fallback)
-days = int(date_range)
-price_df = get_btc_price_data(days=days, interval=interval)
-price_source = price_df.attrs.get("price_source", "unknown")
-
+price_df = load_prices(days, interval)
 if price_df.empty or "Close" not in price_df.columns:
     st.error("Unable to source BTC pricing data at the moment. Please retry later.")
     st.stop()
 
-btc = price_df.copy()
-
-if price_source != "yfinance":
-    st.warning(
-        "Live price feed unreachable. Displaying modelled series until the next refresh."
-    )
-else:
-    st.success("Streaming BTCUSD data via Yahoo Finance. Refresh for the latest close.")
-
-if show_rsi:
-    btc = add_rsi(btc)
-if show_macd:
-    btc = add_macd(btc)
-if show_ma:
-    btc = add_ma_cross(btc)
-
-# Core derived metrics
-latest_row = btc.iloc[-1]
-previous_row = btc.iloc[-2] if len(btc) > 1 else latest_row
-latest_close = latest_row["Close"]
-previous_close = previous_row["Close"]
-day_change = latest_close - previous_close
-day_change_pct = (day_change / previous_close) * 100 if previous_close else 0
-rsi_value = latest_row.get("RSI")
-macd_signal = latest_row.get("MACD_signal", "Neutral")
-ma_signal = latest_row.get("MA_signal", "Neutral")
-
-signal_palette = {
-    "Buy": "bullish",
-    "Sell": "bearish",
-    "Neutral": "neutral",
-    None: "neutral",
-}
-
-# KPI strip
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    st.markdown('<div class="metric-title">BTCUSD Spot</div>', unsafe_allow_html=True)
-    st.markdown(f'<div class="metric-value">${latest_close:,.0f}</div>', unsafe_allow_html=True)
-    st.markdown(
-        f"<span style='color:{'#4AF5C8' if day_change >= 0 else '#FF6F91'};'>"
-        f"{day_change:+,.0f} | {day_change_pct:+.2f}%</span>",
-        unsafe_allow_html=True,
-    )
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with col2:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    st.markdown('<div class="metric-title">RSI</div>', unsafe_allow_html=True)
-    rsi_display = f"{rsi_value:.1f}" if pd.notna(rsi_value) else "N/A"
-    st.markdown(f'<div class="metric-value">{rsi_display}</div>', unsafe_allow_html=True)
-    bias = "Overbought" if rsi_value and rsi_value > 70 else "Oversold" if rsi_value and rsi_value < 30 else "Neutral"
-    st.markdown(f"<span style='color:#A9B8D3;'>{bias}</span>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with col3:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    st.markdown('<div class="metric-title">MACD Signal</div>', unsafe_allow_html=True)
-    st.markdown(f'<div class="metric-value">{macd_signal or "Neutral"}</div>', unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with col4:
-    st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-    st.markdown('<div class="metric-title">MA Crossover</div>', unsafe_allow_html=True)
-    st.markdown(f'<div class="metric-value">{ma_signal or "Neutral"}</div>', unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-# Tabs for detailed exploration
-chart_tab, signals_tab, macro_tab = st.tabs(["Price Action", "Signal Matrix", "Macro Lens"])
-
-with chart_tab:
-    st.markdown('<div class="block-header">Candlestick Structure</div>', unsafe_allow_html=True)
-    st.plotly_chart(
-        plot_candlestick(btc.tail(365 if interval == "1d" else 500)),
-        width="stretch",
-        theme="streamlit",
-    )
-
-    st.markdown('<div class="block-header">Price Structure & Technical Overlays</div>', unsafe_allow_html=True)
-    overlay_fig = go.Figure()
-    overlay_fig.add_trace(
-        go.Scatter(
-            x=btc.index,
-            y=btc["Close"],
-            name="BTC Close",
-            line=dict(color="#5FD7FF", width=2.4),
-        )
-    )
-
-    if show_rsi and "RSI" in btc.columns:
-        overlay_fig.add_trace(
-            go.Scatter(
-                x=btc.index,
-                y=btc["RSI"],
-                name="RSI",
-                yaxis="y2",
-                line=dict(color="#9B7BFF", width=1.6, dash="dash"),
+# Circuit breakers fail fast while Yahoo/FRED are down (data/circuit_breaker.py)
+st.sidebar.header("Data Feeds")
+for feed in breaker_status():
+    st.sidebar.caption(("🟢 " if feed.state == "closed" else "🔴 ") + feed.describe())
+
+
+def kpi_strip(days: int, interval: str) -> None:
+    with instrumentation.track("app.kpi_strip"):
+        price_df = load_prices(days, interval, max_age=refresh_every if auto_refresh else None)
+        price_source = price_df.attrs.get("price_source", "unknown")
+        if price_source == "yfinance-cached":
+            st.info("Yahoo Finance is unreachable. Showing the last successful download while it recovers.")
+        elif price_source != "yfinance":
+            st.warning(
+                "Live price feed unreachable. Displaying modelled series until the next refresh."
             )
+        else:
+            st.success("Streaming BTCUSD data via Yahoo Finance. Refresh for the latest close.")
+
+        # KPI values come from the shared snapshot (written by `python -m data.snapshot_store`)
+        # and are only recomputed here when it is missing or stale
+        # Shallower views recompute it from the shared (prewarmed) 365-day frame, not a fresh download
+        snapshot = latest_snapshot(
+            snapshot_store(),
+            "BTC-USD",
+            interval,
+            prices=price_df if days >= DEFAULT_DAYS else None,
+            loader=lambda days, interval, ticker: load_prices(days, interval),
         )
-
-    if show_macd and {"MACD_12_26_9", "MACDs_12_26_9"}.issubset(btc.columns):
-        overlay_fig.add_trace(
-            go.Scatter(
-                x=btc.index,
-                y=btc["MACD_12_26_9"],
-                name="MACD",
-                yaxis="y2",
-                line=dict(color="#4AF5C8", width=1.8),
+        frame = LazyIndicatorFrame(price_df, DEFAULT_INDICATORS, memo=session_cache(price_df)["memo"])
+
+        def kpi(column, default=None):
+            if snapshot is not None:
+                return snapshot.get(column, default)
+            return frame.latest(column, default)
+
+        # Core derived metrics
+        if snapshot is not None:
+            latest_close = snapshot.get("Close")
+            previous_close = snapshot.get("PrevClose", latest_close)
+        else:
+            latest_close = price_df["Close"].iloc[-1]
+            previous_close = price_df["Close"].iloc[-2] if len(price_df) > 1 else latest_close
+        day_change = latest_close - previous_close
+        day_change_pct = (day_change / previous_close) * 100 if previous_close else 0
+        rsi_value = kpi("RSI")
+        macd_signal = kpi("MACD_signal", "Neutral")
+        ma_signal = kpi("MA_signal", "Neutral")
+
+        # KPI strip
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+            st.markdown('<div class="metric-title">BTCUSD Spot</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-value">${latest_close:,.0f}</div>', unsafe_allow_html=True)
+            st.markdown(
+                f"<span style='color:{'#4AF5C8' if day_change >= 0 else '#FF6F91'};'>"
+                f"{day_change:+,.0f} | {day_change_pct:+.2f}%</span>",
+                unsafe_allow_html=True,
             )
-        )
-        overlay_fig.add_trace(
-            go.Scatter(
-                x=btc.index,
-                y=btc["MACDs_12_26_9"],
-                name="MACD Signal",
-                yaxis="y2",
-                line=dict(color="#FF9A76", width=1.5),
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        with col2:
+            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+            st.markdown('<div class="metric-title">RSI</div>', unsafe_allow_html=True)
+            rsi_display = f"{rsi_value:.1f}" if pd.notna(rsi_value) else "N/A"
+            st.markdown(f'<div class="metric-value">{rsi_display}</div>', unsafe_allow_html=True)
+            bias = "Overbought" if rsi_value and rsi_value > RSI_OVERBOUGHT else "Oversold" if rsi_value and rsi_value < RSI_OVERSOLD else "Neutral"
+            st.markdown(f"<span style='color:#A9B8D3;'>{bias}</span>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        with col3:
+            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+            st.markdown('<div class="metric-title">MACD Signal</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-value">{macd_signal or "Neutral"}</div>', unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        with col4:
+            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+            st.markdown('<div class="metric-title">MA Crossover</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="metric-value">{ma_signal or "Neutral"}</div>', unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+
+def overlay_chart(days: int, interval: str) -> None:
+    """Indicator picker and overlay; toggling reruns only this fragment."""
+    price_df = load_prices(days, interval, max_age=refresh_every if auto_refresh else None)
+    cache = session_cache(price_df)
+    names = st.pills(
+        "Technical stack",
+        options=list(INDICATORS),
+        selection_mode="multi",
+        default=DEFAULT_INDICATORS,
+        format_func=lambda name: INDICATORS[name].label,
+        key="overlays",
+        persist_state="page",
+    )
+    for name in names:
+        spec = INDICATORS[name]
+        for param, options in spec.choices.items():
+            st.segmented_control(
+                f"{spec.label} {param}",
+                options=list(options),
+                default=options[0],
+                required=True,
+                key=f"{name}_{param}",
+                persist_state="page",
             )
-        )
 
-    if show_ma and {"SMA_short", "SMA_long"}.issubset(btc.columns):
-        overlay_fig.add_trace(
-            go.Scatter(
-                x=btc.index,
-                y=btc["SMA_short"],
-                name="SMA Short",
-                line=dict(color="#F5B74A", width=1.5),
-            )
-        )
+    with instrumentation.track("app.overlay_figure"):
+        btc = LazyIndicatorFrame(price_df, selected_indicators(), memo=cache["memo"])
+        overlay_fig = go.Figure()
         overlay_fig.add_trace(
             go.Scatter(
                 x=btc.index,
-                y=btc["SMA_long"],
-                name="SMA Long",
-                line=dict(color="#FF6F91", width=1.5),
+                y=btc["Close"],
+                name="BTC Close",
+                line=dict(color="#5FD7FF", width=2.4),
             )
         )
 
-    overlay_fig.update_layout(
-        template="plotly_dark",
-        margin=dict(l=0, r=0, t=10, b=0),
-        xaxis=dict(title="Date"),
-        yaxis=dict(title="BTC Price (USD)", side="left"),
-        yaxis2=dict(
-            title="Indicator",
-            overlaying="y",
-            side="right",
-            showgrid=False,
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-        ),
-    )
+        add_indicator_traces(overlay_fig, btc, btc.indicators)
+
+        overlay_fig.update_layout(
+            template="plotly_dark",
+            margin=dict(l=0, r=0, t=10, b=0),
+            xaxis=dict(title="Date"),
+            yaxis=dict(title="BTC Price (USD)", side="left"),
+            yaxis2=dict(
+                title="Indicator",
+                overlaying="y",
+                side="right",
+                showgrid=False,
+            ),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1,
+            ),
+        )
 
     st.plotly_chart(overlay_fig, width="stretch", theme="streamlit")
 
-with signals_tab:
-    st.markdown('<div class="block-header">Multi-Indicator Guidance</div>', unsafe_allow_html=True)
-    chips = []
-    for label, signal in [("RSI", latest_row.get("RSI_signal")), ("MACD", macd_signal), ("MA X", ma_signal)]:
-        tone = signal_palette.get(signal, "neutral")
-        chips.append(f'<span class="signal-chip {tone}">{label}: {signal or "Neutral"}</span>')
-    st.markdown("".join(chips), unsafe_allow_html=True)
-
-    signal_cols = [col for col in btc.columns if "signal" in col.lower()]
-    if signal_cols:
-        latest_signals = btc[signal_cols].tail(25).fillna("Neutral")
-        st.dataframe(latest_signals, height=400)
-    else:
-        st.info("No signals calculated. Toggle indicators in the sidebar to activate.")
-
-with macro_tab:
-    st.markdown('<div class="block-header">Macro Backdrop</div>', unsafe_allow_html=True)
-    macro_cols = st.columns(3)
-    with macro_cols[0]:
-        st.markdown("**US CPI (YoY)**")
-        cpi = get_cpi()
-        st.line_chart(cpi, width="stretch")
-    with macro_cols[1]:
-        st.markdown("**US M2 Money Supply**")
-        m2 = get_m2()
-        st.line_chart(m2, width="stretch")
-    with macro_cols[2]:
-        st.markdown("**Fed Funds Effective Rate**")
-        policy = get_policy_rate()
-        st.line_chart(policy, width="stretch")
+
+@st.fragment
+def macro_sensitivity() -> None:
+    """Rolling macro statistics; moving the window reruns only this fragment."""
+    with instrumentation.track("app.macro_sensitivity"):
+        correlations = macro_correlation()
+        window = st.select_slider("Rolling window (months)", options=[6, 12, 24, 36], value=12, key="macro_window")
+        sensitivity_cols = st.columns(3)
+        with sensitivity_cols[0]:
+            st.markdown("**Rolling correlation**")
+            st.line_chart(correlations.correlation(window), width="stretch")
+        with sensitivity_cols[1]:
+            st.markdown("**Rolling beta**")
+            st.line_chart(correlations.beta(window), width="stretch")
+        with sensitivity_cols[2]:
+            st.markdown("**Lead / lag (months, + = macro leads)**")
+            st.bar_chart(correlations.lead_lag(6), stack=False, width="stretch")
+
+
+st.fragment(kpi_strip, run_every=run_every)(days, interval)
+
+# Tabs rerun the script on switch and only the open one is rendered
+chart_tab, signals_tab, macro_tab = st.tabs(
+    ["Price Action", "Signal Matrix", "Macro Lens"], key="view", on_change="rerun"
+)
+
+if chart_tab.open:
+    with chart_tab:
+        st.markdown('<div class="block-header">Candlestick Structure</div>', unsafe_allow_html=True)
+        cache = session_cache(price_df)
+        if "candles" not in cache:
+            cache["candles"] = plot_candlestick(price_df.tail(365 if interval == "1d" else 500))
+        st.plotly_chart(cache["candles"], width="stretch", theme="streamlit")
+
+        st.markdown('<div class="block-header">Price Structure & Technical Overlays</div>', unsafe_allow_html=True)
+        st.fragment(overlay_chart, run_every=run_every)(days, interval)
+
+if signals_tab.open:
+    with signals_tab:
+        st.markdown('<div class="block-header">Multi-Indicator Guidance</div>', unsafe_allow_html=True)
+        cache = session_cache(price_df)
+        btc = LazyIndicatorFrame(price_df, selected_indicators(), memo=cache["memo"])
+        chips = []
+        for indicator in btc.indicators:
+            if indicator.signal:
+                signal = btc.latest(indicator.signal)
+                tone = signal_palette.get(signal, "neutral")
+                chips.append(f'<span class="signal-chip {tone}">{indicator.spec.label}: {signal or "Neutral"}</span>')
+        st.markdown("".join(chips), unsafe_allow_html=True)
+
+        signal_cols = btc.signal_columns
+        if signal_cols:
+            latest_signals = btc.to_frame(signal_cols).tail(25).fillna("Neutral")
+            st.dataframe(latest_signals, height=400)
+
+            # Archive this window's events once per data version and parameter choice
+            archived = cache.setdefault("archived", set())
+            archive_key = (interval, tuple(ind.key for ind in btc.indicators))
+            if archive_key not in archived and archivable(btc.base):
+                signal_archive().record("BTC-USD", interval, btc)
+                archived.add(archive_key)
+            with st.expander("Last Buy / Sell per indicator (signal archive)"):
+                if not archivable(btc.base):
+                    st.caption("Live prices are unavailable, so this session's signals are not archived.")
+                last = pd.concat(
+                    [signal_archive().last_signals("BTC-USD", direction, interval) for direction in DIRECTIONS]
+                )
+                st.dataframe(last[["indicator", "params", "direction", "timestamp", "price"]], hide_index=True)
+        else:
+            st.info("No signals calculated. Pick indicators on the Price Action tab to activate.")
+
+if macro_tab.open:
+    with macro_tab:
+        st.markdown('<div class="block-header">Macro Backdrop</div>', unsafe_allow_html=True)
+        macro_cols = st.columns(3)
+        with macro_cols[0]:
+            st.markdown("**US CPI (YoY)**")
+            st.line_chart(macro_series("cpi"), width="stretch")
+        with macro_cols[1]:
+            st.markdown("**US M2 Money Supply**")
+            st.line_chart(macro_series("m2"), width="stretch")
+        with macro_cols[2]:
+            st.markdown("**Fed Funds Effective Rate**")
+            st.line_chart(macro_series("policy"), width="stretch")
+
+        st.markdown('<div class="block-header">BTC Sensitivity to Macro</div>', unsafe_allow_html=True)
+        st.caption("Monthly BTC returns vs. macro changes, aligned to FRED release dates.")
+        macro_sensitivity()
+
+if show_debug:
+    with st.expander("Performance debug", expanded=True):
+        metrics = instrumentation.end_capture()
+        if metrics:
+            st.dataframe(
+                pd.DataFrame(metrics).set_index("name")[
+                    ["calls", "total_seconds", "mean_seconds", "max_seconds", "rows", "cache_hits", "cache_misses"]
+                ],
+                width="stretch",
+            )
+        else:
+            st.info("No instrumented calls recorded during this run.")
+        prometheus_text = instrumentation.export_prometheus(metrics=metrics)
+        st.code(prometheus_text, language="text")
+        st.download_button(
+            "Download metrics (JSON)", instrumentation.export_json(metrics=metrics), file_name="metrics.json"
+        )
 
 st.caption(
     "Sourcing: BTC via Yahoo Finance (fallback synthetic series), Macro via FRED / fallback model."
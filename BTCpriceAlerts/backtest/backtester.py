@@ -2,6 +2,9 @@
 
 import pandas as pd
 
+from utils.instrumentation import timed
+
+@timed()
 def backtest_signals(df, signal_col, price_col="Close"):
     """
     Simple backtest: Buy on 'Buy', Sell on 'Sell', no position otherwise.
@@ -0,0 +1,288 @@
+# backtest/intrabar.py
+
+"""
+Signal backtest with stop-loss, take-profit and trailing stops on intrabar High/Low.
+
+Entries and signal exits fill at ``Close`` like `backtest_signals`. While a
+position is open, every later bar is checked against its ``Low`` (stops) and
+``High`` (target) before the bar's signal is considered:
+
+* stop-loss at ``entry * (1 - stop_loss)``
+* trailing stop at ``peak * (1 - trailing_stop)``, where ``peak`` is the highest
+  price seen up to the previous bar (the bar's own high cannot be ordered
+  against its low, so it only raises the stop from the next bar on)
+* take-profit at ``entry * (1 + take_profit)``
+
+A bar that touches both a stop and the target is assumed to hit the stop first.
+Gaps through a level fill at ``Open`` when that column is present.
+
+The path-dependent loop is compiled with numba when it is installed; otherwise
+each trade's exit is located with NumPy scans over the bars it spans.
+"""
+
+from functools import lru_cache
+from itertools import product
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+INITIAL_CAPITAL = 10000.0
+
+SIGNAL, STOP_LOSS, TAKE_PROFIT, TRAILING_STOP, OPEN = 0, 1, 2, 3, -1
+EXIT_REASONS = {
+    SIGNAL: "signal",
+    STOP_LOSS: "stop_loss",
+    TAKE_PROFIT: "take_profit",
+    TRAILING_STOP: "trailing_stop",
+    OPEN: "open",
+}
+
+_FIRST_WINDOW = 64
+
+
+def _simulate_loop(codes, open_, high, low, close, stop_loss, take_profit, trailing_stop):
+    """
+    Reference bar-by-bar kernel; also the source numba compiles.
+
+    ``codes`` holds 1 for Buy, -1 for Sell and 0 otherwise; disabled levels are
+    NaN. Returns ``(count, entry_idx, exit_idx, exit_price, reason)`` where the
+    arrays are valid up to ``count`` and an open final trade has ``exit_idx -1``.
+    """
+    n = close.shape[0]
+    entry_idx = np.empty(n, np.int64)
+    exit_idx = np.empty(n, np.int64)
+    exit_price = np.empty(n, np.float64)
+    reason = np.empty(n, np.int64)
+    use_sl = not np.isnan(stop_loss)
+    use_tp = not np.isnan(take_profit)
+    use_trail = not np.isnan(trailing_stop)
+
+    count = 0
+    in_position = False
+    entry = 0.0
+    peak = 0.0
+    for i in range(n):
+        if in_position:
+            fixed = entry * (1.0 - stop_loss) if use_sl else -np.inf
+            trail = peak * (1.0 - trailing_stop) if use_trail else -np.inf
+            level = max(fixed, trail)
+            code = -2
+            price = 0.0
+            if low[i] <= level:
+                price = min(open_[i], level)
+                code = TRAILING_STOP if trail > fixed else STOP_LOSS
+            elif use_tp and high[i] >= entry * (1.0 + take_profit):
+                price = max(open_[i], entry * (1.0 + take_profit))
+                code = TAKE_PROFIT
+            elif codes[i] == -1:
+                price = close[i]
+                code = SIGNAL
+            if code != -2:
+                exit_idx[count] = i
+                exit_price[count] = price
+                reason[count] = code
+                count += 1
+                in_position = False
+            else:
+                peak = max(peak, high[i])
+        if not in_position and codes[i] == 1:
+            entry = close[i]
+            peak = entry
+            entry_idx[count] = i
+            in_position = True
+    if in_position:
+        exit_idx[count] = -1
+        exit_price[count] = close[n - 1]
+        reason[count] = OPEN
+        count += 1
+    return count, entry_idx, exit_idx, exit_price, reason
+
+
+def _first_exit(start, stop_at, entry, open_, high, low, stop_loss, take_profit, trailing_stop):
+    """
+    First bar in ``start..stop_at`` whose range crosses a level, as
+    ``(index, price, reason)``, or None. Scans windows of doubling size so a
+    trade costs O(its length) however far away the next Sell signal is.
+    """
+    fixed = entry * (1.0 - stop_loss) if not np.isnan(stop_loss) else -np.inf
+    target = entry * (1.0 + take_profit) if not np.isnan(take_profit) else np.inf
+    use_trail = not np.isnan(trailing_stop)
+    peak = entry
+    lo, window = start, _FIRST_WINDOW
+    while lo <= stop_at:
+        hi = min(lo + window, stop_at + 1)
+        h = high[lo:hi]
+        if use_trail:
+            prior_peak = np.maximum.accumulate(np.concatenate(([peak], h[:-1])))
+            trail = prior_peak * (1.0 - trailing_stop)
+            level = np.maximum(fixed, trail)
+            peak = max(prior_peak[-1], h[-1])
+        else:
+            trail = None
+            level = fixed
+        stop_hit = low[lo:hi] <= level
+        hit = stop_hit | (h >= target)
+        if hit.any():
+            k = int(np.argmax(hit))
+            i = lo + k
+            if stop_hit[k]:
+                at = level[k] if use_trail else fixed
+                code = TRAILING_STOP if use_trail and trail[k] > fixed else STOP_LOSS
+                return i, min(open_[i], at), code
+            return i, max(open_[i], target), TAKE_PROFIT
+        lo, window = hi, window * 2
+    return None
+
+
+def _simulate_segments(codes, open_, high, low, close, stop_loss, take_profit, trailing_stop):
+    """NumPy fallback for `_simulate_loop`; loops over trades, not bars."""
+    n = close.shape[0]
+    buys = np.flatnonzero(codes == 1)
+    sells = np.flatnonzero(codes == -1)
+    entries, exits, prices, reasons = [], [], [], []
+    start = 0
+    while True:
+        k = np.searchsorted(buys, start)
+        if k == len(buys):
+            break
+        i = int(buys[k])
+        j = np.searchsorted(sells, i, side="right")
+        sell = int(sells[j]) if j < len(sells) else -1
+        entries.append(i)
+        found = None
+        if i + 1 < n:
+            stop_at = sell if sell >= 0 else n - 1
+            found = _first_exit(i + 1, stop_at, close[i], open_, high, low, stop_loss, take_profit, trailing_stop)
+        if found is not None:
+            exit_bar, price, code = found
+        elif sell >= 0:
+            exit_bar, price, code = sell, close[sell], SIGNAL
+        else:
+            exits.append(-1)
+            prices.append(close[n - 1])
+            reasons.append(OPEN)
+            break
+        exits.append(exit_bar)
+        prices.append(price)
+        reasons.append(code)
+        start = exit_bar
+    return (
+        len(entries),
+        np.asarray(entries, np.int64),
+        np.asarray(exits, np.int64),
+        np.asarray(prices, np.float64),
+        np.asarray(reasons, np.int64),
+    )
+
+
+@lru_cache(maxsize=None)
+def _kernel():
+    """Compiled `_simulate_loop` when numba is installed, else the NumPy fallback."""
+    try:
+        import numba  # type: ignore
+    except ModuleNotFoundError:  # Optional dependency
+        return _simulate_segments
+    return numba.njit(cache=True, nogil=True)(_simulate_loop)
+
+
+def _level(value: Optional[float], name: str) -> float:
+    if value is None:
+        return np.nan
+    if not value > 0:
+        raise ValueError(f"`{name}` must be a positive fraction, e.g. 0.05 for 5%.")
+    return float(value)
+
+
+def _arrays(df: pd.DataFrame, signal_col: str, price_col: str):
+    missing = [col for col in (signal_col, price_col, "High", "Low") if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns for intrabar backtest: {', '.join(missing)}.")
+    signals = df[signal_col]
+    codes = np.where(signals == "Buy", 1, np.where(signals == "Sell", -1, 0)).astype(np.int64)
+    close = df[price_col].to_numpy(np.float64)
+    high = df["High"].to_numpy(np.float64)
+    low = df["Low"].to_numpy(np.float64)
+    if "Open" in df.columns:
+        open_ = df["Open"].to_numpy(np.float64)
+    else:
+        # Assume each bar opens at the previous close, kept inside its range
+        open_ = np.clip(np.concatenate((close[:1], close[:-1])), low, high)
+    return codes, open_, high, low, close
+
+
+def _run(arrays, stop_loss, take_profit, trailing_stop):
+    count, entry_idx, exit_idx, exit_price, reason = _kernel()(*arrays, stop_loss, take_profit, trailing_stop)
+    return entry_idx[:count], exit_idx[:count], exit_price[:count], reason[:count]
+
+
+@timed()
+def backtest_intrabar(
+    df: pd.DataFrame,
+    signal_col: str,
+    stop_loss: Optional[float] = None,
+    take_profit: Optional[float] = None,
+    trailing_stop: Optional[float] = None,
+    price_col: str = "Close",
+) -> Tuple[List[tuple], float]:
+    """
+    Backtest ``signal_col`` with protective exits evaluated on High/Low.
+
+    Levels are fractions of the entry (or peak) price; None disables one.
+    Returns ``(trades, final_value)`` like `backtest_signals`, except each trade
+    carries its exit reason: ``(side, price, timestamp, reason)``.
+    """
+    arrays = _arrays(df, signal_col, price_col)
+    entries, exits, prices, reasons = _run(
+        arrays,
+        _level(stop_loss, "stop_loss"),
+        _level(take_profit, "take_profit"),
+        _level(trailing_stop, "trailing_stop"),
+    )
+    close = arrays[-1]
+    index = df.index
+    trades = []
+    value = INITIAL_CAPITAL
+    for entry, exit_, price, code in zip(entries, exits, prices, reasons):
+        trades.append(("Buy", close[entry], index[entry], "signal"))
+        if exit_ >= 0:
+            trades.append(("Sell", price, index[exit_], EXIT_REASONS[int(code)]))
+        value *= price / close[entry]
+    return trades, float(value)
+
+
+@timed()
+def grid_intrabar(
+    df: pd.DataFrame,
+    signal_col: str,
+    stop_losses: Iterable[Optional[float]] = (None,),
+    take_profits: Iterable[Optional[float]] = (None,),
+    trailing_stops: Iterable[Optional[float]] = (None,),
+    price_col: str = "Close",
+) -> pd.DataFrame:
+    """
+    Final value, trade count and win rate for every level combination.
+
+    The price arrays are extracted once and shared by all runs.
+    """
+    arrays = _arrays(df, signal_col, price_col)
+    close = arrays[-1]
+    rows = []
+    for sl, tp, trail in product(stop_losses, take_profits, trailing_stops):
+        entries, _, prices, _ = _run(
+            arrays, _level(sl, "stop_loss"), _level(tp, "take_profit"), _level(trail, "trailing_stop")
+        )
+        returns = prices / close[entries]
+        rows.append(
+            {
+                "stop_loss": sl,
+                "take_profit": tp,
+                "trailing_stop": trail,
+                "final_value": INITIAL_CAPITAL * float(np.prod(returns)),
+                "trades": len(entries),
+                "win_rate": float((returns > 1).mean()) if len(returns) else np.nan,
+            }
+        )
+    return pd.DataFrame(rows)
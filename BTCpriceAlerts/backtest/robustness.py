@@ -0,0 +1,201 @@
+# backtest/robustness.py
+
+"""
+Bootstrap and Monte Carlo robustness checks for signal strategies.
+
+The signal column is turned into a position array once; every resampled path
+is then only a P&L pass over a 2-D ``(paths, bars)`` array:
+
+* `block_bootstrap` resamples per-bar strategy returns in circular blocks,
+  which keeps short-range autocorrelation and volatility clustering intact.
+* `shuffle_trades` permutes the order of round-trip trade returns; the total
+  return is unchanged, so it isolates how much of the drawdown was luck.
+
+`robustness_report` combines both into confidence intervals for total return,
+max drawdown and annualized Sharpe.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+# Upper bound on floats per simulated batch (~40 MB of returns)
+MAX_BATCH_CELLS = 5_000_000
+
+
+def positions(df: pd.DataFrame, signal_col: str) -> np.ndarray:
+    """
+    Long/flat position per bar as `backtest_signals` holds it: 1 from a Buy
+    until the next Sell, 0 otherwise.
+    """
+    signals = df[signal_col]
+    state = pd.Series(np.where(signals == "Buy", 1.0, np.where(signals == "Sell", 0.0, np.nan)), index=df.index)
+    return state.ffill().fillna(0.0).to_numpy()
+
+
+def strategy_returns(df: pd.DataFrame, signal_col: str, price_col: str = "Close") -> np.ndarray:
+    """Per-bar returns of the strategy, entering and exiting at ``price_col``."""
+    prices = df[price_col].to_numpy(np.float64)
+    held = positions(df, signal_col)[:-1]
+    return held * (prices[1:] / prices[:-1] - 1.0)
+
+
+def trade_returns(df: pd.DataFrame, signal_col: str, price_col: str = "Close") -> np.ndarray:
+    """Return of each round trip; a trade still open is marked at the last price."""
+    prices = df[price_col].to_numpy(np.float64)
+    held = positions(df, signal_col)
+    change = np.diff(np.concatenate(([0.0], held, [0.0])))
+    entries = np.flatnonzero(change > 0)
+    exits = np.minimum(np.flatnonzero(change < 0), len(prices) - 1)
+    return prices[exits] / prices[entries] - 1.0
+
+
+def path_metrics(returns: np.ndarray, periods_per_year: float = 365) -> Dict[str, np.ndarray]:
+    """Total return, max drawdown and annualized Sharpe for each row of ``returns``."""
+    returns = np.atleast_2d(returns)
+    equity = np.cumprod(1.0 + returns, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = returns.mean(axis=1) / returns.std(axis=1, ddof=1) * np.sqrt(periods_per_year)
+    return {
+        "total_return": equity[:, -1] - 1.0 if returns.shape[1] else np.zeros(len(returns)),
+        "max_drawdown": (1.0 - equity / peaks).max(axis=1, initial=0.0),
+        "sharpe": sharpe,
+    }
+
+
+def _batches(n_paths: int, width: int):
+    size = max(1, MAX_BATCH_CELLS // max(width, 1))
+    return [min(size, n_paths - start) for start in range(0, n_paths, size)]
+
+
+def _bootstrap_batch(returns: np.ndarray, n_paths: int, seed, block: int, periods_per_year: float):
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+    n_blocks = -(-n // block)
+    starts = rng.integers(0, n, (n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block)).reshape(n_paths, -1)[:, :n] % n
+    return path_metrics(returns[index], periods_per_year)
+
+
+def _shuffle_batch(trades: np.ndarray, n_paths: int, seed, periods_per_year: float):
+    rng = np.random.default_rng(seed)
+    order = np.argsort(rng.random((n_paths, len(trades))), axis=1)
+    return path_metrics(trades[order], periods_per_year)
+
+
+def _simulate(batch_func, data: np.ndarray, n_paths: int, seed: int, workers: int, *args) -> pd.DataFrame:
+    sizes = _batches(n_paths, len(data))
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(batch_func, data, size, s, *args) for size, s in zip(sizes, seeds)]
+            results = [future.result() for future in futures]
+    else:
+        results = [batch_func(data, size, s, *args) for size, s in zip(sizes, seeds)]
+    return pd.DataFrame({key: np.concatenate([r[key] for r in results]) for key in results[0]})
+
+
+@timed()
+def block_bootstrap(
+    returns: np.ndarray,
+    n_paths: int = 1000,
+    block: int = 20,
+    seed: int = 0,
+    workers: int = 1,
+    periods_per_year: float = 365,
+) -> pd.DataFrame:
+    """
+    Metrics of ``n_paths`` circular block-bootstrap resamples of ``returns``.
+
+    Paths are simulated in vectorized batches of at most `MAX_BATCH_CELLS`;
+    ``workers > 1`` spreads the batches over a process pool. Results depend
+    only on ``seed``, not on ``workers``.
+    """
+    returns = np.asarray(returns, np.float64)
+    if len(returns) < 2:
+        raise ValueError("Need at least two returns to bootstrap.")
+    block = max(1, min(block, len(returns)))
+    return _simulate(_bootstrap_batch, returns, n_paths, seed, workers, block, periods_per_year)
+
+
+@timed()
+def shuffle_trades(
+    trades: np.ndarray,
+    n_paths: int = 1000,
+    seed: int = 0,
+    workers: int = 1,
+    periods_per_year: float = 365,
+) -> pd.DataFrame:
+    """Metrics of ``n_paths`` random orderings of per-trade returns."""
+    trades = np.asarray(trades, np.float64)
+    if len(trades) < 2:
+        raise ValueError("Need at least two trades to shuffle.")
+    return _simulate(_shuffle_batch, trades, n_paths, seed, workers, periods_per_year)
+
+
+def summarize(samples: pd.DataFrame, observed: Dict[str, float], confidence: float = 0.95) -> pd.DataFrame:
+    """Observed value, mean and two-sided percentile interval per metric."""
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.nanpercentile(samples.to_numpy(), [tail, 100 - tail], axis=0)
+    return pd.DataFrame(
+        {
+            "observed": [observed[col] for col in samples.columns],
+            "mean": samples.mean().to_numpy(),
+            "ci_low": low,
+            "ci_high": high,
+        },
+        index=samples.columns,
+    )
+
+
+@timed()
+def robustness_report(
+    df: pd.DataFrame,
+    signal_col: str,
+    n_paths: int = 2000,
+    block: int = 20,
+    confidence: float = 0.95,
+    periods_per_year: float = 365,
+    seed: int = 0,
+    workers: int = 1,
+    price_col: str = "Close",
+) -> pd.DataFrame:
+    """
+    Confidence intervals for one strategy.
+
+    Rows are ``(method, metric)`` for ``bootstrap`` (per-bar block bootstrap)
+    and ``trade_shuffle`` (trade-order permutation, skipped with fewer than
+    two trades); trade-shuffle Sharpe is per trade, not annualized.
+    """
+    returns = strategy_returns(df, signal_col, price_col)
+    observed = {key: float(value[0]) for key, value in path_metrics(returns, periods_per_year).items()}
+    reports = {
+        "bootstrap": summarize(
+            block_bootstrap(returns, n_paths, block, seed, workers, periods_per_year), observed, confidence
+        )
+    }
+
+    trades = trade_returns(df, signal_col, price_col)
+    if len(trades) >= 2:
+        observed_trades = {key: float(value[0]) for key, value in path_metrics(trades, 1).items()}
+        samples = shuffle_trades(trades, n_paths, seed, workers, periods_per_year=1)
+        reports["trade_shuffle"] = summarize(samples, observed_trades, confidence)
+    return pd.concat(reports, names=["method", "metric"])
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark helper
+    import time
+
+    from data.synthetic import generate_ohlcv
+    from signals.indicators import add_ma_cross
+
+    frame = add_ma_cross(generate_ohlcv(100_000, freq="h"), short=20, long=50)
+    began = time.perf_counter()
+    report = robustness_report(frame, "MA_signal", n_paths=2000, periods_per_year=24 * 365, workers=4)
+    print(report.round(4))
+    print(f"2000 paths x 100k bars in {time.perf_counter() - began:.2f}s")
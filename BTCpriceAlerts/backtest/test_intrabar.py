@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import intrabar
+from backtest.backtester import backtest_signals
+from backtest.intrabar import backtest_intrabar, grid_intrabar
+from data.synthetic import generate_ohlcv
+
+
+LEVELS = [(0.02, np.nan, np.nan), (np.nan, 0.03, np.nan), (np.nan, np.nan, 0.04), (0.05, 0.08, 0.03)]
+
+
+def _bars(rows, signals):
+    index = pd.date_range("2024-01-01", periods=len(rows), freq="D")
+    df = pd.DataFrame(rows, columns=["Open", "High", "Low", "Close"], index=index)
+    df["Signal"] = signals
+    return df
+
+
+@pytest.fixture(scope="module")
+def random_signals():
+    df = generate_ohlcv(3000, seed=3)
+    rng = np.random.default_rng(0)
+    df["Signal"] = rng.choice(["Buy", "Sell", "Neutral"], size=len(df), p=[0.03, 0.02, 0.95])
+    return df
+
+
+def test_stop_loss_hits_on_low():
+    df = _bars(
+        [(100, 101, 99, 100), (100, 102, 94, 96), (96, 97, 95, 96)],
+        ["Buy", "Neutral", "Sell"],
+    )
+    trades, value = backtest_intrabar(df, "Signal", stop_loss=0.05)
+    assert trades[-1][1:] == (95.0, df.index[1], "stop_loss")
+    assert value == pytest.approx(10000 * 0.95)
+
+
+def test_gap_fills_at_open_and_stop_beats_target():
+    gap = _bars([(100, 100, 100, 100), (90, 91, 89, 90)], ["Buy", "Neutral"])
+    assert backtest_intrabar(gap, "Signal", stop_loss=0.05)[0][-1][1] == 90.0
+
+    both = _bars([(100, 100, 100, 100), (100, 111, 94, 100)], ["Buy", "Neutral"])
+    assert backtest_intrabar(both, "Signal", stop_loss=0.05, take_profit=0.1)[0][-1][3] == "stop_loss"
+
+
+def test_trailing_stop_follows_prior_highs():
+    df = _bars(
+        [(100, 100, 100, 100), (100, 120, 100, 118), (118, 119, 107, 110)],
+        ["Buy", "Neutral", "Neutral"],
+    )
+    trades, _ = backtest_intrabar(df, "Signal", stop_loss=0.2, trailing_stop=0.1)
+    assert trades[-1][1:] == (pytest.approx(108.0), df.index[2], "trailing_stop")
+
+
+def test_without_levels_matches_close_backtest(random_signals):
+    _, expected = backtest_signals(random_signals, "Signal")
+    _, value = backtest_intrabar(random_signals, "Signal")
+    assert value == pytest.approx(expected)
+
+
+def _assert_same_trades(result, expected):
+    count = expected[0]
+    assert result[0] == count
+    for got, want in zip(result[1:], expected[1:]):
+        np.testing.assert_array_equal(got[:count], want[:count])
+
+
+@pytest.mark.parametrize("levels", LEVELS)
+def test_fallback_matches_reference_loop(random_signals, levels):
+    arrays = intrabar._arrays(random_signals, "Signal", "Close")
+    _assert_same_trades(intrabar._simulate_segments(*arrays, *levels), intrabar._simulate_loop(*arrays, *levels))
+
+
+@pytest.mark.parametrize("levels", LEVELS)
+def test_compiled_kernel_matches_fallback(random_signals, levels):
+    pytest.importorskip("numba")
+    kernel = intrabar._kernel()
+    assert kernel is not intrabar._simulate_segments
+    arrays = intrabar._arrays(random_signals, "Signal", "Close")
+    _assert_same_trades(kernel(*arrays, *levels), intrabar._simulate_segments(*arrays, *levels))
+
+
+def test_grid_covers_every_combination(random_signals):
+    grid = grid_intrabar(random_signals, "Signal", stop_losses=(None, 0.02), take_profits=(0.05, 0.1, None))
+    assert len(grid) == 6
+    single = backtest_intrabar(random_signals, "Signal", stop_loss=0.02, take_profit=0.1)[1]
+    row = grid[(grid.stop_loss == 0.02) & (grid.take_profit == 0.1)]
+    assert row.final_value.iloc[0] == pytest.approx(single)
+
+
+def test_rejects_bad_levels(random_signals):
+    with pytest.raises(ValueError):
+        backtest_intrabar(random_signals, "Signal", stop_loss=-0.1)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from backtest import robustness
+from backtest.backtester import backtest_signals
+from backtest.robustness import (
+    block_bootstrap,
+    path_metrics,
+    robustness_report,
+    shuffle_trades,
+    strategy_returns,
+    trade_returns,
+)
+from data.synthetic import generate_ohlcv
+from signals.indicators import add_ma_cross
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return add_ma_cross(generate_ohlcv(1500, seed=5), short=10, long=30)
+
+
+def test_returns_reproduce_backtest(frame):
+    _, final_value = backtest_signals(frame, "MA_signal")
+
+    assert 10000 * np.prod(1 + strategy_returns(frame, "MA_signal")) == pytest.approx(final_value)
+    assert 10000 * np.prod(1 + trade_returns(frame, "MA_signal")) == pytest.approx(final_value)
+
+
+def test_path_metrics():
+    metrics = path_metrics(np.array([[0.1, -0.5, 0.2], [0.0, 0.0, 0.0]]))
+
+    np.testing.assert_allclose(metrics["total_return"], [1.1 * 0.5 * 1.2 - 1, 0.0])
+    np.testing.assert_allclose(metrics["max_drawdown"], [0.5, 0.0])
+    assert np.isnan(metrics["sharpe"][1])
+
+
+def test_bootstrap_is_seeded_and_batched(frame, monkeypatch):
+    returns = strategy_returns(frame, "MA_signal")
+    whole = block_bootstrap(returns, n_paths=300, seed=1)
+    repeat = block_bootstrap(returns, n_paths=300, seed=1)
+    other = block_bootstrap(returns, n_paths=300, seed=2)
+    monkeypatch.setattr(robustness, "MAX_BATCH_CELLS", len(returns) * 7)
+    batched = block_bootstrap(returns, n_paths=300, seed=1)
+
+    assert len(whole) == 300
+    assert whole.equals(repeat)
+    assert not whole.equals(other)
+    # Batch boundaries change the seeds; the distribution should not move much
+    assert batched["sharpe"].median() == pytest.approx(whole["sharpe"].median(), abs=0.25)
+
+
+def test_shuffle_keeps_total_return(frame):
+    trades = trade_returns(frame, "MA_signal")
+    samples = shuffle_trades(trades, n_paths=200)
+
+    np.testing.assert_allclose(samples["total_return"], np.prod(1 + trades) - 1)
+    assert samples["max_drawdown"].nunique() > 1
+
+
+def test_report_intervals_bracket_means(frame):
+    report = robustness_report(frame, "MA_signal", n_paths=400)
+
+    assert set(report.index.get_level_values("method")) == {"bootstrap", "trade_shuffle"}
+    assert (report["ci_low"] <= report["ci_high"]).all()
+    assert report.loc[("trade_shuffle", "total_return"), "observed"] == pytest.approx(
+        report.loc[("bootstrap", "total_return"), "observed"]
+    )
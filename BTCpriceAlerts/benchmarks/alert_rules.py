@@ -0,0 +1,88 @@
+"""
+Throughput of compiled alert rules over a time x asset block.
+
+    python -m benchmarks.alert_rules --rules 2000 --tickers 300 --bars 500
+
+Rules are random conjunctions of indicator thresholds, signal checks and
+crossovers drawn from a small vocabulary, so (as with real users) many share
+sub-expressions. Reports compile time, a full-history evaluation (backtesting
+alerts) and the per-cycle check of the last bar only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+INDICATOR_SET = ["rsi", "macd", "ma_cross", "ema_cross", "bbands"]
+
+
+def random_rules(count: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    atoms = (
+        [f"RSI < {level}" for level in (20, 25, 28, 30, 35)]
+        + [f"RSI > {level}" for level in (65, 70, 72, 75, 80)]
+        + [f'{signal} == "{side}"' for signal in ("MACD_signal", "EMA_signal", "BB_signal") for side in ("Buy", "Sell")]
+        + ["Close > SMA_long", "Close < SMA_long", "SMA_short > SMA_long", "Close < BBL_20_2.0", "Close > BBU_20_2.0"]
+        + ["crosses_above(Close, SMA_short)", "crosses_below(Close, SMA_short)", "crosses_above(EMA_short, EMA_long)"]
+        + [f"MACD_12_26_9 > MACDs_12_26_9 * {scale}" for scale in (1.0, 1.05, 1.1)]
+        + [f"abs(Close - prev(Close)) / Close > {move}" for move in (0.02, 0.03, 0.05)]
+    )
+    rules = {}
+    for i in range(count):
+        picked = rng.choice(len(atoms), size=rng.integers(1, 4), replace=False)
+        joiner = " or " if rng.random() < 0.2 else " and "
+        rules[f"rule_{i}"] = joiner.join(atoms[j] for j in picked)
+    return rules
+
+
+def run(n_rules: int, n_tickers: int, n_bars: int) -> None:
+    from alerts.rules import RuleSet, stack_frames
+    from data.synthetic import generate_ohlcv
+    from signals.registry import LazyIndicatorFrame
+
+    rules = random_rules(n_rules)
+    start = time.perf_counter()
+    ruleset = RuleSet(rules)
+    compile_s = time.perf_counter() - start
+    print(f"compiled {n_rules} rules into {ruleset.subexpressions} sub-expressions in {compile_s * 1000:.0f} ms")
+
+    market = generate_ohlcv(n_bars, n_assets=n_tickers, freq="h")
+    tickers = market.columns.get_level_values(1).unique()
+    frames = {
+        ticker: LazyIndicatorFrame(market.xs(ticker, axis=1, level=1), INDICATOR_SET).to_frame()
+        for ticker in tickers
+    }
+    start = time.perf_counter()
+    block = stack_frames(frames, ruleset.columns)
+    print(f"stacked {n_tickers} tickers x {n_bars} bars in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for label, evaluate in (
+        ("full history", lambda: ruleset.evaluate(block)),
+        ("last bar", lambda: ruleset.triggered(block)),
+    ):
+        evaluate()
+        repeats, start = 0, time.perf_counter()
+        while time.perf_counter() - start < 1.0:
+            evaluate()
+            repeats += 1
+        seconds = (time.perf_counter() - start) / repeats
+        print(
+            f"{label:>12}: {seconds * 1000:8.2f} ms per cycle | "
+            f"{n_rules / seconds:>12,.0f} rules/s | {n_rules * n_tickers / seconds:>14,.0f} rule x ticker/s"
+        )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark compiled alert rules.")
+    parser.add_argument("--rules", type=int, default=2000)
+    parser.add_argument("--tickers", type=int, default=300)
+    parser.add_argument("--bars", type=int, default=500)
+    args = parser.parse_args(argv)
+    run(args.rules, args.tickers, args.bars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Server-side latency of common dashboard interactions, measured with AppTest.
+
+    python -m benchmarks.app_interactions                 # app.py
+    python -m benchmarks.app_interactions --app old.py    # any revision of it
+
+Each interaction is replayed ``--repeat`` times on a warm session and the
+median wall time of the rerun is reported. AppTest always reruns the whole
+script, so for interactions scoped to an ``st.fragment`` (indicator toggles,
+the macro window, timer refreshes) the browser only waits for the fragment
+body; its instrumentation track is listed next to the full rerun.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+
+def _checkbox(at, label: str):
+    return next((box for box in at.sidebar.checkbox if box.label == label), None)
+
+
+Step = Tuple[str, Callable[[], None], Tuple[str, ...]]
+
+
+def _interactions(at) -> List[Step]:
+    """
+    Toggle one overlay, open the macro tab, change its window, refresh.
+
+    Each step names the fragment tracks that rerun for it in the browser
+    (empty when the interaction reruns the whole script).
+    """
+    steps: List[Step] = []
+    if "overlays" in at.session_state:
+        def toggle():
+            selected = list(at.button_group(key="overlays").value)
+            flipped = [n for n in selected if n != "bbands"] if "bbands" in selected else selected + ["bbands"]
+            at.button_group(key="overlays").set_value(flipped)
+
+        def window():
+            at.select_slider(key="macro_window").set_value(
+                24 if at.select_slider(key="macro_window").value == 12 else 12
+            )
+
+        steps.append(("toggle indicator", toggle, ("app.overlay_figure",)))
+        steps.append(("open macro tab", lambda: at.session_state.__setitem__("view", "Macro Lens"), ()))
+        steps.append(("change macro window", window, ("app.macro_sensitivity",)))
+        steps.append(("back to chart tab", lambda: at.session_state.__setitem__("view", "Price Action"), ()))
+        steps.append(("timer refresh", lambda: None, ("app.kpi_strip", "app.overlay_figure")))
+        return steps
+
+    # Pre-fragment layout: sidebar checkboxes and every tab rendered each run
+    def toggle():
+        box = _checkbox(at, "Bollinger Bands")
+        box.set_value(not box.value)
+
+    def window():
+        slider = next(s for s in at.select_slider if s.label.startswith("Rolling window"))
+        slider.set_value(24 if slider.value == 12 else 12)
+
+    steps.append(("toggle indicator", toggle, ()))
+    steps.append(("change macro window", window, ()))
+    steps.append(("timer refresh", lambda: None, ()))
+    return steps
+
+
+def _track_seconds(names: Tuple[str, ...], before: List[Dict]) -> float:
+    from utils import instrumentation
+
+    return sum(m["total_seconds"] for m in instrumentation.diff(before) if m["name"] in names)
+
+
+def run(app: Path, repeat: int) -> Dict[str, Dict[str, float]]:
+    from streamlit.testing.v1 import AppTest
+
+    from utils import instrumentation
+
+    at = AppTest.from_file(str(app.resolve()), default_timeout=300)
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{app} failed: {at.exception[0].message}")
+    _checkbox(at, "Performance debug panel").check()
+    at.run()
+
+    # The panel only captures its own session's calls; the fragment timings
+    # below read the process-wide metrics
+    instrumentation.enable()
+    results = {"initial run": {"rerun_ms": cold * 1000}}
+    try:
+        for name, action, tracks in _interactions(at):
+            timings, fragments = [], []
+            for _ in range(repeat):
+                action()
+                before = instrumentation.snapshot()
+                start = time.perf_counter()
+                at.run()
+                timings.append(time.perf_counter() - start)
+                fragments.append(_track_seconds(tracks, before))
+            results[name] = {"rerun_ms": statistics.median(timings) * 1000}
+            if tracks:
+                results[name]["fragment_ms"] = statistics.median(fragments) * 1000
+    finally:
+        instrumentation.disable()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time dashboard interactions through AppTest.")
+    parser.add_argument("--app", type=Path, default=BASE_DIR / "app.py")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{args.app.name}: median of {args.repeat} reruns")
+    for name, timing in run(args.app, args.repeat).items():
+        fragment = timing.get("fragment_ms")
+        suffix = f" | fragment {fragment:8.1f} ms" if fragment is not None else ""
+        print(f"{name:>20}: {timing['rerun_ms']:8.1f} ms{suffix}")
+
+
+if __name__ == "__main__":
+    main()
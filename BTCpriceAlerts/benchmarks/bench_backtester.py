@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from backtest.backtester import backtest_signals
+from backtest.intrabar import backtest_intrabar, grid_intrabar
+from backtest.robustness import block_bootstrap, strategy_returns
+from benchmarks.conftest import rounds_for
+from signals.indicators import add_ma_cross
+
+
+@pytest.fixture()
+def signal_frame(bars):
+    return add_ma_cross(bars.copy(), short=20, long=50)
+
+
+def test_backtest_signals(benchmark, signal_frame):
+    benchmark.pedantic(
+        backtest_signals,
+        args=(signal_frame, "MA_signal"),
+        rounds=rounds_for(len(signal_frame) * 50),
+        iterations=1,
+    )
+
+
+def test_backtest_intrabar(benchmark, signal_frame):
+    benchmark(backtest_intrabar, signal_frame, "MA_signal", stop_loss=0.02, take_profit=0.05, trailing_stop=0.03)
+
+
+def test_grid_intrabar(benchmark, signal_frame):
+    levels = (None, 0.01, 0.02, 0.05)
+    benchmark.pedantic(
+        grid_intrabar,
+        args=(signal_frame, "MA_signal", levels, levels, levels),
+        rounds=rounds_for(len(signal_frame) * 64),
+        iterations=1,
+    )
+
+
+def test_block_bootstrap(benchmark, signal_frame):
+    returns = strategy_returns(signal_frame, "MA_signal")
+    benchmark.pedantic(block_bootstrap, args=(returns, 200), rounds=rounds_for(len(returns) * 200), iterations=1)
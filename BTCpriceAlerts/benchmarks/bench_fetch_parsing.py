@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+requests = pytest.importorskip("requests")
+
+from benchmarks.conftest import rounds_for
+from data import fetch_fred
+
+
+class _CannedResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        return None
+
+
+@pytest.fixture()
+def fred_csv(bars):
+    """A fredgraph-style CSV body with one row per bar."""
+    frame = pd.DataFrame({"DATE": bars.index.strftime("%Y-%m-%d %H:%M"), "CPIAUCSL": bars["Close"].round(3)})
+    return frame.to_csv(index=False)
+
+
+def test_fetch_fred_csv_parsing(benchmark, monkeypatch, fred_csv, bars):
+    response = _CannedResponse(fred_csv)
+    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: response)
+
+    result = benchmark.pedantic(
+        fetch_fred._fetch_fred_csv,
+        args=("CPIAUCSL", "2017-01-01"),
+        rounds=rounds_for(len(bars)),
+        iterations=1,
+    )
+    assert len(result) == len(bars)
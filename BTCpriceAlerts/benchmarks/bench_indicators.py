@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from signals.indicators import (
+    add_atr,
+    add_bollinger_bands,
+    add_donchian,
+    add_ema_cross,
+    add_macd,
+    add_ma_cross,
+    add_rolling_vwap,
+    add_rsi,
+    add_stochastic,
+    add_vwap,
+    add_williams_r,
+    latest_values,
+)
+
+ADD_FUNCTIONS = [
+    add_rsi,
+    add_macd,
+    add_ma_cross,
+    add_ema_cross,
+    add_bollinger_bands,
+    add_vwap,
+    add_rolling_vwap,
+    add_donchian,
+    add_stochastic,
+    add_williams_r,
+    add_atr,
+]
+
+
+@pytest.mark.parametrize("func", ADD_FUNCTIONS, ids=lambda func: func.__name__)
+def test_add_indicator(bench_on_copy, bars, indicator_mode, func):
+    bench_on_copy(func, bars)
+
+
+@pytest.mark.parametrize("func", [add_rsi, add_macd, add_ma_cross], ids=lambda func: func.__name__)
+def test_latest_values(benchmark, bars, indicator_mode, func):
+    benchmark(latest_values, bars, func)
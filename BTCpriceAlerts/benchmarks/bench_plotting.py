@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("plotly")
+
+from benchmarks.conftest import rounds_for
+from signals.registry import LazyIndicatorFrame
+from utils.plotting import add_indicator_traces, plot_candlestick, plot_dual_axis
+
+
+def test_plot_candlestick(benchmark, bars):
+    benchmark.pedantic(plot_candlestick, args=(bars,), rounds=rounds_for(len(bars) * 10), iterations=1)
+
+
+def test_plot_dual_axis(benchmark, bars):
+    frame = bars.reset_index()
+    benchmark.pedantic(
+        plot_dual_axis,
+        args=(frame, "Date", "Close", "Volume"),
+        rounds=rounds_for(len(bars) * 10),
+        iterations=1,
+    )
+
+
+def test_add_indicator_traces(benchmark, bars):
+    import plotly.graph_objects as go
+
+    frame = LazyIndicatorFrame(bars, ["rsi", "macd", "ma_cross", "bbands"])
+    frame.to_frame()
+
+    benchmark.pedantic(
+        lambda: add_indicator_traces(go.Figure(), frame, frame.indicators),
+        rounds=rounds_for(len(bars) * 10),
+        iterations=1,
+    )
@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the pytest-benchmark suite.
+
+Run it (pytest only collects the ``bench_*.py`` files when given explicitly):
+
+    python -m pytest benchmarks/bench_*.py --benchmark-autosave
+    python -m pytest benchmarks/bench_*.py --benchmark-compare
+
+Results are stored under ``.benchmarks/`` so runs on different commits can be
+compared with ``--benchmark-compare`` or ``pytest-benchmark compare``. Input
+sizes default to 1k and 100k bars; set ``BENCH_SIZES=1000,100000,10000000`` to
+include the 10M-bar tier.
+"""
+
+import os
+from functools import lru_cache
+
+import pandas as pd
+import pytest
+
+from data.fetch_btc import _fallback_series
+from signals import indicators
+
+BENCH_SIZES = tuple(int(size) for size in os.environ.get("BENCH_SIZES", "1000,100000").split(","))
+
+
+@lru_cache(maxsize=None)
+def price_history(size: int) -> pd.DataFrame:
+    """Minute bars from the offline fallback generator, built once per size."""
+    return _fallback_series(size, "1m")
+
+
+def rounds_for(size: int) -> int:
+    return max(1, min(20, 1_000_000 // size))
+
+
+@pytest.fixture(params=BENCH_SIZES, ids=lambda size: f"{size}bars")
+def bars(request):
+    return price_history(request.param)
+
+
+@pytest.fixture(params=["pandas_ta", "fallback"])
+def indicator_mode(request, monkeypatch):
+    """Run indicator benchmarks with and without pandas_ta."""
+    if request.param == "pandas_ta":
+        pytest.importorskip("pandas_ta")
+    else:
+        monkeypatch.setattr(indicators, "_ta", lambda: None)
+    return request.param
+
+
+@pytest.fixture()
+def bench_on_copy(benchmark):
+    """Time ``func(df.copy(), ...)`` with the copy excluded from the measurement."""
+
+    def run(func, df, *args, **kwargs):
+        return benchmark.pedantic(
+            func,
+            setup=lambda: ((df.copy(),) + args, kwargs),
+            rounds=rounds_for(len(df)),
+            iterations=1,
+        )
+
+    return run
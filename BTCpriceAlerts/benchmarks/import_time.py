@@ -0,0 +1,126 @@
+"""
+Per-module import-time report built on ``python -X importtime``.
+
+    python -m benchmarks.import_time            # print the report
+    python -m benchmarks.import_time --save     # store it as the new baseline
+    python -m benchmarks.import_time --compare  # fail if a module got slower
+
+Each module is imported in a fresh interpreter several times and the fastest
+run is kept, which filters out disk-cache noise. The baseline is committed
+(benchmarks/import_time_baseline.json); ``--baseline`` points at another one,
+e.g. one saved on the machine being compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BASELINE_PATH = BASE_DIR / "benchmarks" / "import_time_baseline.json"
+
+CORE_MODULES = (
+    "data.fetch_btc",
+    "data.fetch_fred",
+    "data.aggregator",
+    "data.synthetic",
+    "data.shared_frames",
+    "data.validation",
+    "macro.fetch_cpi",
+    "macro.fetch_m2",
+    "macro.fetch_policy",
+    "signals.indicators",
+    "signals.registry",
+    "backtest.backtester",
+)
+# Dependencies that must only be imported on first use by the core modules.
+HEAVY_MODULES = ("pandas_ta", "plotly", "streamlit", "yfinance", "requests")
+
+
+def _import_profile(module: str) -> Dict[str, int]:
+    """Return cumulative import time in µs for every module ``module`` pulls in."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:  # header row
+            continue
+        profile[parts[2].strip()] = cumulative
+    return profile
+
+
+def measure(modules=CORE_MODULES, repeat: int = 5) -> Dict[str, Dict]:
+    report: Dict[str, Dict] = {}
+    for module in modules:
+        runs = [_import_profile(module) for _ in range(repeat)]
+        best = min(runs, key=lambda profile: profile.get(module, 0))
+        heavy = sorted(
+            name for name in best if name.split(".")[0] in HEAVY_MODULES and "." not in name
+        )
+        report[module] = {"cumulative_us": best.get(module, 0), "heavy_imports": heavy}
+    return report
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """List modules that got slower than ``tolerance`` or started importing heavy deps."""
+    regressions = []
+    for module, stats in current.items():
+        previous = baseline.get(module)
+        if not previous:
+            continue
+        limit = previous["cumulative_us"] * (1 + tolerance)
+        if stats["cumulative_us"] > limit:
+            regressions.append(
+                f"{module}: {previous['cumulative_us'] / 1000:.1f}ms -> {stats['cumulative_us'] / 1000:.1f}ms"
+            )
+        added = set(stats["heavy_imports"]) - set(previous["heavy_imports"])
+        if added:
+            regressions.append(f"{module}: now imports {', '.join(sorted(added))}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", action="store_true", help="store results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the stored baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON to save or compare")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (fraction)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.compare and not args.baseline.exists():
+        print(f"❌ No import-time baseline at {args.baseline}; create it with --save")
+        return 2
+
+    report = measure(repeat=args.repeat)
+    for module, stats in report.items():
+        heavy = ", ".join(stats["heavy_imports"]) or "-"
+        print(f"{module:<22} {stats['cumulative_us'] / 1000:8.1f} ms   heavy: {heavy}")
+
+    status = 0
+    if args.compare:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        status = 1 if regressions else 0
+    if args.save:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Latency from a signal transition to delivery on every alert channel.
+
+    python -m benchmarks.notification_latency --alerts 5 --webhook-latency 0.05 --smtp-latency 0.2
+
+Local stand-ins replace the real endpoints (see alerts/testing.py):
+`LocalWebhook` for the generic and the Slack-style channel and `LocalSMTP`
+for email. Bars are replayed one at a time through a
+compiled rule; on each bar where the rule fires for some ticker, the clock
+starts before the rule is evaluated and stops when a stand-in has received the
+message. The old way (each channel sent in turn) is compared with the
+`Dispatcher` fan-out.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from alerts.testing import LocalSMTP, LocalWebhook
+
+
+def bars(n_tickers: int = 20):
+    """Replay synthetic hourly bars: yield (rules, block up to the newest bar)."""
+    from alerts.rules import Block, RuleSet, stack_frames
+    from data.synthetic import generate_ohlcv
+    from signals.registry import LazyIndicatorFrame
+
+    market = generate_ohlcv(400, n_assets=n_tickers, freq="h")
+    frames = {
+        ticker: LazyIndicatorFrame(market.xs(ticker, axis=1, level=1), {"ma_cross": {"short": 5, "long": 20}}).to_frame()
+        for ticker in market.columns.get_level_values(1).unique()
+    }
+    rules = RuleSet({"breakout": "crosses_above(Close, SMA_short) and Close > SMA_long"})
+    block = stack_frames(frames, rules.columns)
+    for end in range(30, len(block.index)):
+        yield rules, Block(block.index[: end + 1], block.tickers, {k: v[: end + 1] for k, v in block.columns.items()})
+
+
+def run(n_alerts: int, webhook_latency: float, smtp_latency: float) -> None:
+    from alerts.notifiers import Alert, ChatWebhookNotifier, Dispatcher, EmailNotifier, Outbox, WebhookNotifier
+
+    webhook, chat, smtp = LocalWebhook(webhook_latency), LocalWebhook(webhook_latency), LocalSMTP(smtp_latency)
+    channels = [
+        EmailNotifier(smtp.host, ["trader@example.com"], "alerts@example.com", port=smtp.port, rate=None),
+        WebhookNotifier(webhook.url, rate=None),
+        # Real chat webhooks allow ~1 message/s; unthrottled here to time the delivery path itself
+        ChatWebhookNotifier(chat.url, "slack", rate=None),
+    ]
+    receivers = {"email": smtp, "webhook": webhook, "slack": chat}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            dispatcher = Dispatcher(channels, Outbox(f"{tmp}/outbox.sqlite3"))
+
+            def sequential(alert):
+                for channel in channels:
+                    channel.send(alert)
+
+            def fan_out(alert):
+                dispatcher.notify(alert)
+
+            for label, deliver in (("sequential", sequential), ("dispatcher", fan_out)):
+                latencies = {name: [] for name in receivers}
+                alerts = 0
+                for rules, block in bars():
+                    for receiver in receivers.values():
+                        receiver.received.clear()
+                    started = time.time()
+                    fired = rules.triggered(block)
+                    if not fired:
+                        continue
+                    for rule, tickers in fired.items():
+                        deliver(Alert(f"{rule}: {', '.join(tickers)}", f"{rule} fired at {block.index[-1]}", created=started))
+                    for name, receiver in receivers.items():
+                        latencies[name].extend(at - started for at, _ in receiver.received)
+                    alerts += 1
+                    if alerts >= n_alerts:
+                        break
+                summary = "  ".join(
+                    f"{name} p50 {np.median(values) * 1000:6.1f} / max {np.max(values) * 1000:6.1f} ms"
+                    for name, values in latencies.items()
+                )
+                print(f"{label:>10} ({alerts} transitions): {summary}")
+            dispatcher.close()
+    finally:
+        for receiver in receivers.values():
+            receiver.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Time alert delivery from signal transition to receipt.")
+    parser.add_argument("--alerts", type=int, default=5, help="signal transitions to replay")
+    parser.add_argument("--webhook-latency", type=float, default=0.05, help="seconds each HTTP endpoint takes")
+    parser.add_argument("--smtp-latency", type=float, default=0.2, help="seconds the SMTP server takes per message")
+    args = parser.parse_args(argv)
+    run(args.alerts, args.webhook_latency, args.smtp_latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Concurrent-session load test for the Streamlit dashboards, through AppTest.
+
+    python -m benchmarks.session_load --sessions 1,4,8 --interactions 10
+    python -m benchmarks.session_load --app dashboard.py --json baseline.json
+
+Every simulated analyst is an `AppTest` session on its own thread in this
+process, so sessions share `st.cache_*`, the memory-mapped frames and the GIL
+the way they do in one Streamlit server. Each session loads the page, then
+performs ``--interactions`` random interactions (toggle an indicator, switch
+interval or depth, change tab, timer rerun) separated by exponentially
+distributed think time.
+
+AppTest swaps process-wide Streamlit state for every run, so runs are
+serialised by a lock and an interaction's latency includes the time spent
+waiting for it. For CPU-bound reruns that is what one core gives a server
+anyway (same throughput; FIFO instead of interleaved), and it makes the CPU
+time of each run exact.
+
+Runs fully offline: yfinance and FRED are replaced by the synthetic
+fallbacks, and the shared-frame directory and SQLite stores live in a
+temporary directory. Reported per sweep point:
+
+- latency percentiles of each interaction (full script rerun, server side;
+  fragment-scoped interactions are cheaper in a browser, see
+  benchmarks/app_interactions.py)
+- CPU time per interaction and per session, and CPU utilisation over the run
+- resident memory added per session (RSS growth / sessions)
+
+The first sweep point also pays for module imports and cold caches, which
+shows up in its initial load and RSS. Save a run with ``--json`` before and
+after a caching change to compare.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+Action = Tuple[str, Callable[[], None]]
+
+# Sidebar selectboxes and the values a session switches between. AppTest's
+# select_index() would pass the format_func label back as the value.
+SELECTBOXES = {
+    "change interval": ("Sampling interval", ["1d", "1h"]),
+    "change depth": ("Historical depth", ["90", "180", "365"]),
+}
+TABS = ["Price Action", "Signal Matrix", "Macro Lens"]
+
+_RUN_LOCK = threading.Lock()
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux /proc; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def go_offline(workdir: Path) -> None:
+    """Synthetic data only, and private copies of every on-disk cache."""
+    os.environ["BTC_SHARED_DIR"] = str(workdir / "shared")
+    os.environ["BTC_SNAPSHOT_DB"] = str(workdir / "snapshots.sqlite3")
+    os.environ["BTC_SIGNAL_ARCHIVE"] = str(workdir / "signal_archive.sqlite3")
+    os.environ["BTC_OUTBOX_DB"] = str(workdir / "outbox.sqlite3")
+
+    import data.fetch_btc as fetch_btc
+    import data.fetch_fred as fetch_fred
+
+    fetch_btc._yfinance = lambda: None
+    fetch_fred._fetch_fred_csv = lambda series_id, start_date: None
+
+
+def _actions(at, rng: random.Random) -> List[Action]:
+    """Interactions available on the page ``at`` has rendered."""
+    from signals.registry import INDICATORS
+
+    actions: List[Action] = [("timer rerun", lambda: None)]
+    if "overlays" in at.session_state:
+        def toggle():
+            # Through session state: the picker is only rendered on the Price Action tab
+            name = rng.choice(list(INDICATORS))
+            selected = list(at.session_state["overlays"])
+            at.session_state["overlays"] = [n for n in selected if n != name] if name in selected else selected + [name]
+
+        def selectbox(label: str, values: List[str]):
+            def select():
+                box = next(b for b in at.sidebar.selectbox if b.label == label)
+                box.set_value(rng.choice([v for v in values if v != box.value]))
+
+            return select
+
+        def tab():
+            at.session_state["view"] = rng.choice(TABS)
+
+        actions.append(("toggle indicator", toggle))
+        actions += [(name, selectbox(label, values)) for name, (label, values) in SELECTBOXES.items()]
+        actions.append(("switch tab", tab))
+        return actions
+
+    labels = {spec.label for spec in INDICATORS.values()}
+    boxes = [box for box in at.sidebar.checkbox if box.label in labels]
+    if boxes:
+        def toggle_box():
+            box = rng.choice(boxes)
+            box.set_value(not box.value)
+
+        actions.append(("toggle indicator", toggle_box))
+    return actions
+
+
+def _session(
+    app: Path,
+    interactions: int,
+    think: float,
+    seed: int,
+    start: threading.Barrier,
+    samples: Dict[str, List[Tuple[float, float]]],
+    errors: List[str],
+    keep: list,
+) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(str(app), default_timeout=600)
+    keep.append(at)
+
+    def rerun(name: str) -> bool:
+        began = time.perf_counter()
+        with _RUN_LOCK:
+            cpu = time.process_time()
+            at.run()
+            cpu = time.process_time() - cpu
+        samples[name].append((time.perf_counter() - began, cpu))
+        if at.exception:
+            errors.append(f"{name}: {at.exception[0].message}")
+        return not at.exception
+
+    start.wait()
+    if not rerun("initial load"):
+        return
+    actions = _actions(at, rng)
+    for _ in range(interactions):
+        time.sleep(rng.expovariate(1 / think) if think > 0 else 0)
+        name, action = rng.choice(actions)
+        action()
+        if not rerun(name):
+            return
+
+
+def run(app: Path, sessions: int, interactions: int, think: float, seed: int = 0) -> dict:
+    """Drive ``sessions`` concurrent sessions once and summarize them."""
+    samples: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+    errors: List[str] = []
+    keep: list = []
+    barrier = threading.Barrier(sessions + 1)
+    threads = [
+        threading.Thread(
+            target=_session,
+            args=(app, interactions, think, seed * 1000 + i, barrier, samples, errors, keep),
+            name=f"session-{i}",
+            daemon=True,
+        )
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    rss_before = rss_mb()
+    barrier.wait()
+    wall, cpu = time.perf_counter(), time.process_time()
+    for thread in threads:
+        thread.join()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    rss_growth = rss_mb() - rss_before
+    keep.clear()
+
+    total = sum(len(values) for values in samples.values())
+    report = {
+        "app": app.name,
+        "sessions": sessions,
+        "interactions": total,
+        "errors": errors,
+        "wall_s": wall,
+        "throughput_per_s": total / wall if wall else 0.0,
+        "cpu_ms_per_interaction": cpu / total * 1000 if total else 0.0,
+        "cpu_s_per_session": cpu / sessions,
+        "cpu_utilisation": cpu / wall if wall else 0.0,
+        "rss_mb_per_session": rss_growth / sessions,
+        "latency_ms": {},
+    }
+    everything = [sample for values in samples.values() for sample in values]
+    for name, values in sorted(samples.items()) + [("all", everything)]:
+        if values:
+            latency, run_cpu = np.array(values).T * 1000
+            p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+            report["latency_ms"][name] = {
+                "n": len(values),
+                "p50": p50,
+                "p90": p90,
+                "p99": p99,
+                "max": latency.max(),
+                "cpu_p50": float(np.median(run_cpu)),
+            }
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['app']} x {report['sessions']} sessions: {report['interactions']} interactions in "
+        f"{report['wall_s']:.1f}s ({report['throughput_per_s']:.1f}/s), "
+        f"CPU {report['cpu_ms_per_interaction']:.0f} ms/interaction, {report['cpu_s_per_session']:.2f} s/session "
+        f"({report['cpu_utilisation']:.0%} of a core), +{report['rss_mb_per_session']:.1f} MB RSS/session"
+    ]
+    for name, stats in report["latency_ms"].items():
+        lines.append(
+            f"  {name:>18} n={stats['n']:<4} p50 {stats['p50']:7.0f}  p90 {stats['p90']:7.0f}  "
+            f"p99 {stats['p99']:7.0f}  max {stats['max']:7.0f} ms | CPU p50 {stats['cpu_p50']:6.0f} ms"
+        )
+    for error in report["errors"]:
+        lines.append(f"  ERROR {error}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test a dashboard with concurrent AppTest sessions.")
+    parser.add_argument("--app", type=Path, default=BASE_DIR / "app.py")
+    parser.add_argument("--sessions", default="1,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--interactions", type=int, default=10, help="interactions per session")
+    parser.add_argument("--think", type=float, default=0.5, help="mean think time between interactions (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write the reports here")
+    args = parser.parse_args(argv)
+
+    app = args.app.resolve()
+    reports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        go_offline(Path(tmp))
+        for sessions in (int(n) for n in args.sessions.split(",")):
+            report = run(app, sessions, args.interactions, args.think, args.seed)
+            print(format_report(report), flush=True)
+            reports.append(report)
+    if args.json:
+        args.json.write_text(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
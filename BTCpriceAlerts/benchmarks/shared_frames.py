@@ -0,0 +1,107 @@
+"""
+Per-hit latency and memory of shared Arrow frames vs. pickled cache copies.
+
+    python -m benchmarks.shared_frames --sessions 8 --rows 1000000
+
+``pickle`` mimics ``st.cache_data``: every hit unpickles a private copy.
+``arrow`` maps the frame published by `data.shared_frames`. Each session runs
+in its own process, holds its frame and touches every numeric value; private
+(anonymous) RSS is what each extra session really costs, while mapped pages
+show up as file-backed RSS shared through the page cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+
+def _rss_kb() -> Dict[str, int]:
+    fields = {}
+    with open("/proc/self/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def _session(mode: str, source: str, hits: int, queue) -> None:
+    from data.shared_frames import map_frame
+
+    if mode == "pickle":
+        payload = Path(source).read_bytes()
+        load = lambda: pickle.loads(payload)  # noqa: E731
+    else:
+        load = lambda: map_frame("bench", source)  # noqa: E731
+
+    baseline = _rss_kb()
+    df = load()
+    first = time.perf_counter()
+    for _ in range(hits):
+        df = load()
+    per_hit = (time.perf_counter() - first) / hits
+    checksum = float(df.select_dtypes("number").sum().sum())
+    after = _rss_kb()
+    queue.put(
+        {
+            "per_hit_ms": per_hit * 1000,
+            "anon_mb": (after["RssAnon"] - baseline["RssAnon"]) / 1024,
+            "file_mb": (after["RssFile"] - baseline["RssFile"]) / 1024,
+            "checksum": checksum,
+        }
+    )
+
+
+def run(sessions: int, rows: int, hits: int) -> None:
+    from data.shared_frames import publish_frame
+    from data.synthetic import generate_ohlcv
+    from signals.registry import INDICATORS, LazyIndicatorFrame
+
+    base = generate_ohlcv(rows, freq="min")
+    frame = LazyIndicatorFrame(base, list(INDICATORS)).to_frame()
+    size_mb = frame.memory_usage(deep=True).sum() / 2**20
+    print(f"frame: {rows:,} rows x {frame.shape[1]} columns, {size_mb:.0f} MB in memory")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = Path(tmp) / "frame.pkl"
+        pickle_path.write_bytes(pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL))
+        publish_frame("bench", frame, tmp)
+        del frame, base
+
+        ctx = mp.get_context("spawn")
+        for mode, source in (("pickle", str(pickle_path)), ("arrow", tmp)):
+            queue = ctx.Queue()
+            procs = [ctx.Process(target=_session, args=(mode, source, hits, queue)) for _ in range(sessions)]
+            for proc in procs:
+                proc.start()
+            results = [queue.get() for _ in procs]
+            for proc in procs:
+                proc.join()
+            per_hit = np.median([r["per_hit_ms"] for r in results])
+            anon = sum(r["anon_mb"] for r in results)
+            mapped = max(r["file_mb"] for r in results)
+            print(
+                f"{mode:>6}: {per_hit:9.3f} ms/hit | private RSS {anon:8.0f} MB over {sessions} sessions"
+                f" | file-backed {mapped:6.0f} MB per session (shared)"
+            )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Compare pickled vs. memory-mapped frame sharing.")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--hits", type=int, default=20)
+    args = parser.parse_args(argv)
+    run(args.sessions, args.rows, args.hits)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Archive queries versus recomputing indicators over the full history.
+
+    python -m benchmarks.signal_archive --tickers 20 --bars 43800
+
+Backfills hourly synthetic history (43,800 bars is five years) for every
+ticker into a temporary archive, then answers "all MA crosses for one ticker
+in one year" and "last Buy per indicator" both from the archive and by
+recomputing the indicators the way the dashboards do today.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+INDICATOR_SET = ["rsi", "macd", "ma_cross", "ema_cross", "bbands"]
+
+
+def _best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(n_tickers: int, n_bars: int) -> None:
+    from data.synthetic import generate_ohlcv
+    from signals.archive import SignalArchive, signal_events
+    from signals.registry import LazyIndicatorFrame
+
+    market = generate_ohlcv(n_bars, n_assets=n_tickers, freq="h")
+    tickers = list(market.columns.get_level_values(1).unique())
+    prices = {ticker: market.xs(ticker, axis=1, level=1) for ticker in tickers}
+    year = str(prices[tickers[0]].index[len(prices[tickers[0]]) // 2].year)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SignalArchive(f"{tmp}/archive.sqlite3")
+        start = time.perf_counter()
+        events = sum(archive.record(t, "1h", LazyIndicatorFrame(prices[t], INDICATOR_SET)) for t in tickers)
+        print(f"backfill: {events:,} events for {n_tickers} tickers x {n_bars:,} bars in {time.perf_counter() - start:.2f}s")
+
+        def recompute_crosses():
+            found = signal_events(LazyIndicatorFrame(prices[tickers[0]], ["ma_cross"]))
+            return found[found["timestamp"].dt.year == int(year)]
+
+        def recompute_last_buy():
+            found = signal_events(LazyIndicatorFrame(prices[tickers[0]], INDICATOR_SET))
+            return found[found["direction"] == "Buy"].groupby("indicator").last()
+
+        queries = (
+            (
+                f"MA crosses in {year}",
+                lambda: archive.query(tickers[0], "ma_cross", start=year, end=year, interval="1h"),
+                recompute_crosses,
+            ),
+            ("last Buy per indicator", lambda: archive.last_signals(tickers[0], "Buy", "1h"), recompute_last_buy),
+        )
+        for label, from_archive, recompute in queries:
+            assert len(from_archive()) == len(recompute())
+            archived, computed = _best_of(from_archive), _best_of(recompute)
+            print(
+                f"{label:>24}: archive {archived * 1000:7.2f} ms | recompute {computed * 1000:7.2f} ms"
+                f" | {computed / archived:5.0f}x"
+            )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark signal archive queries.")
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=43_800)
+    args = parser.parse_args(argv)
+    run(args.tickers, args.bars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import json
+import subprocess
+import sys
+
+from benchmarks.import_time import BASE_DIR, BASELINE_PATH, CORE_MODULES, HEAVY_MODULES
+
+
+def test_core_modules_do_not_import_heavy_dependencies():
+    code = (
+        "import sys\n"
+        + "".join(f"import {module}\n" for module in CORE_MODULES)
+        + f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=BASE_DIR, capture_output=True, text=True, check=True
+    )
+
+    assert proc.stdout.strip() == ""
+
+
+def test_committed_baseline_covers_the_core_modules():
+    baseline = json.loads(BASELINE_PATH.read_text())
+
+    assert set(baseline) == set(CORE_MODULES)
+    assert all(stats["heavy_imports"] == [] for stats in baseline.values())
@@ -0,0 +1,21 @@
+import json
+import subprocess
+import sys
+
+from benchmarks.session_load import BASE_DIR
+
+
+def test_concurrent_sessions_run_offline_without_errors(tmp_path):
+    # In a subprocess: going offline patches the fetchers and BTC_* paths process-wide
+    out = tmp_path / "load.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.session_load", "--sessions", "2", "--interactions", "3",
+         "--think", "0", "--json", str(out)],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+
+    (report,) = json.loads(out.read_text())
+    assert report["errors"] == []
+    assert report["interactions"] == 2 * (1 + 3)
+    assert report["latency_ms"]["initial load"]["n"] == 2
+    assert report["latency_ms"]["all"]["p99"] >= report["latency_ms"]["all"]["p50"] > 0
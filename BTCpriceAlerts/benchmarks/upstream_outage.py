@@ -0,0 +1,111 @@
+"""
+Render latency of the price + macro loads while Yahoo and FRED are down.
+
+    python -m benchmarks.upstream_outage --latency 2 --renders 5
+
+A local `FlakyUpstream` HTTP server stands in for FRED (slow 503s while
+failing) and a stub yfinance module sleeps before returning an empty frame,
+which is how yfinance reports network errors. Each "render" loads what
+app.py loads on a cold cache: BTC prices, CPI, M2 and the policy rate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+
+class FlakyUpstream:
+    """Serve fredgraph-style CSVs on localhost, optionally slow and failing."""
+
+    def __init__(self, latency: float = 0.0, fail: bool = False):
+        self.latency = latency
+        self.fail = fail
+        self.requests = 0
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                upstream.requests += 1
+                time.sleep(upstream.latency)
+                if upstream.fail:
+                    self.send_error(503, "upstream unavailable")
+                    return
+                series = parse_qs(urlparse(self.path).query).get("id", ["SERIES"])[0]
+                rows = "\n".join(f"2024-{month:02d}-01,{100 + month}" for month in range(1, 13))
+                body = f"DATE,{series}\n{rows}\n".encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/graph/fredgraph.csv"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def failing_yfinance(latency: float) -> SimpleNamespace:
+    def download(*args, **kwargs):
+        time.sleep(latency)
+        return pd.DataFrame()
+
+    return SimpleNamespace(download=download)
+
+
+def render() -> float:
+    from data.fetch_btc import get_btc_price_data
+    from macro.fetch_cpi import get_cpi
+    from macro.fetch_m2 import get_m2
+    from macro.fetch_policy import get_policy_rate
+
+    start = time.perf_counter()
+    get_btc_price_data(days=180)
+    get_cpi()
+    get_m2()
+    get_policy_rate()
+    return time.perf_counter() - start
+
+
+def run(latency: float, renders: int) -> None:
+    import data.fetch_btc as fetch_btc
+    import data.fetch_fred as fetch_fred
+    from data.circuit_breaker import get_breaker
+
+    upstream = FlakyUpstream(latency=latency, fail=True)
+    fetch_fred.FRED_CSV_ENDPOINT = upstream.url
+    fetch_btc._yfinance = lambda: failing_yfinance(latency)
+    try:
+        for label, threshold in (("no breaker", float("inf")), ("breaker", 2)):
+            for breaker in (fetch_btc.yahoo_breaker("BTC-USD"), get_breaker("fred")):
+                breaker.reset()
+                breaker.failure_threshold = threshold
+            timings = [render() for _ in range(renders)]
+            print(f"{label:>10}: " + "  ".join(f"{seconds * 1000:7.1f}" for seconds in timings) + "  ms per render")
+    finally:
+        upstream.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Time page loads during an upstream outage.")
+    parser.add_argument("--latency", type=float, default=2.0, help="seconds each failing request takes")
+    parser.add_argument("--renders", type=int, default=5)
+    args = parser.parse_args(argv)
+    run(args.latency, args.renders)
+
+
+if __name__ == "__main__":
+    main()
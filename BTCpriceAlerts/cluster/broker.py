@@ -0,0 +1,196 @@
+"""
+Membership and ticker universe shared by the workers.
+
+A worker announces itself with `heartbeat` every cycle and is a member until
+its heartbeat is ``ttl`` seconds old (or it calls `leave`). Each worker reads
+the live members and the universe from the broker and partitions the
+universe itself (see cluster/hashring.py), so the broker holds no shard
+assignments and does not need to be told when the partition changes.
+
+While membership changes, two workers can briefly both own a ticker. `claim`
+is an atomic first-caller-wins key, so each bar is handled by one of them.
+
+- `SQLiteBroker`: local stand-in, for worker processes on one host (WAL mode).
+- `RedisBroker`: any Redis-compatible server, for workers on several hosts.
+  Needs the ``redis`` package.
+
+`broker_from_url` picks one from ``BTC_BROKER_URL``: ``redis://host:6379/0``
+or a SQLite path (``sqlite:///path`` or a plain path; default
+``cluster/broker.sqlite3``).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+DEFAULT_BROKER_PATH = Path(__file__).resolve().parent / "broker.sqlite3"
+DEFAULT_BROKER_URL = os.environ.get("BTC_BROKER_URL", str(DEFAULT_BROKER_PATH))
+# A worker missing heartbeats for this long is dropped and its tickers move
+HEARTBEAT_TTL = 30.0
+# How long a claimed bar stays claimed; far longer than any handoff
+CLAIM_TTL = 7 * 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    worker_id TEXT PRIMARY KEY,
+    expires REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS universe (
+    ticker TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS claims (
+    key TEXT PRIMARY KEY,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS claims_expires ON claims (expires);
+"""
+
+
+class Broker:
+    """Interface shared by the broker backends."""
+
+    def heartbeat(self, worker_id: str, ttl: float = HEARTBEAT_TTL) -> None:
+        raise NotImplementedError
+
+    def leave(self, worker_id: str) -> None:
+        raise NotImplementedError
+
+    def members(self) -> List[str]:
+        """Live workers, sorted."""
+        raise NotImplementedError
+
+    def set_universe(self, tickers: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    def universe(self) -> List[str]:
+        """Tickers to cover, sorted."""
+        raise NotImplementedError
+
+    def claim(self, key: str, ttl: float = CLAIM_TTL) -> bool:
+        """True for exactly one caller per ``key`` until the claim expires."""
+        raise NotImplementedError
+
+    def release(self, key: str) -> None:
+        """Drop a claim so the key can be claimed again (its work did not finish)."""
+        raise NotImplementedError
+
+    def prune(self) -> int:
+        """Drop expired claims; returns how many (backends with key expiry need not)."""
+        return 0
+
+
+class SQLiteBroker(Broker):
+    """Broker tables in one SQLite file (WAL mode, thread- and process-safe)."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else DEFAULT_BROKER_PATH
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def heartbeat(self, worker_id: str, ttl: float = HEARTBEAT_TTL) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO members VALUES (?, ?) ON CONFLICT(worker_id) DO UPDATE SET expires = excluded.expires",
+                (worker_id, time.time() + ttl),
+            )
+
+    def leave(self, worker_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM members WHERE worker_id = ?", (worker_id,))
+
+    def members(self) -> List[str]:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM members WHERE expires <= ?", (time.time(),))
+            return [row[0] for row in conn.execute("SELECT worker_id FROM members ORDER BY worker_id")]
+
+    def set_universe(self, tickers: Iterable[str]) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM universe")
+            conn.executemany("INSERT OR IGNORE INTO universe VALUES (?)", [(t,) for t in tickers])
+
+    def universe(self) -> List[str]:
+        return [row[0] for row in self._connect().execute("SELECT ticker FROM universe ORDER BY ticker")]
+
+    def claim(self, key: str, ttl: float = CLAIM_TTL) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM claims WHERE key = ? AND expires <= ?", (key, now))
+            return conn.execute("INSERT OR IGNORE INTO claims VALUES (?, ?)", (key, now + ttl)).rowcount == 1
+
+    def release(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM claims WHERE key = ?", (key,))
+
+    def prune(self) -> int:
+        """Drop expired claims; returns how many."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM claims WHERE expires <= ?", (time.time(),)).rowcount
+
+
+class RedisBroker(Broker):
+    """
+    Members in a sorted set scored by heartbeat expiry, the universe in a set.
+    Works with Redis and compatible servers (Valkey, KeyDB, Dragonfly).
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "btc"):
+        try:
+            import redis
+        except ImportError:  # pragma: no cover - optional dependency
+            raise ImportError("RedisBroker needs the redis package: pip install redis") from None
+
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._members = f"{prefix}:workers"
+        self._universe = f"{prefix}:universe"
+        self._claims = f"{prefix}:claim:"
+
+    def heartbeat(self, worker_id: str, ttl: float = HEARTBEAT_TTL) -> None:
+        self._redis.zadd(self._members, {worker_id: time.time() + ttl})
+
+    def leave(self, worker_id: str) -> None:
+        self._redis.zrem(self._members, worker_id)
+
+    def members(self) -> List[str]:
+        pipe = self._redis.pipeline()
+        pipe.zremrangebyscore(self._members, "-inf", time.time())
+        pipe.zrange(self._members, 0, -1)
+        return sorted(pipe.execute()[1])
+
+    def set_universe(self, tickers: Iterable[str]) -> None:
+        tickers = list(tickers)
+        pipe = self._redis.pipeline()
+        pipe.delete(self._universe)
+        if tickers:
+            pipe.sadd(self._universe, *tickers)
+        pipe.execute()
+
+    def universe(self) -> List[str]:
+        return sorted(self._redis.smembers(self._universe))
+
+    def claim(self, key: str, ttl: float = CLAIM_TTL) -> bool:
+        return bool(self._redis.set(self._claims + key, 1, nx=True, px=int(ttl * 1000)))
+
+    def release(self, key: str) -> None:
+        self._redis.delete(self._claims + key)
+
+
+def broker_from_url(url: Optional[str] = None) -> Broker:
+    """`RedisBroker` for ``redis://``/``rediss://`` URLs, otherwise a `SQLiteBroker` path."""
+    url = url or DEFAULT_BROKER_URL
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBroker(url)
+    return SQLiteBroker(url[len("sqlite:///"):] if url.startswith("sqlite:///") else url)
@@ -0,0 +1,91 @@
+"""
+Consistent hashing of tickers onto workers.
+
+Each worker owns ``replicas`` points on a 64-bit ring and a ticker belongs to
+the worker owning the first point at or after the ticker's hash. When a worker
+joins it takes over only the tickers that now land on its points (about
+1/N of the universe), and when one leaves only its own tickers move, to the
+next points on the ring. Every worker derives the same ring from the same
+member list, so they agree on the partition without coordinating.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+# Virtual nodes per worker; more points even out shard sizes
+REPLICAS = 128
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Maps keys to nodes; adding or removing a node moves only its share of keys."""
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = REPLICAS):
+        if replicas < 1:
+            raise ValueError(f"replicas must be at least 1, got {replicas}")
+        self.replicas = replicas
+        self._nodes: set = set()
+        self._hashes: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            at = bisect.bisect_left(self._hashes, point)
+            self._hashes.insert(at, point)
+            self._owners.insert(at, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        keep = [i for i, owner in enumerate(self._owners) if owner != node]
+        self._hashes = [self._hashes[i] for i in keep]
+        self._owners = [self._owners[i] for i in keep]
+
+    def node_for(self, key: str) -> Optional[str]:
+        """The node owning ``key``, or None on an empty ring."""
+        if not self._hashes:
+            return None
+        at = bisect.bisect_left(self._hashes, _hash(key))
+        return self._owners[at % len(self._owners)]
+
+    def assignments(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Keys per node (every node present, possibly with none)."""
+        shards: Dict[str, List[str]] = {node: [] for node in self.nodes}
+        for key in keys:
+            node = self.node_for(key)
+            if node is not None:
+                shards[node].append(key)
+        return shards
+
+
+def moved_keys(keys: Iterable[str], before: HashRing, after: HashRing) -> Dict[str, tuple]:
+    """Keys whose owner differs between two rings, with their (old, new) owners."""
+    moves = {}
+    for key in keys:
+        old, new = before.node_for(key), after.node_for(key)
+        if old != new:
+            moves[key] = (old, new)
+    return moves
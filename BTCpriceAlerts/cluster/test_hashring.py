@@ -0,0 +1,40 @@
+from collections import Counter
+
+import pytest
+
+from cluster.hashring import HashRing, moved_keys
+
+TICKERS = [f"T{i:04d}-USD" for i in range(2000)]
+
+
+def test_shards_are_balanced_and_cover_every_key():
+    ring = HashRing(["w1", "w2", "w3", "w4"])
+    shards = ring.assignments(TICKERS)
+    assert sorted(t for shard in shards.values() for t in shard) == sorted(TICKERS)
+    assert all(0.75 * 500 < len(shard) < 1.25 * 500 for shard in shards.values())
+
+
+def test_join_moves_only_the_new_nodes_share():
+    before = HashRing(["w1", "w2", "w3", "w4"])
+    after = HashRing(["w1", "w2", "w3", "w4", "w5"])
+    moves = moved_keys(TICKERS, before, after)
+    assert {new for _, new in moves.values()} == {"w5"}
+    assert len(moves) == len(after.assignments(TICKERS)["w5"])
+    assert 0.1 < len(moves) / len(TICKERS) < 0.3
+
+
+def test_leave_moves_only_the_departed_nodes_keys():
+    before = HashRing(["w1", "w2", "w3", "w4"])
+    after = HashRing(["w1", "w2", "w3", "w4"])
+    after.remove("w2")
+    moves = moved_keys(TICKERS, before, after)
+    assert set(moves) == set(before.assignments(TICKERS)["w2"])
+    assert "w2" not in Counter(new for _, new in moves.values())
+
+
+def test_ring_is_independent_of_insertion_order():
+    a, b = HashRing(["w1", "w2", "w3"]), HashRing(["w3", "w1", "w2"])
+    assert all(a.node_for(t) == b.node_for(t) for t in TICKERS[:200])
+    assert HashRing().node_for("BTC-USD") is None
+    with pytest.raises(ValueError):
+        HashRing(replicas=0)
@@ -0,0 +1,143 @@
+import time
+import zlib
+
+import pytest
+
+import data.fetch_btc as fetch_btc
+from alerts.rules import compile_rules
+from cluster.broker import SQLiteBroker, broker_from_url
+from cluster.worker import CycleReport, Worker
+from data.snapshot_store import SnapshotStore
+from data.synthetic import generate_ohlcv
+
+UNIVERSE = [f"C{i:02d}-USD" for i in range(30)]
+
+
+def fake_prices(days, interval, ticker):
+    prices = generate_ohlcv(days, seed=zlib.crc32(ticker.encode()))
+    prices.attrs["price_source"] = "yfinance"
+    return prices
+
+
+@pytest.fixture
+def cluster(tmp_path):
+    broker = SQLiteBroker(tmp_path / "broker.sqlite3")
+    broker.set_universe(UNIVERSE)
+    store = SnapshotStore(tmp_path / "snapshots.sqlite3")
+
+    def worker(worker_id, rules=None):
+        return Worker(broker, worker_id, ["1d"], rules=rules, store=store, loader=fake_prices, days=250)
+
+    return broker, worker
+
+
+def test_workers_partition_the_universe(cluster):
+    _, worker = cluster
+    w1, w2 = worker("w1"), worker("w2")
+    w1.assign()
+    w2.assign()
+    first, second = w1.run_once(), w2.run_once()
+    assert not set(first.shard) & set(second.shard)
+    assert sorted(first.shard + second.shard) == UNIVERSE
+    assert first.new_bars + second.new_bars == len(UNIVERSE)
+    assert first.errors == second.errors == []
+
+
+def test_join_and_leave_move_only_the_affected_tickers(cluster):
+    broker, worker = cluster
+    w1, w2 = worker("w1"), worker("w2")
+    w1.assign(), w2.assign()
+    before = {"w1": set(w1.assign()[0]), "w2": set(w2.assign()[0])}
+
+    w3 = worker("w3")
+    taken = set(w3.assign()[0])
+    _, gained1, lost1 = w1.assign()
+    _, gained2, lost2 = w2.assign()
+    assert taken and not gained1 and not gained2
+    assert set(lost1) | set(lost2) == taken
+
+    broker.leave("w3")
+    _, gained1, _ = w1.assign()
+    _, gained2, _ = w2.assign()
+    assert set(gained1) | set(gained2) == taken
+    assert {"w1": set(w1.shard), "w2": set(w2.shard)} == before
+
+
+def test_alerts_fire_once_per_bar_across_handoffs(cluster, capsys):
+    broker, worker = cluster
+    rules = compile_rules(["Close > 0"])
+    w1 = worker("w1", rules)
+    assert w1.run_once().alerts == len(UNIVERSE)
+    assert w1.run_once().alerts == 0
+
+    # The joining worker finds its tickers' bars already claimed
+    w2 = worker("w2", rules)
+    report = w2.run_once()
+    assert report.gained and report.new_bars == 0 and report.alerts == 0
+    assert "✅ C" in capsys.readouterr().out
+
+
+def test_members_expire_without_heartbeats(tmp_path):
+    broker = broker_from_url(f"sqlite:///{tmp_path / 'broker.sqlite3'}")
+    broker.heartbeat("alive", ttl=60)
+    broker.heartbeat("stale", ttl=0.05)
+    time.sleep(0.1)
+    assert broker.members() == ["alive"]
+
+
+def test_a_bar_owned_twice_during_a_handoff_alerts_once(cluster):
+    broker, worker = cluster
+    rules = compile_rules(["Close > 0"])
+    w1, w2 = worker("w1", rules), worker("w2", rules)
+    # w2 has not seen w1 join yet and still computes the whole universe as its own
+    w2.assign = lambda: (list(UNIVERSE), [], [])
+    w1.assign()
+    alerts = w1.run_once().alerts + w2.run_once().alerts
+    assert alerts == len(UNIVERSE)
+    assert broker.claim("C00-USD|1d|x") and not broker.claim("C00-USD|1d|x")
+
+
+def test_failed_alerting_releases_the_bars_for_the_next_cycle(cluster):
+    _, worker = cluster
+    w1 = worker("w1", compile_rules(["Close > 0"]))
+    alert = w1._alert
+
+    def broken(interval, prices):
+        raise RuntimeError("outbox locked")
+
+    w1._alert = broken
+    report = w1.run_once()
+    assert report.alerts == 0 and report.errors == ["alerts 1d: RuntimeError: outbox locked"]
+
+    w1._alert = alert
+    assert w1.run_once().alerts == len(UNIVERSE)
+
+
+def test_a_failed_cycle_does_not_stop_the_worker(cluster, capsys):
+    broker, worker = cluster
+    w1 = worker("w1")
+    calls = []
+
+    def run_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("broker down")
+        return CycleReport([])
+
+    w1.run_once = run_once
+    w1.run(every=0.0, cycles=2, settle=0.0)
+    assert len(calls) == 2
+    assert "cycle failed: ConnectionError: broker down" in capsys.readouterr().out
+    assert broker.members() == []
+
+
+def test_fallback_prices_are_never_alerted(cluster):
+    broker, _ = cluster
+    worker = Worker(
+        broker, "w1", ["1d"], rules=compile_rules(["Close > 0"]), store=SnapshotStore(":memory:"),
+        loader=lambda days, interval, ticker: fetch_btc._fallback_series(days, interval), days=250,
+    )
+    report = worker.run_once()
+    assert report.new_bars == report.alerts == 0
+    assert len(report.errors) == len(UNIVERSE)
+    assert "no live prices (synthetic)" in report.errors[0]
@@ -0,0 +1,280 @@
+"""
+Worker mode: partition the ticker universe across processes and hosts.
+
+Every worker heartbeats to a broker (cluster/broker.py), reads the live
+members and the universe, and keeps the tickers that consistent hashing
+(cluster/hashring.py) assigns to it. For each of those tickers and
+intervals it fetches prices, refreshes the latest-signal snapshot and, when
+a new bar arrived, evaluates the alert rules over its whole shard at once
+and enqueues alerts. A worker that joins or leaves moves only its own share
+of tickers. Each new bar is claimed in the broker before its rules run, so
+a bar is alerted once even while two workers briefly own its ticker during
+a handoff. Tickers whose prices are not live (the fetcher's synthetic or
+cached fallbacks) are skipped and reported. If the rules or the enqueue
+fail, the claims are released and the bars are retried next cycle. All
+workers on a host share the outbox
+(alerts/notifiers.py claims rows per drain), so alerts left pending by a
+worker that crashed are delivered by the others or by its restart.
+
+    python -m cluster.worker --universe BTC-USD,ETH-USD,SOL-USD          # set the tickers
+    python -m cluster.worker --processes 4 --rules "RSI < 30" "MACD_signal == 'Buy'"
+    BTC_BROKER_URL=redis://broker:6379/0 python -m cluster.worker --id host-b   # another host
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from alerts.notifiers import DEFAULT_OUTBOX_PATH, Alert, Dispatcher, Outbox, notifiers_from_env
+from alerts.rules import RuleSet, compile_rules, stack_frames
+from cluster.broker import HEARTBEAT_TTL, Broker, broker_from_url
+from cluster.hashring import REPLICAS, HashRing
+from data.fetch_btc import LIVE_SOURCE, get_btc_price_data
+from data.snapshot_store import DEFAULT_DAYS, SnapshotStore, refresh_snapshot
+from signals.registry import INDICATORS, LazyIndicatorFrame
+from utils.instrumentation import timed
+
+
+# Seconds between a worker's first heartbeat and its first cycle, so workers
+# started together see each other before partitioning
+SETTLE = 2.0
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+@dataclass
+class CycleReport:
+    """What one `Worker.run_once` did."""
+
+    shard: List[str]
+    gained: List[str] = field(default_factory=list)
+    lost: List[str] = field(default_factory=list)
+    new_bars: int = 0
+    alerts: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class Worker:
+    """Runs fetch -> indicators -> alerts for the tickers the ring assigns to ``worker_id``."""
+
+    def __init__(
+        self,
+        broker: Broker,
+        worker_id: Optional[str] = None,
+        intervals: Sequence[str] = ("1d",),
+        rules: Optional[RuleSet] = None,
+        dispatcher: Optional[Dispatcher] = None,
+        store: Optional[SnapshotStore] = None,
+        loader: Callable[..., pd.DataFrame] = get_btc_price_data,
+        days: int = DEFAULT_DAYS,
+        ttl: float = HEARTBEAT_TTL,
+        replicas: int = REPLICAS,
+    ):
+        self.broker = broker
+        self.worker_id = worker_id or default_worker_id()
+        self.intervals = list(intervals)
+        self.rules = rules
+        self.dispatcher = dispatcher
+        self.store = store or SnapshotStore()
+        self.loader = loader
+        self.days = days
+        self.ttl = ttl
+        self.replicas = replicas
+        self.shard: List[str] = []
+        self._ring: Tuple[Tuple[str, ...], Optional[HashRing]] = ((), None)
+
+    def ring(self, members: Sequence[str]) -> HashRing:
+        """The ring for ``members``, rebuilt only when membership changes."""
+        key = tuple(members)
+        if self._ring[0] != key or self._ring[1] is None:
+            self._ring = (key, HashRing(key, self.replicas))
+        return self._ring[1]
+
+    def assign(self) -> Tuple[List[str], List[str], List[str]]:
+        """Heartbeat, then return (shard, gained, lost) for the current membership."""
+        self.broker.heartbeat(self.worker_id, self.ttl)
+        members = self.broker.members()
+        if self.worker_id not in members:  # expired between the two calls
+            members = sorted(set(members) | {self.worker_id})
+        ring = self.ring(members)
+        shard = [ticker for ticker in self.broker.universe() if ring.node_for(ticker) == self.worker_id]
+        previous = set(self.shard)
+        gained = [t for t in shard if t not in previous]
+        lost = sorted(previous - set(shard))
+        self.shard = shard
+        return shard, gained, lost
+
+    @timed()
+    def run_once(self) -> CycleReport:
+        shard, gained, lost = self.assign()
+        report = CycleReport(shard, gained, lost)
+        for interval in self.intervals:
+            fresh: Dict[str, pd.DataFrame] = {}
+            for ticker in shard:
+                try:
+                    prices = self.loader(days=self.days, interval=interval, ticker=ticker)
+                    source = prices.attrs.get("price_source", "unknown")
+                    if source != LIVE_SOURCE:
+                        # Synthetic or cached bars carry made-up or old bar times: never alert on them
+                        report.errors.append(f"{ticker} {interval}: no live prices ({source}), skipped")
+                        continue
+                    snapshot = refresh_snapshot(self.store, ticker, interval, prices=prices)
+                    claimed = snapshot is not None and self.broker.claim(
+                        self._bar_key(ticker, interval, snapshot.bar_time)
+                    )
+                except Exception as exc:  # keep the rest of the shard going
+                    report.errors.append(f"{ticker} {interval}: {type(exc).__name__}: {exc}"[:200])
+                    continue
+                if claimed:
+                    report.new_bars += 1
+                    fresh[ticker] = prices
+            if fresh and self.rules is not None:
+                try:
+                    report.alerts += self._alert(interval, fresh)
+                except Exception as exc:
+                    # Nothing was alerted for these bars: let the next cycle claim them again
+                    for ticker, prices in fresh.items():
+                        self.broker.release(self._bar_key(ticker, interval, prices.index[-1]))
+                    report.errors.append(f"alerts {interval}: {type(exc).__name__}: {exc}"[:200])
+        if self.dispatcher is not None:
+            # Also retries earlier alerts that are due again
+            asyncio.run(self.dispatcher.drain())
+        return report
+
+    @staticmethod
+    def _bar_key(ticker: str, interval: str, bar_time: pd.Timestamp) -> str:
+        return f"{ticker}|{interval}|{pd.Timestamp(bar_time).isoformat()}"
+
+    def _alert(self, interval: str, prices: Dict[str, pd.DataFrame]) -> int:
+        """Evaluate the rules on the last bar of every ticker with a new bar; returns alerts enqueued."""
+        frames = {}
+        for ticker, df in prices.items():
+            names = [name for name, spec in INDICATORS.items() if set(spec.inputs) <= set(df.columns)]
+            lazy = LazyIndicatorFrame(df, names)
+            frames[ticker] = lazy.to_frame([column for column in self.rules.columns if column in lazy])
+        block = stack_frames(frames, self.rules.columns)
+        sent = 0
+        for rule, tickers in self.rules.triggered(block).items():
+            for ticker in tickers:
+                bar_time = prices[ticker].index[-1]
+                close = float(prices[ticker]["Close"].iloc[-1])
+                alert = Alert(
+                    f"{ticker} {interval}: {rule}",
+                    f"{rule} holds on the {interval} bar of {bar_time} (close {close:,.2f}).",
+                    {"ticker": ticker, "interval": interval, "rule": rule, "bar_time": str(bar_time), "close": close},
+                )
+                if self.dispatcher is not None:
+                    self.dispatcher.enqueue(alert)
+                else:
+                    print(f"✅ {alert.subject}")
+                sent += 1
+        return sent
+
+    def run(self, every: float = 60.0, cycles: Optional[int] = None, settle: float = SETTLE) -> None:
+        """Run a cycle every ``every`` seconds (forever, or ``cycles`` times), then leave the ring."""
+        try:
+            self.broker.heartbeat(self.worker_id, self.ttl)
+            time.sleep(settle)
+            done = 0
+            while cycles is None or done < cycles:
+                started = time.monotonic()
+                try:
+                    report = self.run_once()
+                    self.broker.prune()
+                except Exception as exc:  # broker or outbox unavailable: try again next cycle
+                    print(f"[{self.worker_id}] ❌ cycle failed: {type(exc).__name__}: {exc}")
+                else:
+                    if report.gained or report.lost:
+                        print(
+                            f"[{self.worker_id}] shard {len(report.shard)} tickers "
+                            f"(+{len(report.gained)} -{len(report.lost)})"
+                        )
+                    for error in report.errors:
+                        print(f"[{self.worker_id}] ❌ {error}")
+                done += 1
+                if cycles is None or done < cycles:
+                    time.sleep(max(0.0, every - (time.monotonic() - started)))
+        finally:
+            # Hand the shard over now instead of after the heartbeat TTL
+            self.broker.leave(self.worker_id)
+
+
+def _serve(args: argparse.Namespace, worker_id: str) -> None:
+    rules = compile_rules(args.rules) if args.rules else None
+    dispatcher = None
+    notifiers = notifiers_from_env()
+    if rules is not None and notifiers:
+        # The shared outbox: drains claim their rows, and a restarted worker finds what it left pending
+        dispatcher = Dispatcher(notifiers, Outbox(args.outbox))
+    worker = Worker(
+        broker_from_url(args.broker),
+        worker_id,
+        args.intervals.split(","),
+        rules=rules,
+        dispatcher=dispatcher,
+        store=SnapshotStore(args.db) if args.db else None,
+        ttl=args.ttl,
+    )
+    try:
+        worker.run(args.every, args.cycles)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if dispatcher is not None:
+            dispatcher.close()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run signal workers over a partitioned ticker universe.")
+    parser.add_argument("--broker", default=None, help="redis://host:port/db or a SQLite path (default BTC_BROKER_URL)")
+    parser.add_argument("--universe", default=None, help="comma-separated tickers to store in the broker, then exit")
+    parser.add_argument("--id", default=None, help="worker id (default host-pid)")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start on this host")
+    parser.add_argument("--intervals", default="1d,1h")
+    parser.add_argument("--every", type=float, default=60.0, help="seconds between cycles")
+    parser.add_argument("--cycles", type=int, default=None, help="stop after this many cycles")
+    parser.add_argument("--ttl", type=float, default=HEARTBEAT_TTL, help="heartbeat expiry (s)")
+    parser.add_argument("--rules", nargs="*", default=[], help='alert rules, e.g. "RSI < 30"')
+    parser.add_argument("--db", default=None, help="snapshot SQLite path")
+    parser.add_argument("--outbox", default=None, help=f"alert outbox SQLite path (default {DEFAULT_OUTBOX_PATH})")
+    args = parser.parse_args(argv)
+
+    if args.universe is not None:
+        broker = broker_from_url(args.broker)
+        broker.set_universe(t.strip().upper() for t in args.universe.split(",") if t.strip())
+        print(f"Universe: {len(broker.universe())} tickers")
+        return
+
+    base_id = args.id or default_worker_id()
+    if args.processes <= 1:
+        _serve(args, base_id)
+        return
+
+    import multiprocessing
+
+    processes = [
+        multiprocessing.Process(target=_serve, args=(args, f"{base_id}-{i}"), name=f"worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,17 @@ BASE_DIR = Path(__file__).resolve().parent
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
+from data.circuit_breaker import breaker_status
 from data.fetch_btc import get_btc_price_data
 from data.fetch_fred import get_fred_macro_series
-from signals.indicators import (
-    add_bollinger_bands,
-    add_ema_cross,
-    add_macd,
-    add_ma_cross,
-    add_rsi,
-)
+from data.prewarm import IDLE_AFTER, PREWARM, Prewarmer, WarmTarget
+from data.shared_frames import shared_frame
+from data.snapshot_store import SnapshotStore, latest_snapshot
+from data.synthetic import generate_ohlcv
+from macro.correlation import asof_align, build_macro_correlation
+from signals.indicators import RSI_OVERBOUGHT, RSI_OVERSOLD
+from signals.registry import INDICATORS, LazyIndicatorFrame
+from utils.plotting import add_indicator_traces
 
 st.set_page_config(page_title="BTC Macro Dashboard", layout="wide")
 
@@ -80,77 +82,96 @@ st.caption("Holistic market read with technical overlays and macro crosswinds.")
 
 def _synthetic_price_history(periods: int = 365) -> pd.DataFrame:
     """Generate a deterministic synthetic OHLCV series."""
-    dates = pd.date_range(end=pd.Timestamp.utcnow().normalize(), periods=periods)
-    base = np.linspace(20000, 30000, len(dates))
-    oscillation = 1200 * np.sin(np.linspace(0, 8 * np.pi, len(dates)))
-    close = base + oscillation
-    open_price = close * (1 + 0.001 * np.sin(np.linspace(0, 4 * np.pi, len(dates))))
-    high = np.maximum(open_price, close) + 150
-    low = np.minimum(open_price, close) - 150
-    volume = 1500 + 300 * np.cos(np.linspace(0, 6 * np.pi, len(dates)))
-
-    df = pd.DataFrame(
-        {
-            "Open": open_price,
-            "High": high,
-            "Low": low,
-            "Close": close,
-            "Volume": volume,
-        },
-        index=dates,
-    )
-    df.index.name = "Date"
-    return df
+    return generate_ohlcv(periods, end=pd.Timestamp.now("UTC").normalize())
 
 
-@st.cache_data(ttl=3600)
-def load_sample_data():
+@st.cache_resource
+def snapshot_store() -> SnapshotStore:
+    return SnapshotStore()
+
+
+def _with_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Add every registered indicator (default parameters) the columns allow."""
+    names = [name for name, spec in INDICATORS.items() if set(spec.inputs).issubset(df.columns)]
+    enriched = LazyIndicatorFrame(df, names).to_frame()
+    enriched.attrs = dict(df.attrs)
+    return enriched
+
+
+def _read_sample_data():
     sample_path = Path(__file__).resolve().parent / "data" / "btc_sample.csv"
     if sample_path.exists():
         df = pd.read_csv(sample_path, parse_dates=["Date"]).set_index("Date")
-        return df
+        return _with_indicators(df)
 
-    return _synthetic_price_history()
+    return _with_indicators(_synthetic_price_history())
 
 
-@st.cache_data(ttl=3600)
-def load_live_data():
+# Enriched frames are published once as memory-mapped Arrow files and mapped
+# read-only by every session and server process (see data/shared_frames.py)
+FRAME_MAX_AGE = 3600
+
+
+def load_sample_data():
+    return shared_frame("dashboard_sample", _read_sample_data, max_age=FRAME_MAX_AGE)
+
+
+def _read_macro_levels():
+    frames = [get_fred_macro_series("CPIAUCSL"), get_fred_macro_series("FEDFUNDS")]
+    macro = pd.concat([frame for frame in frames if not frame.empty], axis=1)
+    return macro.rename(columns={"CPIAUCSL": "CPI", "FEDFUNDS": "FedFundsRate"})
+
+
+def load_macro_levels():
+    return shared_frame("dashboard_macro", _read_macro_levels, max_age=FRAME_MAX_AGE)
+
+
+@st.cache_resource(ttl=3600)
+def macro_correlation():
+    return build_macro_correlation(get_btc_price_data(days=3650), load_macro_levels())
+
+
+def _fetch_live_data():
     try:
         btc = get_btc_price_data(days=365)
         if btc.empty:
             raise ValueError("BTC series returned empty frame.")
 
-        cpi = get_fred_macro_series("CPIAUCSL")
-        fed = get_fred_macro_series("FEDFUNDS")
-
-        df = btc.copy()
-        if not cpi.empty:
-            df = df.join(cpi, how="left")
-        if not fed.empty:
-            df = df.join(fed, how="left")
-        df.rename(
-            columns={
-                "CPIAUCSL": "CPI",
-                "FEDFUNDS": "FedFundsRate",
-            },
-            inplace=True,
-        )
-        df.fillna(method="ffill", inplace=True)
-        return df
+        macro = load_macro_levels()
+        # Each bar sees the latest macro print already published at that time
+        return _with_indicators(btc.join(asof_align(btc.index, macro)))
     except Exception as exc:  # pragma: no cover - best effort logging
         print(f"Live data load failed: {exc}")
-        return _synthetic_price_history()
+        return _with_indicators(_synthetic_price_history())
+
+
+def load_live_data():
+    return shared_frame("dashboard_live", _fetch_live_data, max_age=FRAME_MAX_AGE)
+
+
+@st.cache_resource
+def prewarmer() -> Prewarmer:
+    """Republishes every frame above at a jittered point before it expires (data/prewarm.py)."""
+    return Prewarmer(
+        [
+            WarmTarget("dashboard_sample", _read_sample_data, FRAME_MAX_AGE),
+            WarmTarget("dashboard_macro", _read_macro_levels, FRAME_MAX_AGE),
+            WarmTarget("dashboard_live", _fetch_live_data, FRAME_MAX_AGE),
+        ],
+        idle_after=IDLE_AFTER,
+    ).start()
+
+
+if PREWARM:
+    prewarmer().touch()
 
 
 st.sidebar.header("Data Feeds")
 use_live = st.sidebar.checkbox("Live: Binance & FRED", value=False)
+feed_status = st.sidebar.container()
 
 st.sidebar.header("Indicators")
-use_rsi = st.sidebar.checkbox("RSI")
-use_macd = st.sidebar.checkbox("MACD")
-use_sma = st.sidebar.checkbox("SMA Crossover")
-use_ema = st.sidebar.checkbox("EMA Crossover")
-use_bb = st.sidebar.checkbox("Bollinger Bands")
+enabled_indicators = [spec.name for spec in INDICATORS.values() if st.sidebar.checkbox(spec.label)]
 
 try:
     df = load_live_data() if use_live else load_sample_data()
@@ -164,16 +185,14 @@ if df.empty or "Close" not in df.columns:
     st.warning("Primary price series unavailable. Showing synthetic benchmark data.")
     df = _synthetic_price_history()
 
-if use_rsi:
-    df = add_rsi(df)
-if use_macd:
-    df = add_macd(df)
-if use_sma:
-    df = add_ma_cross(df)
-if use_ema:
-    df = add_ema_cross(df)
-if use_bb:
-    df = add_bollinger_bands(df)
+# Upstreams whose circuit breaker is open are skipped until a background probe succeeds
+for feed in breaker_status():
+    feed_status.caption(("🟢 " if feed.state == "closed" else "🔴 ") + feed.describe())
+
+enabled_indicators = [
+    name for name in enabled_indicators if set(INDICATORS[name].inputs).issubset(df.columns)
+]
+indicators = LazyIndicatorFrame(df, enabled_indicators)
 
 # KPI banner
 latest = df.iloc[-1]
@@ -188,7 +207,19 @@ if prior_close in (None, 0) or pd.isna(prior_close):
 
 delta_px = close_px - prior_close if pd.notna(close_px) and pd.notna(prior_close) else np.nan
 delta_pct = (delta_px / prior_close * 100) if prior_close not in (0, None) and pd.notna(prior_close) and pd.notna(delta_px) else np.nan
-rsi_value = latest.get("RSI")
+# Live KPIs read the shared latest-signal snapshot; sample data is computed here
+snapshot = latest_snapshot(snapshot_store(), "BTC-USD", "1d", prices=df) if use_live else None
+
+
+def latest_value(column, default=None):
+    if column not in indicators:
+        return default
+    if snapshot is not None and column in snapshot.values:
+        return snapshot.get(column, default)
+    return indicators.latest(column, default)
+
+
+rsi_value = latest_value("RSI")
 vol = latest.get("Volume", np.nan)
 
 kpi_cols = st.columns(4)
@@ -212,7 +243,7 @@ with kpi_cols[1]:
     st.markdown('<div class="metric-label">RSI</div>', unsafe_allow_html=True)
     rsi_disp = f"{rsi_value:.1f}" if pd.notna(rsi_value) else "N/A"
     st.markdown(f'<div class="metric-value">{rsi_disp}</div>', unsafe_allow_html=True)
-    stance = "Overbought" if rsi_value and rsi_value > 70 else "Oversold" if rsi_value and rsi_value < 30 else "Balanced"
+    stance = "Overbought" if rsi_value and rsi_value > RSI_OVERBOUGHT else "Oversold" if rsi_value and rsi_value < RSI_OVERSOLD else "Balanced"
     st.markdown(f"<div class='metric-sub'>{stance}</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -228,10 +259,9 @@ with kpi_cols[3]:
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
     st.markdown('<div class="metric-label">Signals Active</div>', unsafe_allow_html=True)
     active_signals = sum(
-        pd.notna(latest.get(col))
-        and latest.get(col) not in ("Neutral", None)
-        for col in df.columns
-        if "signal" in col.lower()
+        pd.notna(latest_value(col))
+        and latest_value(col) not in ("Neutral", None)
+        for col in indicators.signal_columns
     )
     st.markdown(f'<div class="metric-value">{active_signals}</div>', unsafe_allow_html=True)
     st.markdown("<div class='metric-sub'>Bull / bear triggers</div>", unsafe_allow_html=True)
@@ -240,8 +270,6 @@ with kpi_cols[3]:
 
 # Build plot
 fig = go.Figure()
-synthetic_len = len(df) if len(df) > 0 else 365
-price_series = df["Close"] if "Close" in df.columns else _synthetic_price_history(synthetic_len)["Close"]
 fig.add_trace(
     go.Scatter(
         x=df.index,
@@ -251,54 +279,7 @@ fig.add_trace(
     )
 )
 
-if use_rsi and "RSI" in df:
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df["RSI"],
-            name="RSI",
-            yaxis="y2",
-            line=dict(color="#9B7BFF", width=1.6, dash="dash"),
-        )
-    )
-
-if use_macd and {"MACD_12_26_9", "MACDs_12_26_9"}.issubset(df.columns):
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df["MACD_12_26_9"],
-            name="MACD",
-            yaxis="y2",
-            line=dict(color="#4AF5C8", width=1.8),
-        )
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df["MACDs_12_26_9"],
-            name="Signal",
-            yaxis="y2",
-            line=dict(color="#FF9A76", width=1.5),
-        )
-    )
-
-if use_bb and {"BBU_20_2.0", "BBL_20_2.0"}.issubset(df.columns):
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df["BBU_20_2.0"],
-            name="BB Upper",
-            line=dict(color="rgba(95,215,255,0.35)", width=1.3),
-        )
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=df.index,
-            y=df["BBL_20_2.0"],
-            name="BB Lower",
-            line=dict(color="rgba(95,215,255,0.35)", width=1.3),
-        )
-    )
+add_indicator_traces(fig, indicators, indicators.indicators)
 
 fig.update_layout(
     template="plotly_dark",
@@ -325,9 +306,9 @@ st.markdown('<div class="block-title">Price Structure & Technical Overlays</div>
 st.plotly_chart(fig, width="stretch")
 
 st.markdown('<div class="block-title">Signal Tape</div>', unsafe_allow_html=True)
-signal_cols = [col for col in df.columns if "signal" in col.lower()]
+signal_cols = indicators.signal_columns
 if signal_cols:
-    display = df[signal_cols].tail(40).fillna("Neutral")
+    display = indicators.to_frame(signal_cols).tail(40).fillna("Neutral")
     st.dataframe(display, height=360)
 else:
     st.info("Signals are off. Activate indicators in the sidebar to populate this view.")
@@ -352,4 +333,21 @@ with macro_cols[1]:
     else:
         st.info("Fed funds data unavailable for this session.")
 
+
+@st.fragment
+def correlation_section():
+    # Changing the window reruns only these charts, not the whole dashboard
+    correlations = macro_correlation()
+    window = st.radio("Window (months)", [6, 12, 24, 36], index=1, horizontal=True)
+    corr_cols = st.columns(2)
+    with corr_cols[0]:
+        st.line_chart(correlations.correlation(window), width="stretch")
+    with corr_cols[1]:
+        st.bar_chart(correlations.lead_lag(6), stack=False, width="stretch")
+
+
+if use_live:
+    st.subheader("BTC vs Macro: Rolling Correlation")
+    correlation_section()
+
 st.caption("Powered by Binance (price), FRED (macro). Synthetic fallback series provided when feeds are offline.")
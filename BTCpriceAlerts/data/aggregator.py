@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+BAR_KINDS = ("time", "volume", "dollar")
+
+
+class BarRingBuffer:
+    """
+    Fixed-capacity OHLCV history backed by preallocated NumPy arrays.
+
+    Every bar is written twice (at ``i`` and ``i + capacity``) so the most recent
+    ``n`` bars always occupy one contiguous slice and can be returned as a view
+    in O(1) without copying or wrapping.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("`capacity` must be a positive integer.")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype="int64")
+        self._bars = np.zeros((2 * capacity, len(BAR_COLUMNS)), dtype="float64")
+        self._head = 0  # next write slot in [0, capacity)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: int, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        """Store a single completed bar."""
+        head = self._head
+        mirror = head + self.capacity
+        self._timestamps[head] = self._timestamps[mirror] = timestamp
+        row = self._bars[head]
+        row[0] = open_
+        row[1] = high
+        row[2] = low
+        row[3] = close
+        row[4] = volume
+        self._bars[mirror] = row
+        self._head = (head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, timestamps: np.ndarray, bars: np.ndarray) -> None:
+        """Store a block of completed bars (``bars`` has shape ``(n, 5)``)."""
+        n = len(timestamps)
+        if n == 0:
+            return
+        if n > self.capacity:
+            timestamps = timestamps[-self.capacity:]
+            bars = bars[-self.capacity:]
+            self._head = (self._head + n - self.capacity) % self.capacity
+            n = self.capacity
+        slots = (self._head + np.arange(n)) % self.capacity
+        self._timestamps[slots] = timestamps
+        self._timestamps[slots + self.capacity] = timestamps
+        self._bars[slots] = bars
+        self._bars[slots + self.capacity] = bars
+        self._head = (self._head + n) % self.capacity
+        self._count = min(self._count + n, self.capacity)
+
+    def _window(self, n: Optional[int]) -> slice:
+        n = self._count if n is None else min(n, self._count)
+        end = self._head + self.capacity
+        return slice(end - n, end)
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """Return a read-only ``(n, 5)`` view of the newest bars, oldest first."""
+        view = self._bars[self._window(n)]
+        view.flags.writeable = False
+        return view
+
+    def latest_timestamps(self, n: Optional[int] = None) -> np.ndarray:
+        """Return a read-only view of the bar timestamps (ns since epoch)."""
+        view = self._timestamps[self._window(n)]
+        view.flags.writeable = False
+        return view
+
+    def to_frame(self, n: Optional[int] = None) -> pd.DataFrame:
+        """Copy the newest bars into a DataFrame shaped like `get_btc_price_data`."""
+        index = pd.to_datetime(self.latest_timestamps(n), utc=True)
+        df = pd.DataFrame(np.array(self.latest(n)), columns=list(BAR_COLUMNS), index=index)
+        df.index.name = "Date"
+        df.attrs["price_source"] = "ticks"
+        return df
+
+
+class _OpenBar:
+    """Mutable state of the bar currently being built for one ticker."""
+
+    __slots__ = ("active", "key", "timestamp", "open", "high", "low", "close", "volume", "measure")
+
+    def __init__(self) -> None:
+        self.active = False
+        self.key = 0
+        self.timestamp = 0
+        self.open = self.high = self.low = self.close = 0.0
+        self.volume = 0.0
+        self.measure = 0.0  # running volume / dollar value since the first bar
+
+
+class TickAggregator:
+    """
+    Turn a raw trade stream into time, volume or dollar bars per ticker.
+
+    ``kind="time"`` buckets trades by ``threshold`` (a pandas offset such as
+    ``"1min"`` or a number of seconds); ``"volume"`` and ``"dollar"`` close a bar
+    every ``threshold`` units of traded size or notional. For threshold bars the
+    trade that crosses the boundary belongs to the closing bar and any overshoot
+    counts towards the next one, which keeps batch bucketing to a single cumsum.
+
+    Completed bars land in a `BarRingBuffer` per ticker whose size is ``depth``
+    unless overridden through ``depths``.
+    """
+
+    def __init__(
+        self,
+        kind: str = "time",
+        threshold="1min",
+        depth: int = 1024,
+        depths: Optional[Dict[str, int]] = None,
+    ):
+        if kind not in BAR_KINDS:
+            raise ValueError(f"`kind` must be one of {', '.join(BAR_KINDS)}.")
+        if kind == "time":
+            if isinstance(threshold, (int, float)):
+                step = int(threshold * 1_000_000_000)
+            else:
+                step = pd.Timedelta(threshold).value
+        else:
+            step = float(threshold)
+        if step <= 0:
+            raise ValueError("`threshold` must be positive.")
+
+        self.kind = kind
+        self.threshold = step
+        self.depth = depth
+        self.depths = dict(depths or {})
+        self._buffers: Dict[str, BarRingBuffer] = {}
+        self._open: Dict[str, _OpenBar] = {}
+
+    def _state(self, ticker: str) -> Tuple[BarRingBuffer, _OpenBar]:
+        buffer = self._buffers.get(ticker)
+        if buffer is None:
+            buffer = self._buffers[ticker] = BarRingBuffer(self.depths.get(ticker, self.depth))
+            self._open[ticker] = _OpenBar()
+        return buffer, self._open[ticker]
+
+    def buffer(self, ticker: str) -> BarRingBuffer:
+        """Return the completed-bar history for ``ticker``."""
+        return self._state(ticker)[0]
+
+    def latest(self, ticker: str, n: Optional[int] = None) -> np.ndarray:
+        """Return a view of the newest ``n`` completed bars for ``ticker``."""
+        return self.buffer(ticker).latest(n)
+
+    def add_tick(self, ticker: str, timestamp: int, price: float, size: float) -> None:
+        """Fold a single trade (timestamp in ns since epoch) into the open bar."""
+        buffer, bar = self._state(ticker)
+        if self.kind == "time":
+            key = timestamp // self.threshold
+        else:
+            key = int(bar.measure // self.threshold)
+            bar.measure += size if self.kind == "volume" else price * size
+
+        if bar.active and key != bar.key:
+            buffer.append(bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+            bar.active = False
+
+        if not bar.active:
+            bar.active = True
+            bar.key = key
+            bar.timestamp = key * self.threshold if self.kind == "time" else timestamp
+            bar.open = bar.high = bar.low = bar.close = price
+            bar.volume = size
+        else:
+            if price > bar.high:
+                bar.high = price
+            elif price < bar.low:
+                bar.low = price
+            bar.close = price
+            bar.volume += size
+
+        if self.kind != "time" and bar.measure >= (key + 1) * self.threshold:
+            buffer.append(bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+            bar.active = False
+
+    def add_ticks(self, ticker: str, timestamps, prices, sizes) -> int:
+        """
+        Fold a batch of trades into bars with vectorized segment reductions.
+
+        Produces exactly the same bars as calling `add_tick` for every trade.
+        Returns the number of bars completed by this batch.
+        """
+        timestamps = np.asarray(timestamps, dtype="int64")
+        prices = np.asarray(prices, dtype="float64")
+        sizes = np.asarray(sizes, dtype="float64")
+        if len(timestamps) == 0:
+            return 0
+
+        buffer, bar = self._state(ticker)
+        if self.kind == "time":
+            keys = timestamps // self.threshold
+            closed_last = False
+        else:
+            flow = sizes if self.kind == "volume" else prices * sizes
+            after = bar.measure + np.cumsum(flow)
+            before = np.empty_like(after)
+            before[0] = bar.measure
+            before[1:] = after[:-1]
+            keys = (before // self.threshold).astype("int64")
+            bar.measure = float(after[-1])
+            closed_last = after[-1] >= (keys[-1] + 1) * self.threshold
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        opens = prices[starts]
+        highs = np.maximum.reduceat(prices, starts)
+        lows = np.minimum.reduceat(prices, starts)
+        closes = prices[np.r_[starts[1:], len(prices)] - 1]
+        volumes = np.add.reduceat(sizes, starts)
+        if self.kind == "time":
+            stamps = keys[starts] * self.threshold
+        else:
+            stamps = timestamps[starts]
+
+        flushed = 0
+        if bar.active and bar.key == keys[0]:
+            opens[0] = bar.open
+            highs[0] = max(highs[0], bar.high)
+            lows[0] = min(lows[0], bar.low)
+            volumes[0] += bar.volume
+            stamps[0] = bar.timestamp
+        elif bar.active:
+            buffer.append(bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+            flushed = 1
+
+        complete = len(starts) if closed_last else len(starts) - 1
+        if complete:
+            block = np.column_stack((opens[:complete], highs[:complete], lows[:complete], closes[:complete], volumes[:complete]))
+            buffer.extend(stamps[:complete], block)
+
+        if closed_last:
+            bar.active = False
+        else:
+            bar.active = True
+            bar.key = int(keys[-1])
+            bar.timestamp = int(stamps[-1])
+            bar.open = float(opens[-1])
+            bar.high = float(highs[-1])
+            bar.low = float(lows[-1])
+            bar.close = float(closes[-1])
+            bar.volume = float(volumes[-1])
+        return complete + flushed
+
+    def flush(self, ticker: Optional[str] = None) -> None:
+        """Close the open bar(s) so they become visible in the history."""
+        tickers = [ticker] if ticker is not None else list(self._open)
+        for name in tickers:
+            buffer, bar = self._state(name)
+            if bar.active:
+                buffer.append(bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+                bar.active = False
+
+    def to_frame(self, ticker: str, n: Optional[int] = None) -> pd.DataFrame:
+        """Return the newest completed bars for ``ticker`` as an OHLCV DataFrame."""
+        return self.buffer(ticker).to_frame(n)
+
+
+def _benchmark(n_ticks: int = 1_000_000, batch: int = 10_000) -> None:  # pragma: no cover - manual helper
+    import time
+
+    rng = np.random.default_rng(7)
+    start = pd.Timestamp("2024-01-01", tz="UTC").value
+    timestamps = start + np.cumsum(rng.integers(1_000_000, 50_000_000, n_ticks))
+    prices = 30000 + np.cumsum(rng.normal(0, 2, n_ticks))
+    sizes = rng.exponential(0.05, n_ticks)
+
+    for kind, threshold in (("time", "1min"), ("volume", 25.0), ("dollar", 750_000.0)):
+        agg = TickAggregator(kind=kind, threshold=threshold, depth=4096)
+        began = time.perf_counter()
+        for offset in range(0, n_ticks, batch):
+            sl = slice(offset, offset + batch)
+            agg.add_ticks("BTC-USD", timestamps[sl], prices[sl], sizes[sl])
+        batched = n_ticks / (time.perf_counter() - began)
+
+        agg = TickAggregator(kind=kind, threshold=threshold, depth=4096)
+        subset = min(n_ticks, 200_000)
+        began = time.perf_counter()
+        for ts, px, qty in zip(timestamps[:subset].tolist(), prices[:subset].tolist(), sizes[:subset].tolist()):
+            agg.add_tick("BTC-USD", ts, px, qty)
+        single = subset / (time.perf_counter() - began)
+        print(f"{kind:>6} bars: batch {batched:,.0f} ticks/s | per-tick {single:,.0f} ticks/s")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark helper
+    _benchmark()
@@ -0,0 +1,192 @@
+"""
+Per-upstream circuit breakers for the Yahoo Finance and FRED fetchers.
+
+After `failure_threshold` consecutive failures a breaker opens: calls fail
+immediately with `CircuitOpenError` instead of waiting on timeouts, and the
+fetchers serve the last good result (or their synthetic fallback). While open,
+the next due call starts one background probe with the real request; the wait
+between probes doubles from `base_backoff` up to `max_backoff`. A successful
+probe closes the breaker and refreshes the cached result. Only the
+`max_results` most recently used keys keep a cached result, so a worker
+cycling through many tickers holds a bounded number of frames.
+
+State is per process. `breaker_status` feeds the "Data feeds" sidebar panel.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"  # a background probe is in flight
+# Last good results kept per breaker (one per ticker x interval x depth)
+MAX_RESULTS = 64
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class UpstreamError(RuntimeError):
+    """An upstream answered, but with nothing usable (e.g. an empty download)."""
+
+
+@dataclass(frozen=True)
+class BreakerStatus:
+    name: str
+    state: str
+    failures: int
+    retry_in: Optional[float]
+    last_error: Optional[str]
+    last_success: Optional[float]
+
+    def describe(self) -> str:
+        """One-line state for the UI."""
+        if self.state == CLOSED:
+            return f"{self.name}: healthy" if not self.failures else f"{self.name}: {self.failures} recent failure(s)"
+        if self.state == HALF_OPEN:
+            return f"{self.name}: down, probing now"
+        return f"{self.name}: down, serving cached or fallback data (next probe in {self.retry_in:.0f}s)"
+
+
+class CircuitBreaker:
+    """Fail fast on an upstream after repeated failures; probe it in the background."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 2,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        max_results: int = MAX_RESULTS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_results = max_results
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._backoff = base_backoff
+        self._next_probe = 0.0
+        self._last_error: Optional[str] = None
+        self._last_success: Optional[float] = None
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._probe: Optional[threading.Thread] = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def last_result(self, key: Hashable = None) -> Any:
+        """The result of the last successful call for ``key``, or None (also once evicted)."""
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def call(self, func: Callable[[], T], key: Hashable = None) -> T:
+        """
+        Run ``func`` unless the breaker is open.
+
+        Exceptions from ``func`` count as failures and are re-raised. While
+        open, this raises `CircuitOpenError` at once and, when a probe is due,
+        runs ``func`` in a background thread instead.
+        """
+        with self._lock:
+            if self._state != CLOSED:
+                if self._state == OPEN and self._clock() >= self._next_probe:
+                    self._state = HALF_OPEN
+                    self._probe = threading.Thread(
+                        target=self._run_probe, args=(func, key), name=f"probe-{self.name}", daemon=True
+                    )
+                    self._probe.start()
+                raise CircuitOpenError(f"{self.name} is unavailable ({self._last_error}); retrying in background")
+        try:
+            result = func()
+        except Exception as exc:
+            self._failure(exc)
+            raise
+        self._success(key, result)
+        return result
+
+    def _run_probe(self, func: Callable[[], Any], key: Hashable) -> None:
+        try:
+            result = func()
+        except Exception as exc:
+            self._failure(exc)
+        else:
+            self._success(key, result)
+
+    def _success(self, key: Hashable, result: Any) -> None:
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+            self._state = CLOSED
+            self._failures = 0
+            self._backoff = self.base_backoff
+            self._last_success = time.time()
+
+    def _failure(self, exc: Exception) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = f"{type(exc).__name__}: {exc}"[:200]
+            if self._state == HALF_OPEN:
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+            elif self._failures < self.failure_threshold:
+                return
+            self._state = OPEN
+            self._next_probe = self._clock() + self._backoff
+
+    def wait_for_probe(self, timeout: Optional[float] = None) -> None:
+        """Block until a running background probe finishes (tests and scripts)."""
+        probe = self._probe
+        if probe is not None:
+            probe.join(timeout)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._backoff = self.base_backoff
+            self._last_error = None
+            self._results.clear()
+
+    def status(self) -> BreakerStatus:
+        with self._lock:
+            retry_in = max(self._next_probe - self._clock(), 0.0) if self._state == OPEN else None
+            return BreakerStatus(
+                self.name, self._state, self._failures, retry_in, self._last_error, self._last_success
+            )
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, **options) -> CircuitBreaker:
+    """The process-wide breaker for upstream ``name`` (``options`` apply on creation)."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, **options)
+        return breaker
+
+
+def breaker_status() -> List[BreakerStatus]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.status() for breaker in breakers]
@@ -1,12 +1,25 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-import numpy as np
 import pandas as pd
 
-try:
-    import yfinance as yf
-except ImportError:  # yfinance is optional at runtime
-    yf = None
+from data.circuit_breaker import CircuitOpenError, UpstreamError, get_breaker
+from data.synthetic import generate_ohlcv
+from data.validation import flatten_columns, trades_continuously, validate_prices
+from utils.instrumentation import timed
+
+# price_source of frames downloaded just now; fallbacks are "yfinance-cached" and "synthetic"
+LIVE_SOURCE = "yfinance"
+
+
+@lru_cache(maxsize=None)
+def _yfinance():
+    """Import yfinance on first fetch; it is optional and slow to import."""
+    try:
+        import yfinance
+    except ImportError:  # yfinance is optional at runtime
+        return None
+    return yfinance
 
 
 def _mark_source(df: pd.DataFrame, source: str) -> pd.DataFrame:
@@ -19,33 +32,24 @@ def _fallback_series(periods: int, interval: str) -> pd.DataFrame:
     """
     Build a deterministic fallback time series if live data cannot be fetched.
     """
-    freq_map = {"1d": "D", "1h": "H"}
+    freq_map = {"1d": "D", "1h": "h", "1m": "min"}
     freq = freq_map.get(interval, "D")
-    end = pd.Timestamp.utcnow().floor(freq)
-    dates = pd.date_range(end=end, periods=periods, freq=freq)
-
-    base = np.linspace(20000, 32000, len(dates))
-    oscillation = 1500 * np.sin(np.linspace(0, 10 * np.pi, len(dates)))
-    close = base + oscillation
-    open_price = close * (1 + 0.001 * np.sin(np.linspace(0, 5 * np.pi, len(dates))))
-    high = np.maximum(open_price, close) + 200
-    low = np.minimum(open_price, close) - 200
-    volume = 2000 + 400 * np.cos(np.linspace(0, 8 * np.pi, len(dates)))
-
-    df = pd.DataFrame(
-        {
-            "Open": open_price,
-            "High": high,
-            "Low": low,
-            "Close": close,
-            "Volume": volume,
-        },
-        index=dates,
-    )
-    df.index.name = "Date"
+    end = pd.Timestamp.now("UTC").floor(freq)
+    df = generate_ohlcv(periods, end=end, freq=freq)
     return _mark_source(df, "synthetic")
 
 
+def yahoo_breaker(ticker: str):
+    """
+    The breaker for ``ticker``'s downloads. Yahoo answers a delisted or
+    misspelled symbol (or hourly bars beyond its history) with an empty frame,
+    which counts as a failure, so every ticker has its own breaker: a bad
+    symbol fails fast on its own without taking the others offline.
+    """
+    return get_breaker(f"yahoo {ticker}")
+
+
+@timed()
 def get_btc_price_data(
     days: int = 180, interval: str = "1d", ticker: str = "BTC-USD"
 ) -> pd.DataFrame:
@@ -58,29 +62,50 @@ def get_btc_price_data(
     if days <= 0:
         raise ValueError("`days` must be a positive integer.")
 
+    yf = _yfinance()
     if yf is None:
         return _fallback_series(days, interval)
 
-    end_time = datetime.utcnow()
-    start_time = end_time - timedelta(days=days)
-
+    breaker = yahoo_breaker(ticker)
+    key = (ticker, interval, days)
     try:
-        df = yf.download(
-            ticker,
-            start=start_time,
-            end=end_time,
-            interval=interval,
-            progress=False,
-            auto_adjust=False,
-        )
+        return breaker.call(lambda: _download_prices(yf, ticker, days, interval), key=key)
+    except CircuitOpenError:
+        pass
     except Exception as exc:  # pragma: no cover - best-effort logging
         print(f"Failed to fetch BTC data via yfinance: {exc}")
-        return _fallback_series(days, interval)
 
-    if df.empty:
+    # Yahoo is failing: serve the last download of this process, else synthetic bars
+    cached = breaker.last_result(key)
+    if cached is None:
         return _fallback_series(days, interval)
+    return _mark_source(cached.copy(deep=False), "yfinance-cached")
+
 
+def _download_prices(yf, ticker: str, days: int, interval: str) -> pd.DataFrame:
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(days=days)
+    df = yf.download(
+        ticker,
+        start=start_time,
+        end=end_time,
+        interval=interval,
+        progress=False,
+        auto_adjust=False,
+    )
+    # yfinance reports network errors as an empty frame rather than raising
+    if df is None or df.empty:
+        raise UpstreamError(f"yfinance returned no rows for {ticker}")
+
+    df = flatten_columns(df)
     df.index = pd.to_datetime(df.index)
     df.index.name = "Date"
-    price_df = df[["Open", "High", "Low", "Close", "Volume"]]
-    return _mark_source(price_df, "yfinance")
+    # yfinance can return duplicated, missing or inconsistent bars. Only 24/7
+    # instruments are gap-filled: an equity's weekends and nights are not gaps.
+    price_df, report = validate_prices(
+        df[["Open", "High", "Low", "Close", "Volume"]], interval=interval if trades_continuously(ticker) else None
+    )
+    if not report.ok:
+        print(f"Repaired BTC price data: {report.summary()}")
+    price_df.attrs["validation"] = report.to_dict()
+    return _mark_source(price_df, LIVE_SOURCE)
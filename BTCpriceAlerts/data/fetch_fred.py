@@ -2,56 +2,50 @@ from __future__ import annotations
 
 import io
 import logging
+import zlib
 from typing import Dict, Optional
 
-import numpy as np
 import pandas as pd
-import requests
+
+from data.circuit_breaker import CircuitOpenError, UpstreamError, get_breaker
+from data.synthetic import generate_ohlcv
+from utils.instrumentation import timed
 
 FRED_CSV_ENDPOINT = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+# (connect, read) seconds; an unreachable host fails on the short connect timeout
+FRED_TIMEOUT = (3.05, 10)
 _logger = logging.getLogger(__name__)
 
 
 def _fallback_series(series_id: str, start_date: str) -> pd.DataFrame:
     """Generate a synthetic monthly series when live FRED data is unavailable."""
-    start = pd.to_datetime(start_date)
-    periods = 60
-    dates = pd.date_range(start=start, periods=periods, freq="ME")
-    trend = np.linspace(0, periods - 1, periods, dtype="float64")
-    oscillation = 0.6 * np.sin(np.linspace(0, 4 * np.pi, periods))
-    values = trend + oscillation
-    df = pd.DataFrame({series_id: values}, index=dates)
-    df.index.name = "Date"
+    trend = generate_ohlcv(
+        60,
+        start=pd.to_datetime(start_date),
+        freq="ME",
+        seed=zlib.crc32(series_id.encode()),
+        start_price=100.0,
+        base_volatility=0.004,
+        regimes=((0.003, 1.0),),
+        gap_probability=0.0,
+    )
+    df = trend[["Close"]].rename(columns={"Close": series_id})
+    df.attrs.clear()
     return df
 
 
-def _fetch_fred_csv(series_id: str, start_date: str) -> Optional[pd.DataFrame]:
-    """
-    Retrieve a series from the lightweight fredgraph CSV endpoint.
-
-    Returns None when the request fails.
-    """
+def _download_fred_csv(requests, series_id: str, start_date: str) -> pd.DataFrame:
+    """Request and parse one series; raises on any failure."""
     params: Dict[str, str] = {
         "id": series_id,
         "cosd": start_date,
     }
-
-    try:
-        response = requests.get(FRED_CSV_ENDPOINT, params=params, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        _logger.warning("FRED request failed for %s: %s", series_id, exc)
-        return None
-
-    try:
-        df = pd.read_csv(io.StringIO(response.text))
-    except Exception as exc:  # pragma: no cover - parsing issue
-        _logger.warning("FRED CSV parse failed for %s: %s", series_id, exc)
-        return None
+    response = requests.get(FRED_CSV_ENDPOINT, params=params, timeout=FRED_TIMEOUT)
+    response.raise_for_status()
+    df = pd.read_csv(io.StringIO(response.text))
 
     if "DATE" not in df.columns or series_id not in df.columns:
-        _logger.warning("FRED CSV missing expected columns for %s", series_id)
-        return None
+        raise UpstreamError(f"FRED CSV missing expected columns for {series_id}")
 
     df["DATE"] = pd.to_datetime(df["DATE"])
     df.set_index("DATE", inplace=True)
@@ -59,6 +53,32 @@ def _fetch_fred_csv(series_id: str, start_date: str) -> Optional[pd.DataFrame]:
     return df[[series_id]]
 
 
+@timed()
+def _fetch_fred_csv(series_id: str, start_date: str) -> Optional[pd.DataFrame]:
+    """
+    Retrieve a series from the lightweight fredgraph CSV endpoint.
+
+    Goes through the "fred" circuit breaker: while FRED is failing this
+    returns the last series fetched in this process at once, or None.
+    """
+    try:
+        import requests  # imported lazily to keep `data` cheap to import
+    except ImportError:
+        _logger.warning("requests is not installed; using fallback for %s", series_id)
+        return None
+
+    breaker = get_breaker("fred")
+    key = (series_id, start_date)
+    try:
+        return breaker.call(lambda: _download_fred_csv(requests, series_id, start_date), key=key)
+    except CircuitOpenError:
+        pass
+    except Exception as exc:
+        _logger.warning("FRED request failed for %s: %s", series_id, exc)
+    return breaker.last_result(key)
+
+
+@timed()
 def get_fred_macro_series(series_id: str, start_date: str = "2017-01-01") -> pd.DataFrame:
     """
     Fetch macroeconomic data from FRED, falling back to a synthetic series when needed.
@@ -0,0 +1,315 @@
+"""
+Keep the dashboards' shared frames warm.
+
+`Prewarmer` publishes a set of shared frames (see data/shared_frames.py) at
+startup and republishes each one in the background before it reaches its
+``max_age``. The refresh point is drawn at random between 70% and 90% of
+``max_age`` (`REFRESH_AHEAD` ± `JITTER`) for every cycle of every frame, so
+frames loaded together do not all expire together, and no reader finds an
+expired frame and loads it inline. With several server processes, the first
+one to reach a refresh point republishes; the others see the new file and
+reschedule from its age.
+
+Price frames are served for `price_max_age` of their interval: a daily bar
+does not need refetching every minute. A warmer given ``idle_after`` pauses
+once no session has called `Prewarmer.touch` for that long, and resumes
+with the next touch, so an unwatched server stops polling Yahoo.
+
+For targets with ``indicators``, the warmer also computes those indicators
+on the frame it published. Sessions start from that memo through
+`indicator_memo` instead of computing them on their first render.
+
+    python -m data.prewarm                 # publish the default configurations once
+    python -m data.prewarm --loop          # and keep refreshing them (never pauses)
+
+``BTC_PREWARM=0`` turns off the in-app warmer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from data.fetch_btc import get_btc_price_data
+from data.shared_frames import frame_age, map_frame, refresh_frame
+from signals.registry import LazyIndicatorFrame
+from utils.memory import LOW_MEMORY, compact_frame
+
+PREWARM = os.environ.get("BTC_PREWARM", "1") not in ("", "0")
+
+# The app's sidebar choices and the overlays it shows by default
+DEFAULT_DEPTHS = (90, 180, 365)
+DEFAULT_INTERVALS = ("1d", "1h")
+DEFAULT_INDICATORS = ("rsi", "macd", "ma_cross")
+# Seconds a published price frame is served before it is refetched, by interval
+PRICE_MAX_AGES = {"1h": 120.0, "1d": 900.0}
+DEFAULT_PRICE_MAX_AGE = 120.0
+# Seconds without a session touching the app's warmer before it pauses
+IDLE_AFTER = 600.0
+
+# Refresh when this fraction of max_age is left, give or take JITTER (fractions of max_age)
+REFRESH_AHEAD = 0.2
+JITTER = 0.1
+# Delay before retrying a target whose loader failed, as a fraction of its max_age
+RETRY_AFTER = 0.05
+
+# Indicator memos of the frames published by this process, by frame name
+_memos: Dict[str, Tuple[Hashable, dict]] = {}
+_memos_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class WarmTarget:
+    """A shared frame to keep published, and indicators to precompute on it."""
+
+    name: str
+    loader: Callable[[], pd.DataFrame]
+    max_age: float = 3600.0
+    indicators: Tuple[str, ...] = ()
+
+
+def frame_version(df: pd.DataFrame) -> Hashable:
+    """Identifies a price frame's contents: a new bar or a revised close changes it."""
+    return (len(df), df.index[-1], float(df["Close"].iloc[-1]))
+
+
+def indicator_memo(df: pd.DataFrame) -> dict:
+    """A copy of the precomputed indicator memo for ``df``, or an empty one."""
+    version = frame_version(df)
+    with _memos_lock:
+        for memo_version, memo in _memos.values():
+            if memo_version == version:
+                return dict(memo)
+    return {}
+
+
+def price_frame_name(days: int, interval: str) -> str:
+    return f"app_btc_{interval}_{days}"
+
+
+def price_max_age(interval: str) -> float:
+    return PRICE_MAX_AGES.get(interval, DEFAULT_PRICE_MAX_AGE)
+
+
+def fetch_prices(days: int, interval: str) -> pd.DataFrame:
+    prices = get_btc_price_data(days=days, interval=interval)
+    # BTC_LOW_MEMORY=1 publishes float32 prices (see utils/memory.py)
+    return compact_frame(prices) if LOW_MEMORY else prices
+
+
+def default_targets(
+    depths: Iterable[int] = DEFAULT_DEPTHS,
+    intervals: Iterable[str] = DEFAULT_INTERVALS,
+    max_age: Optional[float] = None,
+    indicators: Sequence[str] = DEFAULT_INDICATORS,
+) -> List[WarmTarget]:
+    """
+    The app's price frames for every depth x interval, with its default
+    overlays; ``max_age`` defaults to `price_max_age` of each interval.
+    """
+    return [
+        WarmTarget(
+            price_frame_name(days, interval),
+            lambda days=days, interval=interval: fetch_prices(days, interval),
+            price_max_age(interval) if max_age is None else max_age,
+            tuple(indicators),
+        )
+        for interval in intervals
+        for days in depths
+    ]
+
+
+class Prewarmer:
+    """
+    Publishes its targets once, then refreshes each ahead of expiry on a
+    background thread (`start`); `add` registers targets at any time. With
+    ``idle_after``, the thread pauses while no `touch` came in that long.
+    """
+
+    def __init__(
+        self,
+        targets: Iterable[WarmTarget] = (),
+        refresh_ahead: float = REFRESH_AHEAD,
+        jitter: float = JITTER,
+        directory: Union[str, Path, None] = None,
+        seed: Optional[int] = None,
+        idle_after: Optional[float] = None,
+    ):
+        if not 0 <= jitter <= refresh_ahead < 1:
+            raise ValueError("need 0 <= jitter <= refresh_ahead < 1")
+        self.refresh_ahead = refresh_ahead
+        self.jitter = jitter
+        self.directory = directory
+        self.idle_after = idle_after
+        self.refreshed = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._rng = random.Random(seed)
+        self._targets: Dict[str, WarmTarget] = {}
+        self._queue: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._active_at = time.monotonic()
+        for target in targets:
+            self.add(target)
+
+    @property
+    def targets(self) -> List[WarmTarget]:
+        return list(self._targets.values())
+
+    def add(self, target: WarmTarget) -> bool:
+        """Register ``target`` (due at once); False if its name is already registered."""
+        with self._lock:
+            if target.name in self._targets:
+                return False
+            self._targets[target.name] = target
+            heapq.heappush(self._queue, (time.monotonic(), target.name))
+        self._wake.set()
+        return True
+
+    @property
+    def idle(self) -> bool:
+        return self.idle_after is not None and time.monotonic() - self._active_at > self.idle_after
+
+    def touch(self) -> None:
+        """A session is using the frames: keep (or resume) refreshing them."""
+        self._active_at = time.monotonic()
+        self._wake.set()
+
+    def refresh_age(self, target: WarmTarget) -> float:
+        """Age at which ``target`` is republished this cycle."""
+        ahead = self.refresh_ahead + self._rng.uniform(-self.jitter, self.jitter)
+        return target.max_age * (1 - ahead)
+
+    def warm(self, target: WarmTarget) -> float:
+        """
+        Republish ``target`` if it is missing or due, warm its indicators and
+        return the seconds until it is next due.
+        """
+        due_at = self.refresh_age(target)
+        age = frame_age(target.name, self.directory)
+        if age is None or age >= due_at:
+            try:
+                if refresh_frame(target.name, target.loader, self.directory):
+                    self.refreshed += 1
+            except Exception as exc:
+                self._failed(target, exc)
+                return target.max_age * RETRY_AFTER
+            age = frame_age(target.name, self.directory)
+        if target.indicators:
+            try:
+                self._warm_indicators(target)
+            except Exception as exc:  # the frame is published; sessions compute the indicators themselves
+                self._failed(target, exc)
+        # Another process holding the publish lock: look again shortly
+        if age is None or age >= due_at:
+            return target.max_age * RETRY_AFTER
+        return due_at - age
+
+    def _failed(self, target: WarmTarget, exc: Exception) -> None:
+        self.failures += 1
+        self.last_error = f"{target.name}: {type(exc).__name__}: {exc}"[:200]
+
+    def _warm_indicators(self, target: WarmTarget) -> None:
+        frame = map_frame(target.name, self.directory)
+        if frame is None or frame.empty:
+            return
+        version = frame_version(frame)
+        with _memos_lock:
+            current = _memos.get(target.name)
+        if current is not None and current[0] == version:
+            return
+        memo: dict = {}
+        LazyIndicatorFrame(frame, target.indicators, memo=memo).to_frame()
+        with _memos_lock:
+            _memos[target.name] = (version, memo)
+
+    def warm_all(self) -> None:
+        """Warm every target now, in the calling thread."""
+        for target in self.targets:
+            delay = self.warm(target)
+            self._reschedule(target.name, delay)
+
+    def _reschedule(self, name: str, delay: float) -> None:
+        with self._lock:
+            self._queue = [(due, queued) for due, queued in self._queue if queued != name]
+            heapq.heapify(self._queue)
+            heapq.heappush(self._queue, (time.monotonic() + delay, name))
+
+    def start(self) -> "Prewarmer":
+        """Warm in a daemon thread until `stop`; returns self."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="prewarm", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if self.idle:
+                # Nobody is watching: sleep until the next touch (overdue targets refresh then)
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            with self._lock:
+                due, name = self._queue[0] if self._queue else (float("inf"), None)
+            wait = due - time.monotonic()
+            if wait > 0:
+                self._wake.wait(None if wait == float("inf") else wait)
+                self._wake.clear()
+                continue
+            with self._lock:
+                heapq.heappop(self._queue)
+                target = self._targets[name]
+            try:
+                delay = self.warm(target)
+            except Exception as exc:  # never let one target stop the refreshes of all the others
+                self._failed(target, exc)
+                delay = target.max_age * RETRY_AFTER
+            self._reschedule(name, delay)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Publish the dashboards' default price frames ahead of use.")
+    parser.add_argument("--depths", default=",".join(map(str, DEFAULT_DEPTHS)))
+    parser.add_argument("--intervals", default=",".join(DEFAULT_INTERVALS))
+    parser.add_argument("--max-age", type=float, default=None, help="seconds (default: by interval)")
+    parser.add_argument("--loop", action="store_true", help="keep refreshing ahead of expiry")
+    args = parser.parse_args(argv)
+
+    # Indicator memos live in the process that computes them, so the job only publishes frames
+    targets = default_targets(
+        [int(days) for days in args.depths.split(",")], args.intervals.split(","), args.max_age, indicators=()
+    )
+    warmer = Prewarmer(targets)
+    start = time.perf_counter()
+    warmer.warm_all()
+    print(f"Published {warmer.refreshed} of {len(targets)} frames in {time.perf_counter() - start:.2f}s")
+    if args.loop:
+        warmer.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            warmer.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Share price/indicator frames between processes through memory-mapped Arrow IPC files.
+
+One process publishes a frame with `publish_frame`; every other process (or
+Streamlit session) maps it read-only with `map_frame`. Numeric columns become
+NumPy views over the page cache, so the data is neither deserialized nor held
+once per process. `shared_frame` wraps the publish-or-map logic around a loader.
+
+    python -m benchmarks.shared_frames --sessions 8 --rows 1000000   # latency & RSS
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+from utils.instrumentation import record_cache, timed
+
+DEFAULT_SHARED_DIR = Path(
+    os.environ.get("BTC_SHARED_DIR", Path(tempfile.gettempdir()) / "btc_shared_frames")
+)
+# A publisher that died mid-write leaves its lock behind; ignore it after this
+LOCK_TIMEOUT = 300.0
+
+_INDEX_COLUMN = "__index__"
+_METADATA_KEY = b"btc_frame"
+
+_mapped: Dict[Path, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+_mapped_lock = threading.Lock()
+
+
+def _path(name: str, directory: Union[str, Path, None]) -> Path:
+    return Path(directory or DEFAULT_SHARED_DIR) / f"{name}.arrow"
+
+
+def _to_arrow(values):
+    import pyarrow as pa
+
+    if isinstance(values, (pd.Series, pd.Index)) and values.dtype.kind in "fiu":
+        # Keep NaN as a float instead of a null so readers get zero-copy views
+        return pa.array(values.to_numpy())
+    return pa.array(values, from_pandas=True)
+
+
+def publish_frame(name: str, df: pd.DataFrame, directory: Union[str, Path, None] = None) -> Path:
+    """
+    Write ``df`` (index, columns and ``attrs``) as an uncompressed Arrow IPC file.
+
+    The file is written next to its final path and renamed into place, so
+    readers see either the old or the new version, never a partial one.
+    """
+    import pyarrow as pa
+
+    path = _path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = [str(col) for col in df.columns]
+    arrays = [_to_arrow(df.index)] + [_to_arrow(df.iloc[:, i]) for i in range(df.shape[1])]
+    metadata = {"index_name": df.index.name, "columns": columns, "attrs": df.attrs}
+    table = pa.Table.from_arrays(
+        arrays,
+        names=[_INDEX_COLUMN] + columns,
+        metadata={_METADATA_KEY: json.dumps(metadata, default=str).encode()},
+    )
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _column(chunked):
+    import pyarrow as pa
+
+    if chunked.num_chunks == 1 and chunked.null_count == 0:
+        try:
+            return chunked.chunk(0).to_numpy(zero_copy_only=True)
+        except pa.ArrowInvalid:  # bools, strings: need a conversion
+            pass
+    return chunked.to_pandas().array
+
+
+def _read(path: Path) -> pd.DataFrame:
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    metadata = json.loads(table.schema.metadata[_METADATA_KEY])
+    index_values = _column(table.column(_INDEX_COLUMN))
+    index = pd.Index(index_values, name=metadata["index_name"], copy=False)
+    index_type = table.schema.field(_INDEX_COLUMN).type
+    if getattr(index_type, "tz", None):
+        index = pd.DatetimeIndex(index).tz_localize("UTC").tz_convert(index_type.tz)
+    data = {col: _column(table.column(i + 1)) for i, col in enumerate(metadata["columns"])}
+    df = pd.DataFrame(data, index=index, copy=False)
+    df.attrs.update(metadata["attrs"])
+    return df
+
+
+@timed()
+def map_frame(name: str, directory: Union[str, Path, None] = None) -> Optional[pd.DataFrame]:
+    """
+    Map a published frame read-only, or return None if it was never published.
+
+    The mapping is reused until the file is republished, so a hit costs one
+    ``stat`` call. Each caller gets its own shallow frame, so adding columns
+    is safe; the numeric columns themselves are read-only views.
+    """
+    path = _path(name, directory)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    version = (stat.st_ino, stat.st_mtime_ns)
+    with _mapped_lock:
+        cached = _mapped.get(path)
+        if cached is not None and cached[0] == version:
+            record_cache("shared_frames", True)
+            return cached[1].copy(deep=False)
+    record_cache("shared_frames", False)
+    df = _read(path)
+    with _mapped_lock:
+        _mapped[path] = (version, df)
+    return df.copy(deep=False)
+
+
+def frame_age(name: str, directory: Union[str, Path, None] = None) -> Optional[float]:
+    """Seconds since ``name`` was last published, or None."""
+    try:
+        return time.time() - _path(name, directory).stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _try_lock(lock: Path) -> bool:
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        try:
+            if time.time() - lock.stat().st_mtime > LOCK_TIMEOUT:
+                lock.unlink(missing_ok=True)
+                return _try_lock(lock)
+        except FileNotFoundError:
+            return _try_lock(lock)
+        return False
+
+
+def shared_frame(
+    name: str,
+    loader: Callable[[], pd.DataFrame],
+    max_age: float = 3600.0,
+    directory: Union[str, Path, None] = None,
+) -> pd.DataFrame:
+    """
+    Map ``name`` if it was published less than ``max_age`` seconds ago;
+    otherwise one process runs ``loader`` and publishes while the others keep
+    mapping the previous version (or load privately if there is none yet).
+    """
+    age = frame_age(name, directory)
+    if age is not None and age < max_age:
+        return map_frame(name, directory)
+
+    if not refresh_frame(name, loader, directory):
+        stale = map_frame(name, directory)
+        return stale if stale is not None else loader()
+    return map_frame(name, directory)
+
+
+def refresh_frame(
+    name: str, loader: Callable[[], pd.DataFrame], directory: Union[str, Path, None] = None
+) -> bool:
+    """
+    Run ``loader`` and publish its frame as ``name``; returns False without
+    loading if another process is already publishing it.
+    """
+    path = _path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock = path.with_suffix(".lock")
+    if not _try_lock(lock):
+        return False
+    try:
+        publish_frame(name, loader(), directory)
+    finally:
+        lock.unlink(missing_ok=True)
+    return True
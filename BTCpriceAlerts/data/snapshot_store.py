@@ -0,0 +1,232 @@
+"""
+Materialized latest-signal snapshots per (ticker, interval) in SQLite.
+
+A background job refreshes the snapshot after every new bar:
+
+    python -m data.snapshot_store --tickers BTC-USD,ETH-USD --intervals 1d,1h --every 60
+
+Dashboards and the API read a snapshot in O(1) and only fall back to computing
+indicators when the stored one has not been refreshed for `STALE_AFTER` seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+from data.fetch_btc import get_btc_price_data
+from signals.registry import INDICATORS, LazyIndicatorFrame
+from utils.instrumentation import record_cache, timed
+
+DEFAULT_DB_PATH = Path(
+    os.environ.get("BTC_SNAPSHOT_DB", Path(__file__).resolve().parent / "snapshots.sqlite3")
+)
+# Two refreshes of the default job cadence
+STALE_AFTER = 120.0
+# Enough daily bars for the 200-bar SMA cross plus the MACD warm-up
+DEFAULT_DAYS = 365
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    bar_time TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    price_source TEXT,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (ticker, interval)
+)
+"""
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Latest indicator values and signals for one (ticker, interval)."""
+
+    ticker: str
+    interval: str
+    bar_time: pd.Timestamp
+    updated_at: float
+    price_source: str
+    values: Dict[str, Any]
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.updated_at
+
+    def is_stale(self, max_age: Optional[float] = None) -> bool:
+        return self.age() > (STALE_AFTER if max_age is None else max_age)
+
+    def get(self, key: str, default=None):
+        value = self.values.get(key)
+        return default if value is None else value
+
+
+def _plain(value: Any) -> Any:
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def build_snapshot_values(prices: pd.DataFrame, indicators: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Latest close, previous close and every output of ``indicators``.
+
+    Uses the warm-up-window fast path, so the cost does not grow with history.
+    Defaults to all registered indicators whose inputs are present.
+    """
+    if indicators is None:
+        indicators = [
+            name for name, spec in INDICATORS.items() if set(spec.inputs).issubset(prices.columns)
+        ]
+    frame = LazyIndicatorFrame(prices, indicators)
+    values: Dict[str, Any] = {
+        "Close": _plain(prices["Close"].iloc[-1]),
+        "PrevClose": _plain(prices["Close"].iloc[-2]) if len(prices) > 1 else None,
+        "Volume": _plain(prices["Volume"].iloc[-1]) if "Volume" in prices.columns else None,
+    }
+    for indicator in frame.indicators:
+        for column in indicator.outputs:
+            values[column] = _plain(frame.latest(column))
+    return values
+
+
+class SnapshotStore:
+    """Small SQLite key-value store of `Snapshot` rows (WAL mode, thread-safe)."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5)
+        return conn
+
+    def put(
+        self,
+        ticker: str,
+        interval: str,
+        bar_time: pd.Timestamp,
+        values: Dict[str, Any],
+        price_source: str = "unknown",
+    ) -> Snapshot:
+        snapshot = Snapshot(ticker, interval, pd.Timestamp(bar_time), time.time(), price_source, values)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    ticker,
+                    interval,
+                    snapshot.bar_time.isoformat(),
+                    snapshot.updated_at,
+                    price_source,
+                    json.dumps(values),
+                ),
+            )
+        return snapshot
+
+    def touch(self, ticker: str, interval: str) -> None:
+        """Mark an unchanged snapshot as fresh."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE snapshots SET updated_at = ? WHERE ticker = ? AND interval = ?",
+                (time.time(), ticker, interval),
+            )
+
+    def get(self, ticker: str, interval: str) -> Optional[Snapshot]:
+        row = self._connect().execute(
+            "SELECT bar_time, updated_at, price_source, payload FROM snapshots WHERE ticker = ? AND interval = ?",
+            (ticker, interval),
+        ).fetchone()
+        if row is None:
+            return None
+        bar_time, updated_at, source, payload = row
+        return Snapshot(ticker, interval, pd.Timestamp(bar_time), updated_at, source, json.loads(payload))
+
+
+@timed()
+def refresh_snapshot(
+    store: SnapshotStore,
+    ticker: str = "BTC-USD",
+    interval: str = "1d",
+    prices: Optional[pd.DataFrame] = None,
+    loader: Callable[..., pd.DataFrame] = get_btc_price_data,
+    days: int = DEFAULT_DAYS,
+) -> Optional[Snapshot]:
+    """
+    Recompute and store the snapshot if a new bar arrived or the last one moved.
+
+    ``prices`` skips the fetch when the caller already holds the history.
+    """
+    if prices is None:
+        prices = loader(days=days, interval=interval, ticker=ticker)
+    if prices.empty or "Close" not in prices.columns:
+        return store.get(ticker, interval)
+
+    bar_time = pd.Timestamp(prices.index[-1])
+    close = _plain(prices["Close"].iloc[-1])
+    current = store.get(ticker, interval)
+    if current is not None and current.bar_time == bar_time and current.values.get("Close") == close:
+        store.touch(ticker, interval)
+        return store.get(ticker, interval)
+    values = build_snapshot_values(prices)
+    return store.put(ticker, interval, bar_time, values, prices.attrs.get("price_source", "unknown"))
+
+
+def latest_snapshot(
+    store: SnapshotStore,
+    ticker: str = "BTC-USD",
+    interval: str = "1d",
+    prices: Optional[pd.DataFrame] = None,
+    max_age: Optional[float] = None,
+    loader: Callable[..., pd.DataFrame] = get_btc_price_data,
+) -> Optional[Snapshot]:
+    """Read the snapshot, computing it on demand only when missing or stale."""
+    snapshot = store.get(ticker, interval)
+    fresh = snapshot is not None and not snapshot.is_stale(max_age)
+    record_cache("snapshots", fresh)
+    if fresh:
+        return snapshot
+    return refresh_snapshot(store, ticker, interval, prices=prices, loader=loader)
+
+
+def run_job(tickers: Iterable[str], intervals: Iterable[str], every: float, store: Optional[SnapshotStore] = None) -> None:
+    """Refresh every (ticker, interval) snapshot forever, once per ``every`` seconds."""
+    store = store or SnapshotStore()
+    tickers, intervals = list(tickers), list(intervals)
+    while True:
+        started = time.monotonic()
+        for ticker in tickers:
+            for interval in intervals:
+                try:
+                    refresh_snapshot(store, ticker, interval)
+                except Exception as exc:  # pragma: no cover - keep the job alive
+                    print(f"Snapshot refresh failed for {ticker} {interval}: {exc}")
+        time.sleep(max(0.0, every - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":  # pragma: no cover - background job entry point
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Refresh latest-signal snapshots.")
+    parser.add_argument("--tickers", default="BTC-USD")
+    parser.add_argument("--intervals", default="1d,1h")
+    parser.add_argument("--every", type=float, default=60.0, help="seconds between refreshes")
+    parser.add_argument("--db", default=None, help=f"SQLite path (default {DEFAULT_DB_PATH})")
+    args = parser.parse_args()
+    run_job(args.tickers.split(","), args.intervals.split(","), args.every, SnapshotStore(args.db))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.aggregator import BarRingBuffer, TickAggregator
+
+
+@pytest.fixture()
+def ticks():
+    rng = np.random.default_rng(11)
+    n = 5000
+    start = pd.Timestamp("2024-01-01", tz="UTC").value
+    timestamps = start + np.cumsum(rng.integers(100_000_000, 2_000_000_000, n))
+    prices = 30000 + np.cumsum(rng.normal(0, 5, n))
+    sizes = rng.integers(1, 20, n).astype(float)
+    return timestamps, prices, sizes
+
+
+def test_time_bars_match_pandas_resample(ticks):
+    timestamps, prices, sizes = ticks
+    agg = TickAggregator(kind="time", threshold="1min", depth=10_000)
+    agg.add_ticks("BTC-USD", timestamps, prices, sizes)
+    agg.flush()
+    bars = agg.to_frame("BTC-USD")
+
+    trades = pd.DataFrame(
+        {"price": prices, "size": sizes}, index=pd.to_datetime(timestamps, utc=True)
+    )
+    expected = trades["price"].resample("1min").ohlc().dropna()
+    expected["volume"] = trades["size"].resample("1min").sum()
+
+    assert len(bars) == len(expected)
+    np.testing.assert_allclose(bars["Open"], expected["open"])
+    np.testing.assert_allclose(bars["High"], expected["high"])
+    np.testing.assert_allclose(bars["Low"], expected["low"])
+    np.testing.assert_allclose(bars["Close"], expected["close"])
+    np.testing.assert_allclose(bars["Volume"], expected.loc[bars.index, "volume"])
+
+
+@pytest.mark.parametrize("kind,threshold", [("time", 30), ("volume", 200.0), ("dollar", 5_000_000.0)])
+def test_batches_match_single_ticks(ticks, kind, threshold):
+    timestamps, prices, sizes = ticks
+    single = TickAggregator(kind=kind, threshold=threshold, depth=10_000)
+    for ts, px, qty in zip(timestamps.tolist(), prices.tolist(), sizes.tolist()):
+        single.add_tick("BTC-USD", ts, px, qty)
+
+    batched = TickAggregator(kind=kind, threshold=threshold, depth=10_000)
+    for offset in range(0, len(timestamps), 337):
+        sl = slice(offset, offset + 337)
+        batched.add_ticks("BTC-USD", timestamps[sl], prices[sl], sizes[sl])
+
+    single.flush()
+    batched.flush()
+    np.testing.assert_allclose(batched.latest("BTC-USD"), single.latest("BTC-USD"))
+    np.testing.assert_array_equal(
+        batched.buffer("BTC-USD").latest_timestamps(), single.buffer("BTC-USD").latest_timestamps()
+    )
+
+
+def test_volume_bars_close_on_threshold():
+    agg = TickAggregator(kind="volume", threshold=10)
+    agg.add_ticks("ETH-USD", [1, 2, 3, 4], [100.0, 101.0, 99.0, 102.0], [4.0, 6.0, 5.0, 1.0])
+
+    assert len(agg.buffer("ETH-USD")) == 1
+    np.testing.assert_allclose(agg.latest("ETH-USD", 1)[0], [100.0, 101.0, 100.0, 101.0, 10.0])
+
+
+def test_ring_buffer_wraps_and_returns_views():
+    buffer = BarRingBuffer(capacity=4)
+    for i in range(6):
+        buffer.append(i, i, i + 1, i - 1, i + 0.5, 10 * i)
+
+    latest = buffer.latest(3)
+    assert latest.base is not None
+    assert not latest.flags.writeable
+    np.testing.assert_array_equal(latest[:, 0], [3, 4, 5])
+    np.testing.assert_array_equal(buffer.latest_timestamps(), [2, 3, 4, 5])
+
+
+def test_per_ticker_depth():
+    agg = TickAggregator(kind="volume", threshold=1, depth=8, depths={"BTC-USD": 2})
+    agg.add_ticks("BTC-USD", np.arange(5), np.ones(5), np.ones(5))
+    agg.add_ticks("ETH-USD", np.arange(5), np.ones(5), np.ones(5))
+
+    assert len(agg.buffer("BTC-USD")) == 2
+    assert len(agg.buffer("ETH-USD")) == 5
@@ -0,0 +1,123 @@
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("requests")
+
+import data.fetch_btc as fetch_btc
+import data.fetch_fred as fetch_fred
+from benchmarks.upstream_outage import FlakyUpstream, failing_yfinance
+from data.circuit_breaker import CLOSED, OPEN, CircuitBreaker, CircuitOpenError, get_breaker
+from data.synthetic import generate_ohlcv
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    for breaker in (fetch_btc.yahoo_breaker("BTC-USD"), get_breaker("fred")):
+        breaker.reset()
+    yield
+    for breaker in (fetch_btc.yahoo_breaker("BTC-USD"), get_breaker("fred")):
+        breaker.reset()
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    server = FlakyUpstream()
+    monkeypatch.setattr(fetch_fred, "FRED_CSV_ENDPOINT", server.url)
+    yield server
+    server.close()
+
+
+def test_opens_after_threshold_and_backs_off():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=2, base_backoff=10, max_backoff=30, clock=clock)
+
+    def fail():
+        raise ValueError("down")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(pytest.fail)  # not due yet: never called
+
+    clock.now = 10
+    with pytest.raises(CircuitOpenError):
+        breaker.call(fail)  # runs as a background probe
+    breaker.wait_for_probe(5)
+    assert breaker.status().retry_in == 20
+
+    clock.now = 30
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "up", key="k")
+    breaker.wait_for_probe(5)
+    assert breaker.state == CLOSED
+    assert breaker.last_result("k") == "up"
+
+
+def test_cached_results_are_bounded_lru():
+    breaker = CircuitBreaker("test", max_results=2)
+    for key in ("a", "b"):
+        breaker.call(lambda key=key: key.upper(), key=key)
+    assert breaker.last_result("a") == "A"  # now the most recently used
+    breaker.call(lambda: "C", key="c")
+    assert [breaker.last_result(key) for key in ("a", "b", "c")] == ["A", None, "C"]
+
+
+def test_fred_outage_serves_last_series_fast(upstream):
+    healthy = fetch_fred.get_fred_macro_series("CPIAUCSL")
+    assert len(healthy) == 12
+
+    upstream.fail, upstream.latency = True, 0.3
+    for _ in range(2):
+        fetch_fred.get_fred_macro_series("M2SL")
+    assert get_breaker("fred").state == OPEN
+    requests_before = upstream.requests
+
+    start = time.perf_counter()
+    cached = fetch_fred.get_fred_macro_series("CPIAUCSL")
+    fallback = fetch_fred.get_fred_macro_series("M2SL")
+    assert time.perf_counter() - start < 0.2
+    assert cached.equals(healthy)
+    assert len(fallback) == 60  # synthetic series
+    assert upstream.requests == requests_before
+
+
+def test_yahoo_outage_fails_fast(monkeypatch):
+    monkeypatch.setattr(fetch_btc, "_yfinance", lambda: failing_yfinance(0.2))
+
+    for _ in range(2):
+        assert fetch_btc.get_btc_price_data(days=30).attrs["price_source"] == "synthetic"
+    start = time.perf_counter()
+    fetch_btc.get_btc_price_data(days=30)
+    assert time.perf_counter() - start < 0.15
+    assert fetch_btc.yahoo_breaker("BTC-USD").status().describe().startswith("yahoo BTC-USD: down")
+
+
+def test_a_bad_symbol_does_not_take_other_tickers_offline(monkeypatch):
+    healthy = generate_ohlcv(30, end="2024-06-30")
+
+    def download(ticker, **kwargs):
+        return pd.DataFrame() if ticker == "BAD-USD" else healthy
+
+    monkeypatch.setattr(fetch_btc, "_yfinance", lambda: SimpleNamespace(download=download))
+    try:
+        for _ in range(3):
+            assert fetch_btc.get_btc_price_data(days=30, ticker="BAD-USD").attrs["price_source"] == "synthetic"
+        assert fetch_btc.yahoo_breaker("BAD-USD").state == OPEN
+        for ticker in ("ETH-USD", "SOL-USD"):
+            assert fetch_btc.get_btc_price_data(days=30, ticker=ticker).attrs["price_source"] == "yfinance"
+    finally:
+        for ticker in ("BAD-USD", "ETH-USD", "SOL-USD"):
+            fetch_btc.yahoo_breaker(ticker).reset()
@@ -0,0 +1,129 @@
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.prewarm import RETRY_AFTER, Prewarmer, WarmTarget, default_targets, indicator_memo, price_max_age
+from data.shared_frames import frame_age, map_frame
+from data.synthetic import generate_ohlcv
+
+
+class CountingLoader:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return generate_ohlcv(300, seed=self.calls)
+
+
+def test_warm_all_publishes_once_and_schedules_before_expiry(tmp_path):
+    loaders = {name: CountingLoader() for name in ("a", "b", "c")}
+    warmer = Prewarmer([WarmTarget(name, loader, 100.0) for name, loader in loaders.items()], directory=tmp_path, seed=1)
+    warmer.warm_all()
+    warmer.warm_all()
+
+    assert warmer.refreshed == 3
+    assert all(loader.calls == 1 for loader in loaders.values())
+    delays = [warmer.warm(target) for target in warmer.targets]
+    assert all(70.0 - 1 <= delay <= 90.0 for delay in delays)
+    assert len(set(delays)) == 3
+
+
+def test_refresh_points_are_jittered_within_the_window():
+    warmer = Prewarmer(refresh_ahead=0.2, jitter=0.1, seed=0)
+    target = WarmTarget("x", CountingLoader(), 1000.0)
+    ages = [warmer.refresh_age(target) for _ in range(500)]
+    assert 700.0 <= min(ages) < 720.0 and 880.0 < max(ages) <= 900.0
+    with pytest.raises(ValueError):
+        Prewarmer(refresh_ahead=0.1, jitter=0.2)
+
+
+def test_background_refresh_keeps_frames_from_expiring(tmp_path):
+    loader = CountingLoader()
+    warmer = Prewarmer([WarmTarget("btc", loader, max_age=1.0)], directory=tmp_path, seed=2)
+    warmer.warm_all()
+    warmer.start()
+    try:
+        oldest = 0.0
+        deadline = time.monotonic() + 2.5
+        while time.monotonic() < deadline:
+            oldest = max(oldest, frame_age("btc", tmp_path))
+            time.sleep(0.02)
+    finally:
+        warmer.stop(timeout=5)
+    assert loader.calls >= 3
+    assert oldest < 1.0
+
+
+def test_indicator_memo_matches_the_published_frame(tmp_path):
+    from signals.registry import LazyIndicatorFrame
+
+    warmer = Prewarmer([WarmTarget("memo_btc", CountingLoader(), 100.0, ("rsi", "macd"))], directory=tmp_path)
+    warmer.warm_all()
+    frame = map_frame("memo_btc", tmp_path)
+
+    memo = indicator_memo(frame)
+    assert {key[0] for key in memo} == {"rsi", "macd"}
+    lazy = LazyIndicatorFrame(frame, ["rsi"], memo=memo)
+    # Served from the warmed outputs, not recomputed
+    assert np.shares_memory(lazy["RSI"].to_numpy(), memo[lazy.indicators[0].key]["RSI"].to_numpy())
+    assert indicator_memo(generate_ohlcv(50, seed=99)) == {}
+
+
+def test_failures_and_busy_publishers_retry_soon(tmp_path):
+    failing = Prewarmer([WarmTarget("down", CountingLoader(fail=True), 100.0)], directory=tmp_path)
+    assert failing.warm(failing.targets[0]) == 100.0 * RETRY_AFTER
+    assert failing.failures == 1 and "upstream down" in failing.last_error
+
+    # Another process is publishing this frame: do not load it a second time
+    (tmp_path / "busy.lock").touch()
+    loader = CountingLoader()
+    busy = Prewarmer([WarmTarget("busy", loader, 100.0)], directory=tmp_path)
+    assert busy.warm(busy.targets[0]) == 100.0 * RETRY_AFTER
+    assert loader.calls == 0
+
+
+def test_indicator_failures_do_not_stop_the_background_refresh(tmp_path):
+    loader = CountingLoader()
+    warmer = Prewarmer([WarmTarget("bad_memo", loader, 0.5, ("no_such_indicator",))], directory=tmp_path, seed=3)
+    assert 0 < warmer.warm(warmer.targets[0]) <= 0.5
+    assert warmer.failures == 1 and "no_such_indicator" in warmer.last_error
+
+    warmer.start()
+    try:
+        time.sleep(1.2)
+        assert warmer._thread.is_alive()
+    finally:
+        warmer.stop(timeout=5)
+    assert loader.calls >= 2
+
+
+def test_price_frames_expire_by_interval():
+    ages = {target.name: target.max_age for target in default_targets(depths=[90])}
+    assert ages == {"app_btc_1d_90": price_max_age("1d"), "app_btc_1h_90": price_max_age("1h")}
+    assert price_max_age("1d") >= 600.0 > price_max_age("1h")
+
+
+def test_refreshes_pause_without_sessions_and_resume_on_touch(tmp_path):
+    loader = CountingLoader()
+    warmer = Prewarmer([WarmTarget("idle", loader, max_age=0.3)], directory=tmp_path, seed=4, idle_after=0.2)
+    warmer.warm_all()
+    warmer.start()
+    try:
+        time.sleep(0.8)
+        assert warmer.idle
+        paused_at = loader.calls
+        time.sleep(0.6)
+        assert loader.calls == paused_at
+
+        warmer.touch()
+        time.sleep(0.15)
+        assert not warmer.idle and loader.calls > paused_at
+    finally:
+        warmer.stop(timeout=5)
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.shared_frames import map_frame, publish_frame, shared_frame
+from data.synthetic import generate_ohlcv
+from signals.indicators import add_rsi
+
+
+@pytest.fixture
+def frame():
+    df = add_rsi(generate_ohlcv(300, end="2024-06-30"))
+    df.index = df.index.tz_localize("UTC")
+    return df
+
+
+def _root_base(values):
+    while isinstance(getattr(values, "base", None), np.ndarray):
+        values = values.base
+    return values.base
+
+
+def test_round_trip_is_zero_copy(frame, tmp_path):
+    publish_frame("btc", frame, tmp_path)
+    mapped = map_frame("btc", tmp_path)
+
+    pd.testing.assert_frame_equal(mapped, frame, check_freq=False)
+    assert mapped.attrs == {"price_source": "synthetic"}
+    # Float columns (NaN included) are views over the Arrow buffers, not copies
+    assert type(_root_base(mapped["RSI"].to_numpy())).__module__.startswith("pyarrow")
+
+
+def test_mapping_is_reused_until_republished(frame, tmp_path):
+    publish_frame("btc", frame, tmp_path)
+    first = map_frame("btc", tmp_path)
+    first["Extra"] = 1.0
+
+    again = map_frame("btc", tmp_path)
+    assert "Extra" not in again
+    assert np.shares_memory(again["Close"].to_numpy(), first["Close"].to_numpy())
+
+    publish_frame("btc", frame.tail(10), tmp_path)
+    assert len(map_frame("btc", tmp_path)) == 10
+
+
+def test_shared_frame_loads_once(frame, tmp_path):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return frame
+
+    shared_frame("btc", loader, directory=tmp_path)
+    shared_frame("btc", loader, directory=tmp_path)
+    assert len(calls) == 1
+
+    shared_frame("btc", loader, max_age=0, directory=tmp_path)
+    assert len(calls) == 2
+
+
+def test_busy_publisher_serves_stale_copy(frame, tmp_path):
+    publish_frame("btc", frame, tmp_path)
+    (tmp_path / "btc.lock").touch()
+
+    result = shared_frame("btc", pytest.fail, max_age=0, directory=tmp_path)
+
+    assert len(result) == len(frame)
+    assert os.path.exists(tmp_path / "btc.lock")
+    assert map_frame("missing", tmp_path) is None
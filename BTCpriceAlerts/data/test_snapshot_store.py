@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+
+from api.service import SignalQuery, SignalService
+from data.snapshot_store import SnapshotStore, latest_snapshot, refresh_snapshot
+from data.synthetic import generate_ohlcv
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(tmp_path / "snapshots.sqlite3")
+
+
+@pytest.fixture
+def prices():
+    return generate_ohlcv(400, end="2024-06-30")
+
+
+def test_refresh_stores_latest_values(store, prices):
+    snapshot = refresh_snapshot(store, "BTC-USD", "1d", prices=prices)
+    stored = store.get("BTC-USD", "1d")
+
+    assert stored.bar_time == prices.index[-1]
+    assert stored.values == snapshot.values
+    assert stored.get("Close") == pytest.approx(prices["Close"].iloc[-1])
+    assert {"RSI", "MACD_signal", "MA_signal"} <= set(stored.values)
+
+
+def test_unchanged_bar_only_touches(store, prices, monkeypatch):
+    first = refresh_snapshot(store, "BTC-USD", "1d", prices=prices)
+    monkeypatch.setattr("data.snapshot_store.build_snapshot_values", pytest.fail)
+
+    second = refresh_snapshot(store, "BTC-USD", "1d", prices=prices)
+
+    assert second.values == first.values
+    assert second.updated_at >= first.updated_at
+
+
+def test_moved_close_recomputes(store, prices):
+    refresh_snapshot(store, "BTC-USD", "1d", prices=prices)
+    moved = prices.copy()
+    moved.iloc[-1, moved.columns.get_loc("Close")] *= 1.01
+
+    snapshot = refresh_snapshot(store, "BTC-USD", "1d", prices=moved)
+
+    assert snapshot.get("Close") == pytest.approx(moved["Close"].iloc[-1])
+
+
+def test_stale_snapshot_falls_back_to_compute(store, prices):
+    store.put("BTC-USD", "1d", prices.index[-2], {"Close": 1.0})
+
+    fresh = latest_snapshot(store, "BTC-USD", "1d", prices=prices, max_age=3600)
+    assert fresh.get("Close") == 1.0
+
+    recomputed = latest_snapshot(store, "BTC-USD", "1d", prices=prices, max_age=-1)
+    assert recomputed.bar_time == prices.index[-1]
+
+
+def test_service_serves_fresh_snapshot(store, prices):
+    refresh_snapshot(store, "BTC-USD", "1d", prices=prices)
+
+    def loader(**kwargs):
+        raise AssertionError("snapshot should have been used")
+
+    service = SignalService(loader=loader, snapshots=store)
+    payload = json.loads(asyncio.run(service.latest(SignalQuery("BTC-USD", indicators=("rsi",)))))
+
+    assert set(payload["values"]) == {"Close", "RSI", "RSI_signal"}
+    assert payload["timestamp"] == prices.index[-1].isoformat()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from data.fetch_btc import _fallback_series
+from data.synthetic import SyntheticMarket, generate_ohlcv, write_ohlcv
+
+
+def test_generate_is_seeded_and_consistent():
+    first = generate_ohlcv(500, seed=3)
+    second = generate_ohlcv(500, seed=3)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert (first["High"] >= first[["Open", "Close"]].max(axis=1)).all()
+    assert (first["Low"] <= first[["Open", "Close"]].min(axis=1)).all()
+    assert (first["Volume"] > 0).all()
+
+
+def test_chunks_continue_the_same_path():
+    whole = SyntheticMarket(n_assets=3, seed=1).next_chunk(1000)
+    market = SyntheticMarket(n_assets=3, seed=1, gap_probability=0.0)
+    chunks = list(market.iter_chunks(1000, chunk_bars=300))
+
+    assert [len(index) for index, _ in chunks] == [300, 300, 300, 100]
+    index = chunks[0][0].append([idx for idx, _ in chunks[1:]])
+    assert index.equals(whole[0])
+    for (_, prev), (_, nxt) in zip(chunks, chunks[1:]):
+        np.testing.assert_allclose(nxt["Open"][0], prev["Close"][-1])
+
+
+def test_volatility_clusters():
+    close = generate_ohlcv(20_000, seed=5, freq="h")["Close"]
+    abs_returns = np.abs(np.diff(np.log(close.to_numpy())))
+
+    assert np.corrcoef(abs_returns[1:], abs_returns[:-1])[0, 1] > 0.05
+
+
+def test_multi_asset_columns():
+    df = generate_ohlcv(10, n_assets=2, tickers=["AAA", "BBB"])
+
+    assert df["Close"].columns.tolist() == ["AAA", "BBB"]
+
+
+def test_write_ohlcv_streams_csv(tmp_path):
+    paths = write_ohlcv(tmp_path, 2500, n_assets=2, chunk_bars=1000, freq="min", seed=4)
+
+    for path in paths.values():
+        df = pd.read_csv(path, parse_dates=["Date"]).set_index("Date")
+        assert len(df) == 2500
+        assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+        assert df.index.is_monotonic_increasing
+
+
+def test_fallback_series_uses_generator():
+    df = _fallback_series(48, "1h")
+
+    assert len(df) == 48
+    assert df.attrs["price_source"] == "synthetic"
+    assert df.index.freq == "h"
+
+
+def test_no_volatility_clustering_stays_finite():
+    for phi in (0.0, 0.05):
+        df = generate_ohlcv(1000, seed=3, vol_persistence=phi)
+
+        assert np.isfinite(df.to_numpy()).all()
+        assert (df["Close"] > 0).all()
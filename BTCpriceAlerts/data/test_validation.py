@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data.fetch_btc as fetch_btc
+from data.synthetic import generate_ohlcv
+from data.validation import trades_continuously, validate_prices
+
+
+@pytest.fixture
+def bars():
+    return generate_ohlcv(200, end="2024-06-30", freq="h")
+
+
+def test_clean_history_passes_through(bars):
+    result, report = validate_prices(bars, "1h")
+
+    assert report.ok
+    assert result is bars
+    assert report.summary() == "200 bars, no issues"
+
+
+def test_detects_and_fills_gaps(bars):
+    gappy = bars.drop(bars.index[[10, 11, 12, 100]])
+    result, report = validate_prices(gappy, "1h", repair="ffill")
+
+    assert (report.gaps, report.missing_bars, report.largest_gap) == (2, 4, pd.Timedelta(hours=4))
+    assert result.index.equals(bars.index)
+    filled = result.iloc[10:13]
+    assert (filled[["Open", "High", "Low", "Close"]].to_numpy() == bars["Close"].iloc[9]).all()
+    assert (filled["Volume"] == 0).all()
+
+
+def test_sorts_and_keeps_last_duplicate(bars):
+    revised = bars.iloc[[50]].assign(Close=bars["Close"].iloc[50] + 1)
+    messy = pd.concat([bars.iloc[100:], bars.iloc[:100], revised])
+    result, report = validate_prices(messy, "1h")
+
+    # Two backward steps: into the first half, then back to the revised bar
+    assert (report.out_of_order, report.duplicates, report.gaps) == (2, 1, 0)
+    assert result.index.equals(bars.index)
+    assert result["Close"].iloc[50] == bars["Close"].iloc[50] + 1
+
+
+def test_ohlc_repairs(bars):
+    broken = bars.copy()
+    broken.iloc[5, broken.columns.get_loc("High")] = broken["Low"].iloc[5] - 1
+    broken.iloc[7, broken.columns.get_loc("Close")] = np.nan
+
+    _, report = validate_prices(broken, "1h", repair=None)
+    assert (report.ohlc_violations, report.nonfinite) == (1, 1)
+
+    dropped, _ = validate_prices(broken, "1h", repair="drop")
+    assert len(dropped) == len(bars) - 2
+
+    marked, _ = validate_prices(broken, "1h", repair="mark")
+    assert marked["Invalid"].sum() == 2 and not marked["Gap"].any()
+
+    filled, _ = validate_prices(broken, "1h", repair="ffill")
+    assert filled["Close"].iloc[7] == broken["Close"].iloc[6]
+    assert (filled["High"] >= filled[["Open", "Close"]].max(axis=1)).all()
+    with pytest.raises(ValueError):
+        validate_prices(bars, "1h", repair="interpolate")
+
+
+def test_fetch_validates_yfinance_frames(bars, monkeypatch):
+    raw = pd.concat([bars, bars.tail(1)]).drop(bars.index[3])
+    raw.columns = pd.MultiIndex.from_product([raw.columns, ["BTC-USD"]], names=["Price", "Ticker"])
+    monkeypatch.setattr(fetch_btc, "_yfinance", lambda: SimpleNamespace(download=lambda *a, **k: raw))
+
+    prices = fetch_btc.get_btc_price_data(days=10, interval="1h")
+
+    assert list(prices.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert prices.index.equals(bars.index.rename("Date"))
+    assert prices.attrs["price_source"] == "yfinance"
+    assert prices.attrs["validation"]["duplicates"] == 1
+
+
+def test_only_continuous_tickers_are_gap_filled(monkeypatch):
+    assert trades_continuously("BTC-USD") and trades_continuously("eth-usdt")
+    assert not any(trades_continuously(t) for t in ("AAPL", "BRK-B", "^GSPC", "EURUSD=X", "ES=F"))
+
+    weekdays = generate_ohlcv(20, end="2024-06-28", freq="B")
+    monkeypatch.setattr(fetch_btc, "_yfinance", lambda: SimpleNamespace(download=lambda *a, **k: weekdays))
+
+    equity = fetch_btc.get_btc_price_data(days=30, ticker="SPY")
+    assert len(equity) == 20 and equity.attrs["validation"]["gaps"] == 0
+    crypto = fetch_btc.get_btc_price_data(days=30, ticker="BTC-USD")
+    assert len(crypto) == 26 and crypto.attrs["validation"]["missing_bars"] == 6
@@ -0,0 +1,185 @@
+"""
+Rolling correlation, beta and lead/lag between BTC returns and macro series.
+
+Macro observations are aligned as of the time they were actually known: a FRED
+monthly value dated the first of the month is only published weeks later, so
+each observation is shifted by `DEFAULT_RELEASE_LAG` before the backward as-of
+join. Rolling statistics come from prefix sums computed once per series, so
+any window is an O(n) difference and is memoized for instant UI switching.
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import timed
+
+# CPI/M2/fed funds for month M are released around the middle of month M+1
+DEFAULT_RELEASE_LAG = pd.Timedelta(days=45)
+# How each macro level becomes a per-period change; anything else uses "pct"
+MACRO_TRANSFORMS = {
+    "US_CPI": "pct",
+    "US_M2": "pct",
+    "US_Policy_Rate": "diff",
+    "CPI": "pct",
+    "FedFundsRate": "diff",
+}
+
+_FLAT_TOLERANCE = 1e-10
+
+
+def _naive(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    return index.tz_convert(None) if index.tz is not None else index
+
+
+def asof_align(
+    index: pd.DatetimeIndex,
+    macro: pd.DataFrame,
+    release_lag: pd.Timedelta = DEFAULT_RELEASE_LAG,
+) -> pd.DataFrame:
+    """
+    Macro values as known at each timestamp of ``index`` (no look-ahead).
+
+    Timezones are compared in UTC; the result keeps ``index`` unchanged.
+    """
+    known = macro.sort_index()
+    known.index = _naive(known.index).as_unit("ns") + release_lag
+    left = pd.DataFrame(index=_naive(index).as_unit("ns"))
+    aligned = pd.merge_asof(left, known, left_index=True, right_index=True, direction="backward")
+    aligned.index = index
+    return aligned
+
+
+def align_returns(
+    prices: pd.DataFrame,
+    macro: pd.DataFrame,
+    freq: str = "ME",
+    release_lag: pd.Timedelta = DEFAULT_RELEASE_LAG,
+) -> pd.DataFrame:
+    """
+    Per-period BTC return next to each macro series' change over the same period.
+
+    Columns are ``BTC`` followed by the macro columns, transformed per
+    `MACRO_TRANSFORMS` (percentage change for levels, difference for rates).
+    """
+    close = prices["Close"].resample(freq).last().dropna()
+    levels = asof_align(close.index, macro, release_lag)
+    changes = {"BTC": close.pct_change()}
+    for column in levels.columns:
+        series = levels[column].astype(float)
+        how = MACRO_TRANSFORMS.get(column, "pct")
+        changes[column] = series.diff() if how == "diff" else series.pct_change(fill_method=None)
+    return pd.DataFrame(changes).iloc[1:]
+
+
+class RollingCrossStats:
+    """
+    Rolling correlation and beta of ``y`` on ``x`` from cumulative sums.
+
+    Pairs where either side is missing are skipped. A window needs at least
+    half its length in valid pairs (and at least three).
+    """
+
+    def __init__(self, x: pd.Series, y: pd.Series):
+        x, y = x.align(y, join="inner")
+        self.index = x.index
+        valid = (x.notna() & y.notna()).to_numpy()
+        # Centering keeps the sums of squares well conditioned
+        xv = np.where(valid, x.to_numpy(float) - x[valid].mean(), 0.0)
+        yv = np.where(valid, y.to_numpy(float) - y[valid].mean(), 0.0)
+        self._x, self._y, self._valid = xv, yv, valid
+        self._prefix = {
+            name: np.concatenate(([0.0], np.cumsum(values)))
+            for name, values in {
+                "n": valid.astype(float),
+                "x": xv,
+                "y": yv,
+                "xx": xv * xv,
+                "yy": yv * yv,
+                "xy": xv * yv,
+            }.items()
+        }
+        self._rolling: Dict[int, pd.DataFrame] = {}
+        self._lags: Dict[int, pd.Series] = {}
+
+    def rolling(self, window: int) -> pd.DataFrame:
+        """``correlation`` and ``beta`` columns for ``window`` periods."""
+        if window not in self._rolling:
+            self._rolling[window] = self._compute(window)
+        return self._rolling[window]
+
+    def _compute(self, window: int) -> pd.DataFrame:
+        size = len(self.index)
+        corr = np.full(size, np.nan)
+        beta = np.full(size, np.nan)
+        if 0 < window <= size:
+            sums = {name: p[window:] - p[:-window] for name, p in self._prefix.items()}
+            n = sums["n"]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                cov = sums["xy"] - sums["x"] * sums["y"] / n
+                var_x = sums["xx"] - sums["x"] ** 2 / n
+                var_y = sums["yy"] - sums["y"] ** 2 / n
+                enough = n >= max(3, window // 2)
+                # A flat window leaves only cancellation noise in the variance
+                moves_x = var_x > _FLAT_TOLERANCE * sums["xx"]
+                moves_y = var_y > _FLAT_TOLERANCE * sums["yy"]
+                corr[window - 1 :] = np.where(enough & moves_x & moves_y, cov / np.sqrt(var_x * var_y), np.nan)
+                beta[window - 1 :] = np.where(enough & moves_x, cov / var_x, np.nan)
+        return pd.DataFrame({"correlation": np.clip(corr, -1, 1), "beta": beta}, index=self.index)
+
+    def lead_lag(self, max_lag: int) -> pd.Series:
+        """
+        Full-sample correlation of ``y[t]`` with ``x[t - lag]`` for ``-max_lag..max_lag``.
+
+        A peak at a positive lag means ``x`` leads ``y``.
+        """
+        if max_lag not in self._lags:
+            values = {lag: self._lagged_corr(lag) for lag in range(-max_lag, max_lag + 1)}
+            self._lags[max_lag] = pd.Series(values, name="correlation").rename_axis("lag")
+        return self._lags[max_lag]
+
+    def _lagged_corr(self, lag: int) -> float:
+        size = len(self._x)
+        if abs(lag) >= size - 2:
+            return np.nan
+        if lag >= 0:
+            x, y, ok = self._x[: size - lag], self._y[lag:], self._valid[: size - lag] & self._valid[lag:]
+        else:
+            x, y, ok = self._x[-lag:], self._y[: size + lag], self._valid[-lag:] & self._valid[: size + lag]
+        if ok.sum() < 3:
+            return np.nan
+        x, y = x[ok] - x[ok].mean(), y[ok] - y[ok].mean()
+        denom = np.sqrt((x * x).sum() * (y * y).sum())
+        return float((x * y).sum() / denom) if denom > 0 else np.nan
+
+
+class MacroCorrelation:
+    """`RollingCrossStats` of ``target`` against every other column of ``aligned``."""
+
+    def __init__(self, aligned: pd.DataFrame, target: str = "BTC"):
+        self.aligned = aligned
+        self.target = target
+        self.series = [col for col in aligned.columns if col != target]
+        self._stats = {col: RollingCrossStats(aligned[col], aligned[target]) for col in self.series}
+
+    def correlation(self, window: int) -> pd.DataFrame:
+        return pd.DataFrame({col: stats.rolling(window)["correlation"] for col, stats in self._stats.items()})
+
+    def beta(self, window: int) -> pd.DataFrame:
+        return pd.DataFrame({col: stats.rolling(window)["beta"] for col, stats in self._stats.items()})
+
+    def lead_lag(self, max_lag: int = 6) -> pd.DataFrame:
+        return pd.DataFrame({col: stats.lead_lag(max_lag) for col, stats in self._stats.items()})
+
+
+@timed()
+def build_macro_correlation(
+    prices: pd.DataFrame,
+    macro: pd.DataFrame,
+    freq: str = "ME",
+    release_lag: pd.Timedelta = DEFAULT_RELEASE_LAG,
+) -> MacroCorrelation:
+    """Align ``prices`` and ``macro`` at ``freq`` and precompute the rolling sums."""
+    return MacroCorrelation(align_returns(prices, macro, freq, release_lag))
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macro.correlation import RollingCrossStats, align_returns, asof_align, build_macro_correlation
+
+
+@pytest.fixture
+def pair():
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2015-01-31", periods=120, freq="ME")
+    x = pd.Series(rng.normal(size=120), index=index)
+    y = 0.5 * x.shift(2) + rng.normal(scale=0.5, size=120)
+    x.iloc[[10, 50]] = np.nan
+    return x, y
+
+
+def test_rolling_matches_pandas(pair):
+    x, y = pair
+    stats = RollingCrossStats(x, y).rolling(12)
+
+    expected_corr = y.rolling(12, min_periods=6).corr(x)
+    expected_beta = y.rolling(12, min_periods=6).cov(x) / x.rolling(12, min_periods=6).var()
+    valid = x.notna() & y.notna()
+    # pandas drops missing pairs per side for var(); compare windows without gaps
+    full = valid.rolling(12).sum() == 12
+    np.testing.assert_allclose(stats["correlation"][full], expected_corr[full], atol=1e-10)
+    np.testing.assert_allclose(stats["beta"][full], expected_beta[full], atol=1e-10)
+
+
+def test_windows_are_memoized_and_flat_windows_are_nan(pair):
+    x, y = pair
+    x.iloc[60:80] = 3.0
+    stats = RollingCrossStats(x, y)
+
+    assert stats.rolling(12) is stats.rolling(12)
+    assert stats.rolling(12)["correlation"].iloc[75:80].isna().all()
+
+
+def test_lead_lag_finds_shift(pair):
+    x, y = pair
+    lags = RollingCrossStats(x, y).lead_lag(4)
+
+    assert list(lags.index) == list(range(-4, 5))
+    assert lags.idxmax() == 2
+
+
+def test_asof_waits_for_release():
+    macro = pd.DataFrame({"CPI": [100.0, 101.0]}, index=pd.to_datetime(["2024-01-01", "2024-02-01"]))
+    index = pd.date_range("2024-02-01", "2024-03-31", freq="D", tz="UTC")
+
+    aligned = asof_align(index, macro, release_lag=pd.Timedelta(days=45))
+
+    assert aligned.index.equals(index)
+    assert np.isnan(aligned.loc["2024-02-14", "CPI"])
+    assert (aligned.loc["2024-02-15":"2024-03-16", "CPI"] == 100.0).all()
+    assert aligned.loc["2024-03-17", "CPI"] == 101.0
+
+
+def test_align_returns_transforms():
+    index = pd.date_range("2023-01-01", "2024-12-31", freq="D")
+    prices = pd.DataFrame({"Close": np.linspace(100, 200, len(index))}, index=index)
+    months = pd.date_range("2022-10-01", periods=27, freq="MS")
+    macro = pd.DataFrame({"US_CPI": np.arange(27) + 100.0, "US_Policy_Rate": np.arange(27) * 0.25}, index=months)
+
+    aligned = align_returns(prices, macro)
+
+    assert list(aligned.columns) == ["BTC", "US_CPI", "US_Policy_Rate"]
+    assert (aligned["US_Policy_Rate"] == 0.25).all()
+    assert aligned["BTC"].gt(0).all()
+    correlations = build_macro_correlation(prices, macro).correlation(6)
+    assert list(correlations.columns) == ["US_CPI", "US_Policy_Rate"]
@@ -0,0 +1,312 @@
+"""
+Indexed archive of historical signal events in SQLite.
+
+An event is a bar on which an indicator's signal turns to Buy or Sell (a
+crossover, or RSI/Bollinger entering a band; a signal that stays Buy is one
+event). Bars inside an indicator's warm-up are skipped. `SignalArchive.record` extracts the events of a `LazyIndicatorFrame`
+with one vectorized pass per indicator and writes them in a single
+transaction. Queries such as "every MA cross for BTC-USD in 2021" or "last Buy
+per indicator" are answered from the primary key and the direction index
+instead of recomputing indicators over history.
+
+    python -m signals.archive --tickers BTC-USD --intervals 1d --days 3650    # backfill
+    python -m benchmarks.signal_archive                                       # query vs recompute
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from signals.registry import INDICATORS, LazyIndicatorFrame
+from utils.instrumentation import timed
+
+DEFAULT_ARCHIVE_PATH = Path(
+    os.environ.get("BTC_SIGNAL_ARCHIVE", Path(__file__).resolve().parent / "signal_archive.sqlite3")
+)
+DIRECTIONS = ("Buy", "Sell")
+# Seed weight left in EMA-based signals when events start being archived: windows
+# of different lengths then agree on every archived transition
+WARMUP_TOLERANCE = 1e-3
+EVENT_COLUMNS = ["timestamp", "ticker", "interval", "indicator", "params", "direction", "price"]
+
+# Timestamps are stored as UTC epoch nanoseconds so range scans compare integers
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signal_events (
+    ticker TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    params TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    direction TEXT NOT NULL,
+    price REAL,
+    PRIMARY KEY (ticker, interval, indicator, ts, params)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS signal_events_direction
+    ON signal_events (ticker, interval, direction, indicator, params, ts);
+"""
+
+
+def _params_key(params: Mapping[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _epoch_ns(value) -> int:
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return stamp.as_unit("ns").value
+
+
+def _stamps(index: pd.Index) -> np.ndarray:
+    stamps = pd.DatetimeIndex(index)
+    if stamps.tz is not None:
+        stamps = stamps.tz_convert("UTC").tz_localize(None)
+    return stamps.as_unit("ns").asi8
+
+
+def _period_end(value) -> pd.Timestamp:
+    """Last instant of a date-only string ("2021", "2021-06", "2021-06-30"); other values as is."""
+    if isinstance(value, str) and not any(sep in value for sep in (":", "T", " ")):
+        return pd.Period(value).end_time
+    return pd.Timestamp(value)
+
+
+def _first_archived_row(indicator) -> int:
+    """
+    First bar of a frame whose ``indicator`` events are archived. Before the
+    warm-up the signal depends on where the window starts (and the state
+    before the first bar is unknown), so it cannot be archived.
+    """
+    return max(indicator.warmup_bars(WARMUP_TOLERANCE) or 0, 1)
+
+
+def signal_events(frame: LazyIndicatorFrame) -> pd.DataFrame:
+    """
+    Buy/Sell transitions of every enabled indicator with a signal column.
+
+    Columns: timestamp, indicator, params (JSON), direction, price (close).
+    """
+    close = frame["Close"].to_numpy(dtype="float64")
+    parts = []
+    for indicator in frame.indicators:
+        if not indicator.signal:
+            continue
+        signal = pd.Series(np.asarray(frame[indicator.signal], dtype=object))
+        changed = signal.ne(signal.shift(1)).to_numpy() & signal.isin(DIRECTIONS).to_numpy()
+        changed[: _first_archived_row(indicator)] = False
+        rows = np.flatnonzero(changed)
+        parts.append(
+            pd.DataFrame(
+                {
+                    "timestamp": frame.index[rows],
+                    "indicator": indicator.name,
+                    "params": _params_key(indicator.params),
+                    "direction": signal.to_numpy()[rows],
+                    "price": close[rows],
+                }
+            )
+        )
+    if not parts:
+        return pd.DataFrame(columns=EVENT_COLUMNS[:1] + EVENT_COLUMNS[3:])
+    return pd.concat(parts, ignore_index=True).sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+class SignalArchive:
+    """Signal events keyed by (ticker, interval, indicator, time, params) (WAL mode, thread-safe)."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else DEFAULT_ARCHIVE_PATH
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @timed()
+    def record(self, ticker: str, interval: str, frame: LazyIndicatorFrame) -> int:
+        """
+        Store the events of ``frame`` in one transaction; returns how many.
+
+        Re-recording overlapping history replaces the archived events of each
+        indicator from the end of its warm-up to the last bar of ``frame``, so
+        a job can archive its whole window after every refresh, and an event
+        on an unfinished last bar that a later refresh no longer shows (a
+        cross that reverted before the close) is dropped.
+        """
+        events = signal_events(frame)
+        stamps = _stamps(pd.DatetimeIndex(events["timestamp"]))
+        rows = zip(
+            [ticker] * len(events),
+            [interval] * len(events),
+            events["indicator"].tolist(),
+            events["params"].tolist(),
+            stamps.tolist(),
+            events["direction"].tolist(),
+            [None if np.isnan(price) else price for price in events["price"].tolist()],
+        )
+        bars = _stamps(frame.index)
+        with self._connect() as conn:
+            for indicator in frame.indicators:
+                first = _first_archived_row(indicator)
+                if indicator.signal and first < len(bars):
+                    conn.execute(
+                        "DELETE FROM signal_events WHERE ticker = ? AND interval = ? AND indicator = ? AND params = ? "
+                        "AND ts BETWEEN ? AND ?",
+                        (ticker, interval, indicator.name, _params_key(indicator.params), int(bars[first]), int(bars[-1])),
+                    )
+            conn.executemany("INSERT OR REPLACE INTO signal_events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(events)
+
+    def _frame(self, rows: Sequence[tuple]) -> pd.DataFrame:
+        events = pd.DataFrame(rows, columns=["ts", *EVENT_COLUMNS[1:]])
+        events.insert(0, "timestamp", pd.to_datetime(events.pop("ts").astype("int64"), unit="ns"))
+        return events
+
+    @timed()
+    def query(
+        self,
+        ticker: str,
+        indicator: Optional[str] = None,
+        start=None,
+        end=None,
+        direction: Optional[str] = None,
+        interval: str = "1d",
+        params: Optional[Mapping[str, Any]] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Events for ``ticker`` in ``[start, end]`` (inclusive), oldest first.
+
+        A date string without a time covers its whole period, so
+        ``start="2021", end="2021"`` is the year 2021 and ``end="2021-06"``
+        includes all of June.
+
+        ``params`` narrows to one parameter set (e.g. ``{"short": 50, "long": 200}``
+        for ma_cross; unspecified keys keep their registry defaults).
+        ``limit`` returns only the most recent ``limit`` matching events.
+        """
+        clauses = ["ticker = ?", "interval = ?"]
+        args: List[Any] = [ticker, interval]
+        if indicator is not None:
+            clauses.append("indicator = ?")
+            args.append(indicator)
+            if params is not None:
+                clauses.append("params = ?")
+                args.append(_params_key({**INDICATORS[indicator].params, **params}))
+        if direction is not None:
+            clauses.append("direction = ?")
+            args.append(direction)
+        if start is not None:
+            clauses.append("ts >= ?")
+            args.append(_epoch_ns(start))
+        if end is not None:
+            clauses.append("ts <= ?")
+            args.append(_epoch_ns(_period_end(end)))
+        sql = f"SELECT ts, ticker, interval, indicator, params, direction, price FROM signal_events WHERE {' AND '.join(clauses)}"
+        if limit is not None:
+            sql = f"SELECT * FROM ({sql} ORDER BY ts DESC LIMIT ?) ORDER BY ts"
+            args.append(int(limit))
+        else:
+            sql += " ORDER BY ts"
+        return self._frame(self._connect().execute(sql, args).fetchall())
+
+    @timed()
+    def last_signals(self, ticker: str, direction: str = "Buy", interval: str = "1d") -> pd.DataFrame:
+        """The most recent ``direction`` event per (indicator, params)."""
+        # Loose index scan: seek to each (indicator, params) group, then to its newest event,
+        # so the cost grows with the number of groups rather than the number of events
+        conn = self._connect()
+        prefix = "FROM signal_events INDEXED BY signal_events_direction WHERE ticker = ? AND interval = ? AND direction = ?"
+        rows = []
+        group = ("", "")
+        while True:
+            found = conn.execute(
+                f"SELECT indicator, params {prefix} AND (indicator, params) > (?, ?) ORDER BY indicator, params LIMIT 1",
+                (ticker, interval, direction, *group),
+            ).fetchone()
+            if found is None:
+                break
+            group = found
+            rows.append(
+                conn.execute(
+                    f"SELECT ts, ticker, interval, indicator, params, direction, price {prefix} "
+                    "AND indicator = ? AND params = ? ORDER BY ts DESC LIMIT 1",
+                    (ticker, interval, direction, *group),
+                ).fetchone()
+            )
+        return self._frame(rows)
+
+    def latest_timestamp(self, ticker: str, interval: str = "1d") -> Optional[pd.Timestamp]:
+        row = self._connect().execute(
+            "SELECT MAX(ts) FROM signal_events WHERE ticker = ? AND interval = ?", (ticker, interval)
+        ).fetchone()
+        return pd.Timestamp(row[0], unit="ns") if row and row[0] is not None else None
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM signal_events").fetchone()[0]
+
+
+def archivable(prices: pd.DataFrame) -> bool:
+    """
+    Whether events computed from ``prices`` may be archived: only live
+    downloads, never the fetcher's synthetic or cached fallbacks, whose bars
+    would replace the ticker's real events.
+    """
+    from data.fetch_btc import LIVE_SOURCE
+
+    return prices.attrs.get("price_source") == LIVE_SOURCE
+
+
+def backfill(
+    archive: SignalArchive,
+    tickers: Iterable[str],
+    intervals: Iterable[str],
+    days: int,
+    indicators: Optional[Union[Iterable[str], Dict[str, Dict[str, Any]]]] = None,
+) -> Dict[str, int]:
+    """
+    Compute indicators once over ``days`` of history and archive their
+    events. Histories that could not be downloaded (see `archivable`) are
+    skipped with a warning.
+    """
+    from data.fetch_btc import get_btc_price_data
+
+    written = {}
+    for ticker in tickers:
+        for interval in intervals:
+            prices = get_btc_price_data(days=days, interval=interval, ticker=ticker)
+            if not archivable(prices):
+                print(f"❌ Skipping {ticker} {interval}: no live prices ({prices.attrs.get('price_source', 'unknown')})")
+                continue
+            enabled = indicators
+            if enabled is None:
+                enabled = [name for name, spec in INDICATORS.items() if spec.signal and set(spec.inputs) <= set(prices.columns)]
+            written[f"{ticker} {interval}"] = archive.record(ticker, interval, LazyIndicatorFrame(prices, enabled))
+    return written
+
+
+if __name__ == "__main__":  # pragma: no cover - backfill entry point
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill the signal event archive.")
+    parser.add_argument("--tickers", default="BTC-USD")
+    parser.add_argument("--intervals", default="1d")
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--db", default=None, help=f"SQLite path (default {DEFAULT_ARCHIVE_PATH})")
+    args = parser.parse_args()
+    for key, count in backfill(SignalArchive(args.db), args.tickers.split(","), args.intervals.split(","), args.days).items():
+        print(f"{key}: {count} events")
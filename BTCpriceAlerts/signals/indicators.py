@@ -1,12 +1,32 @@
 # signals/indicators.py
 
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 
-try:
-    import pandas_ta as ta  # type: ignore
-except ModuleNotFoundError:  # Optional dependency
-    ta = None
+from signals.rolling import rolling_max, rolling_mean, rolling_min, true_range, wilder_mean
+from utils.instrumentation import timed
+
+# Default RSI bands; add_rsi takes per-call overrides (e.g. lower=25, upper=75)
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
+
+@lru_cache(maxsize=None)
+def _ta():
+    """Import pandas_ta on first use; it is optional and slow to import."""
+    try:
+        import pandas_ta  # type: ignore
+    except ModuleNotFoundError:  # Optional dependency
+        return None
+    return pandas_ta
+
+
+def float64_copy(df):
+    """Copy of ``df`` to compute on, with float32 (low-memory) columns widened."""
+    narrow = df.columns[df.dtypes == 'float32']
+    return df.astype(dict.fromkeys(narrow, 'float64')) if len(narrow) else df.copy()
 
 
 def _ema(series: pd.Series, span: int) -> pd.Series:
@@ -24,44 +44,48 @@ def _rsi(series: pd.Series, length: int) -> pd.Series:
     return rsi
 
 
+def bollinger_columns(length=20, std=2.0):
+    """Names of the lower, middle and upper band columns `add_bollinger_bands` writes."""
+    return f"BBL_{length}_{std}", f"BBM_{length}_{std}", f"BBU_{length}_{std}"
+
+
 def _bollinger(series: pd.Series, length: int, std: float) -> pd.DataFrame:
     ma = series.rolling(window=length, min_periods=length).mean()
     deviation = series.rolling(window=length, min_periods=length).std()
     upper = ma + std * deviation
     lower = ma - std * deviation
-    df = pd.DataFrame(
-        {
-            f"BBM_{length}_{std}": ma,
-            f"BBU_{length}_{std}": upper,
-            f"BBL_{length}_{std}": lower,
-        },
-        index=series.index,
-    )
+    lower_col, middle_col, upper_col = bollinger_columns(length, std)
+    df = pd.DataFrame({middle_col: ma, upper_col: upper, lower_col: lower}, index=series.index)
     return df
 
 
-def add_rsi(df, length=14):
+@timed()
+def add_rsi(df, length=14, lower=RSI_OVERSOLD, upper=RSI_OVERBOUGHT):
     """
     Adds RSI (Relative Strength Index) and Buy/Sell signals.
-    Buy when RSI < 30, Sell when RSI > 70.
+    Buy when RSI < lower (default 30), Sell when RSI > upper (default 70).
     """
+    ta = _ta()
     if ta:
         df['RSI'] = ta.rsi(df['Close'], length=length)
     else:
         df['RSI'] = _rsi(df['Close'], length=length)
-    df['RSI_signal'] = np.where(df['RSI'] < 30, 'Buy',
-                         np.where(df['RSI'] > 70, 'Sell', None))
+    df['RSI_signal'] = np.where(df['RSI'] < lower, 'Buy',
+                         np.where(df['RSI'] > upper, 'Sell', None))
     return df
 
 
+@timed()
 def add_macd(df):
     """
     Adds MACD indicators.
     Buy when MACD line > Signal line, Sell otherwise.
     """
+    ta = _ta()
     if ta:
         macd = ta.macd(df['Close'])
-        df = df.join(macd)
+        for col in macd.columns:
+            df[col] = macd[col]
     else:
         ema_short = _ema(df['Close'], span=12)
         ema_long = _ema(df['Close'], span=26)
@@ -75,6 +99,7 @@ def add_macd(df):
     return df
 
 
+@timed()
 def add_ma_cross(df, short=50, long=200):
     """
     Adds Simple Moving Average crossover signals.
@@ -89,11 +114,13 @@ def add_ma_cross(df, short=50, long=200):
     return df
 
 
+@timed()
 def add_ema_cross(df, short=12, long=26):
     """
     Adds Exponential Moving Average crossover signals.
     Buy when short EMA crosses above long EMA. Sell when it crosses below.
     """
+    ta = _ta()
     if ta:
         df['EMA_short'] = ta.ema(df['Close'], length=short)
         df['EMA_long'] = ta.ema(df['Close'], length=long)
@@ -107,51 +134,335 @@ def add_ema_cross(df, short=12, long=26):
     return df
 
 
-def add_bollinger_bands(df, length=20, std=2):
+@timed()
+def add_bollinger_bands(df, length=20, std=2.0):
     """
     Adds Bollinger Bands and signals.
     Buy when price touches lower band, Sell when price touches upper band.
     """
+    columns = bollinger_columns(length, std)
+    lower_col, _, upper_col = columns
+    ta = _ta()
     if ta:
         bb = ta.bbands(df['Close'], length=length, std=std)
+        if bb is not None:
+            # pandas_ta versions disagree on the suffix (BBL_20_2.0 vs BBL_20_2.0_2.0)
+            bb = bb.rename(columns={col: name for col in bb.columns for name in columns if col[:3] == name[:3]})
     else:
         bb = _bollinger(df['Close'], length=length, std=std)
 
-    if bb is None or bb.empty:
+    if bb is None or bb.empty or lower_col not in bb.columns or upper_col not in bb.columns:
         # Ensure expected columns exist so downstream code does not break
-        df[f'BBL_{length}_{std}'] = np.nan
-        df[f'BBU_{length}_{std}'] = np.nan
+        for col in columns:
+            df[col] = np.nan
         df['BB_signal'] = None
         return df
 
-    df = df.join(bb)
-
-    lower_col = next((c for c in bb.columns if c.startswith(f'BBL_{length}_')), None)
-    upper_col = next((c for c in bb.columns if c.startswith(f'BBU_{length}_')), None)
-
-    if not lower_col or not upper_col:
-        df['BB_signal'] = None
-        return df
+    for col in bb.columns:
+        df[col] = bb[col]
 
     df['BB_signal'] = np.where(df['Close'] <= df[lower_col], 'Buy',
                         np.where(df['Close'] >= df[upper_col], 'Sell', None))
     return df
 
 
-def add_vwap(df):
+def _high_low_close(df):
+    return (
+        df['High'].to_numpy(dtype='float64'),
+        df['Low'].to_numpy(dtype='float64'),
+        df['Close'].to_numpy(dtype='float64'),
+    )
+
+
+def _previous(values):
+    return np.concatenate(([np.nan], values[:-1]))
+
+
+def _crosses(a, b):
+    """Masks of bars where `a` crosses above and below `b`."""
+    above = a > b
+    was_above = np.concatenate(([False], above[:-1]))
+    below = a < b
+    was_below = np.concatenate(([False], below[:-1]))
+    return above & was_below, below & was_above
+
+
+@timed()
+def add_donchian(df, length=20):
+    """
+    Adds Donchian channels: highest High and lowest Low of the last `length` bars.
+    Buy when Close breaks above the previous bar's upper channel, Sell when it breaks below the lower one.
+    """
+    high, low, close = _high_low_close(df)
+    upper = rolling_max(high, length)
+    lower = rolling_min(low, length)
+    df[f'DCL_{length}'] = lower
+    df[f'DCM_{length}'] = (upper + lower) / 2
+    df[f'DCU_{length}'] = upper
+    df['DC_signal'] = np.where(close > _previous(upper), 'Buy',
+                        np.where(close < _previous(lower), 'Sell', None))
+    return df
+
+
+@timed()
+def add_stochastic(df, length=14, d=3, smooth_k=3, lower=20, upper=80):
+    """
+    Adds the Stochastic oscillator: %K (Close within the `length`-bar range, smoothed over
+    `smooth_k` bars) and %D (its `d`-bar mean).
+    Buy when %K crosses above %D below `lower`, Sell when it crosses below %D above `upper`.
+    """
+    high, low, close = _high_low_close(df)
+    highest = rolling_max(high, length)
+    lowest = rolling_min(low, length)
+    span = highest - lowest
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw = np.where(span > 0, 100 * (close - lowest) / span, np.nan)
+    stoch_k = rolling_mean(raw, smooth_k)
+    stoch_d = rolling_mean(stoch_k, d)
+    df[f'STOCHk_{length}_{d}_{smooth_k}'] = stoch_k
+    df[f'STOCHd_{length}_{d}_{smooth_k}'] = stoch_d
+    up, down = _crosses(stoch_k, stoch_d)
+    df['STOCH_signal'] = np.where(up & (stoch_d < lower), 'Buy',
+                           np.where(down & (stoch_d > upper), 'Sell', None))
+    return df
+
+
+@timed()
+def add_williams_r(df, length=14, lower=-80, upper=-20):
+    """
+    Adds Williams %R: how far Close sits below the `length`-bar high, from 0 to -100.
+    Buy when %R < lower (default -80), Sell when %R > upper (default -20).
+    """
+    high, low, close = _high_low_close(df)
+    highest = rolling_max(high, length)
+    span = highest - rolling_min(low, length)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        willr = np.where(span > 0, -100 * (highest - close) / span, np.nan)
+    df[f'WILLR_{length}'] = willr
+    df['WILLR_signal'] = np.where(willr < lower, 'Buy',
+                           np.where(willr > upper, 'Sell', None))
+    return df
+
+
+@timed()
+def add_atr(df, length=14, multiplier=1.5):
+    """
+    Adds ATR (Wilder's average of the true range) as `ATRr_{length}`.
+    Buy when Close rises more than `multiplier` ATRs above the previous close, Sell when it falls that far.
+    """
+    high, low, close = _high_low_close(df)
+    atr = wilder_mean(true_range(high, low, close), length)
+    df[f'ATRr_{length}'] = atr
+    move = close - _previous(close)
+    band = multiplier * _previous(atr)
+    df['ATR_signal'] = np.where(move > band, 'Buy',
+                         np.where(move < -band, 'Sell', None))
+    return df
+
+
+def _typical_price_volume(df):
+    high = df['High'].to_numpy(dtype='float64')
+    low = df['Low'].to_numpy(dtype='float64')
+    close = df['Close'].to_numpy(dtype='float64')
+    volume = df['Volume'].to_numpy(dtype='float64')
+    return (high + low + close) / 3, volume
+
+
+def _anchor_starts(index, anchor):
+    """Boolean mask marking the first bar of every anchored segment."""
+    starts = np.zeros(len(index), dtype=bool)
+    if len(index) == 0:
+        return starts
+    starts[0] = True
+    if anchor is None:
+        return starts
+    if isinstance(anchor, str):
+        if anchor.lower() == 'session':
+            anchor = 'D'
+        stamps = pd.DatetimeIndex(index)
+        if stamps.tz is not None:
+            stamps = stamps.tz_localize(None)
+        codes = stamps.to_period(anchor).asi8
+    else:
+        anchors = pd.DatetimeIndex(anchor).sort_values().asi8
+        codes = np.searchsorted(anchors, pd.DatetimeIndex(index).asi8, side='right')
+    starts[1:] = codes[1:] != codes[:-1]
+    return starts
+
+
+def _anchored_vwap(typical, volume, starts):
+    """VWAP that resets at every ``starts`` bar, via one segmented cumulative sum."""
+    pv = typical * volume
+    cum_pv = np.cumsum(pv)
+    cum_vol = np.cumsum(volume)
+    first = np.maximum.accumulate(np.where(starts, np.arange(len(starts)), 0))
+    seg_pv = cum_pv - (cum_pv - pv)[first]
+    seg_vol = cum_vol - (cum_vol - volume)[first]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(seg_vol > 0, seg_pv / seg_vol, np.nan)
+
+
+def _rolling_vwap(typical, volume, window):
+    """VWAP over the trailing ``window`` bars from differenced cumulative sums."""
+    cum_pv = np.concatenate(([0.0], np.cumsum(typical * volume)))
+    cum_vol = np.concatenate(([0.0], np.cumsum(volume)))
+    out = np.full(len(typical), np.nan)
+    if len(typical) >= window:
+        win_pv = cum_pv[window:] - cum_pv[:-window]
+        win_vol = cum_vol[window:] - cum_vol[:-window]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[window - 1:] = np.where(win_vol > 0, win_pv / win_vol, np.nan)
+    return out
+
+
+@timed()
+def add_vwap(df, anchor='D'):
     """
     Adds VWAP (Volume Weighted Average Price).
-    Typically used for intraday data — ensure 'Volume' is present.
+    Resets at every ``anchor`` period ('D'/'session', 'W', 'M', ...) or at each of
+    a list of anchor timestamps; ``anchor=None`` accumulates from the first bar.
     """
     if 'Volume' not in df.columns:
         raise ValueError("VWAP requires 'Volume' column in the DataFrame.")
 
-    if ta:
-        df['VWAP'] = ta.vwap(df['High'], df['Low'], df['Close'], df['Volume'])
-    else:
-        typical_price = (df['High'] + df['Low'] + df['Close']) / 3
-        cumulative_vp = (typical_price * df['Volume']).cumsum()
-        cumulative_volume = df['Volume'].cumsum()
-        df['VWAP'] = cumulative_vp / cumulative_volume.replace(0, np.nan)
+    typical, volume = _typical_price_volume(df)
+    starts = _anchor_starts(df.index, anchor)
+    df['VWAP'] = _anchored_vwap(typical, volume, starts)
+    return df
+
+
+@timed()
+def add_rolling_vwap(df, window=20):
+    """
+    Adds a rolling-window VWAP over the trailing `window` bars as `VWAP_{window}`.
+    """
+    if 'Volume' not in df.columns:
+        raise ValueError("VWAP requires 'Volume' column in the DataFrame.")
 
+    typical, volume = _typical_price_volume(df)
+    df[f'VWAP_{window}'] = _rolling_vwap(typical, volume, window)
     return df
+
+
+class StreamingVWAP:
+    """
+    Incremental VWAP updated one bar at a time.
+    Matches `add_vwap` when given ``anchor`` and `add_rolling_vwap` when given
+    ``window``; the rolling sums live in preallocated arrays.
+    """
+
+    def __init__(self, anchor='D', window=None):
+        self.anchor = 'D' if isinstance(anchor, str) and anchor.lower() == 'session' else anchor
+        self.window = window
+        self._anchors = None
+        if self.anchor is not None and not isinstance(self.anchor, str):
+            self._anchors = pd.DatetimeIndex(self.anchor).sort_values().asi8
+        self._period = None
+        self._sum_pv = 0.0
+        self._sum_vol = 0.0
+        if window:
+            self._pv = np.zeros(window)
+            self._vol = np.zeros(window)
+            self._slot = 0
+            self._filled = 0
+
+    def _period_of(self, timestamp):
+        stamp = pd.Timestamp(timestamp)
+        if self._anchors is not None:
+            return int(np.searchsorted(self._anchors, stamp.value, side='right'))
+        if stamp.tzinfo is not None:
+            stamp = stamp.tz_localize(None)
+        return stamp.to_period(self.anchor)
+
+    def update(self, timestamp, high, low, close, volume):
+        """Fold in a completed bar and return the current VWAP."""
+        pv = (high + low + close) / 3 * volume
+        if self.window:
+            slot = self._slot
+            self._sum_pv += pv - self._pv[slot]
+            self._sum_vol += volume - self._vol[slot]
+            self._pv[slot] = pv
+            self._vol[slot] = volume
+            self._slot = (slot + 1) % self.window
+            self._filled = min(self._filled + 1, self.window)
+            if self._filled < self.window:
+                return np.nan
+        else:
+            if self.anchor is not None:
+                period = self._period_of(timestamp)
+                if period != self._period:
+                    self._period = period
+                    self._sum_pv = 0.0
+                    self._sum_vol = 0.0
+            self._sum_pv += pv
+            self._sum_vol += volume
+        return self._sum_pv / self._sum_vol if self._sum_vol > 0 else np.nan
+
+
+# Default truncation tolerance of `latest_values`: the weight of the discarded
+# history in any exponentially smoothed value is at most this fraction.
+LATEST_TOLERANCE = 1e-6
+
+
+def _ema_warmup(alpha, tol):
+    """Bars after which an EMA with smoothing ``alpha`` forgets its seed to ``tol``."""
+    return int(np.ceil(np.log(tol) / np.log(1 - alpha)))
+
+
+def _rsi_warmup(tol, length=14, **_):
+    # pandas_ta smooths with Wilder's RMA; the fallback uses an exact SMA window.
+    return _ema_warmup(1 / length, tol) + 1 if _ta() else length + 1
+
+
+def _macd_warmup(tol, **_):
+    return _ema_warmup(2 / 27, tol) + _ema_warmup(2 / 10, tol)
+
+
+def _ema_cross_warmup(tol, short=12, long=26):
+    return _ema_warmup(2 / (long + 1), tol) + 1
+
+
+_WARMUP = {
+    add_rsi: _rsi_warmup,
+    add_macd: _macd_warmup,
+    add_ma_cross: lambda tol, short=50, long=200: long + 1,
+    add_ema_cross: _ema_cross_warmup,
+    add_bollinger_bands: lambda tol, length=20, std=2.0: length,
+    add_rolling_vwap: lambda tol, window=20: window,
+    add_donchian: lambda tol, length=20: length + 1,
+    add_stochastic: lambda tol, length=14, d=3, smooth_k=3, **_: length + smooth_k + d - 1,
+    add_williams_r: lambda tol, length=14, **_: length,
+    add_atr: lambda tol, length=14, **_: length + _ema_warmup(1 / length, tol) + 1,
+}
+
+
+def warmup_bars(func, tol=LATEST_TOLERANCE, **params):
+    """
+    Number of trailing bars `func` needs so its last value matches the full-history
+    computation: exact for window indicators, within ``tol`` for EMA-based ones.
+    Returns None when the value depends on the whole history.
+    """
+    warmup = _WARMUP.get(func)
+    return warmup(tol, **params) if warmup else None
+
+
+@timed()
+def latest_values(df, func, k=1, tol=LATEST_TOLERANCE, **params):
+    """
+    Compute only the last `k` rows of an ``add_*`` indicator.
+
+    Runs `func` over the shortest trailing window that reproduces the full
+    computation: window indicators (SMA cross, Bollinger, fallback RSI, rolling
+    VWAP) are exact, anchored VWAP starts at the current anchor period, and EMA
+    based outputs (MACD, EMA cross, pandas_ta RSI) differ from the full result by
+    at most ``tol`` times the gap between the seed price and the true average.
+    """
+    if func is add_vwap:
+        anchor = params.get('anchor', 'D')
+        starts = np.flatnonzero(_anchor_starts(df.index, anchor))
+        first = max(len(df) - k, 0)
+        window = df.iloc[starts[np.searchsorted(starts, first, side='right') - 1]:] if len(starts) else df
+    else:
+        bars = warmup_bars(func, tol, **params)
+        window = df if bars is None else df.iloc[-(bars + k - 1):]
+    return func(float64_copy(window), **params).iloc[-k:]
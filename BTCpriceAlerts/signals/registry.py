@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+
+import pandas as pd
+
+from signals.indicators import (
+    LATEST_TOLERANCE,
+    RSI_OVERBOUGHT,
+    RSI_OVERSOLD,
+    add_atr,
+    add_bollinger_bands,
+    add_donchian,
+    add_ema_cross,
+    add_macd,
+    add_ma_cross,
+    add_rolling_vwap,
+    add_rsi,
+    add_stochastic,
+    add_vwap,
+    add_williams_r,
+    bollinger_columns,
+    float64_copy,
+    latest_values,
+    warmup_bars,
+)
+from utils import memory
+from utils.instrumentation import record_cache, track
+
+
+@dataclass(frozen=True)
+class TraceStyle:
+    """How one output column is drawn on the overlay chart."""
+
+    column: str
+    name: str
+    line: Dict[str, Any] = field(default_factory=dict)
+    secondary: bool = False
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    Declarative description of an ``add_*`` indicator.
+
+    ``outputs``, ``signal`` and trace columns may contain ``{param}`` placeholders
+    that are filled from the effective parameters. ``choices`` lists the
+    parameters a UI may expose together with their allowed values. Warm-up
+    lengths come from `signals.indicators.warmup_bars` (see
+    `ResolvedIndicator.warmup_bars`).
+    """
+
+    name: str
+    label: str
+    func: Callable[..., pd.DataFrame]
+    inputs: Tuple[str, ...] = ("Close",)
+    outputs: Tuple[str, ...] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    signal: Optional[str] = None
+    traces: Tuple[TraceStyle, ...] = ()
+    choices: Dict[str, Tuple[Any, ...]] = field(default_factory=dict)
+
+    def resolve(self, overrides: Optional[Mapping[str, Any]] = None) -> "ResolvedIndicator":
+        params = {**self.params, **(overrides or {})}
+        fmt = {key: value for key, value in params.items() if isinstance(value, (int, float, str))}
+        outputs = tuple(col.format(**fmt) for col in self.outputs)
+        signal = self.signal.format(**fmt) if self.signal else None
+        traces = tuple(
+            TraceStyle(t.column.format(**fmt), t.name, t.line, t.secondary) for t in self.traces
+        )
+        return ResolvedIndicator(self, params, outputs, signal, traces)
+
+
+@dataclass(frozen=True)
+class ResolvedIndicator:
+    """An `IndicatorSpec` bound to concrete parameters."""
+
+    spec: IndicatorSpec
+    params: Dict[str, Any]
+    outputs: Tuple[str, ...]
+    signal: Optional[str]
+    traces: Tuple[TraceStyle, ...]
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def display_columns(self) -> Tuple[str, ...]:
+        """Outputs that are drawn or used as the signal."""
+        shown = {trace.column for trace in self.traces} | {self.signal}
+        return tuple(col for col in self.outputs if col in shown)
+
+    def warmup_bars(self, tol: float = LATEST_TOLERANCE) -> Optional[int]:
+        """`signals.indicators.warmup_bars` for these parameters (None: needs the whole history)."""
+        return warmup_bars(self.spec.func, tol, **self.params)
+
+    def compute(self, base: pd.DataFrame) -> pd.DataFrame:
+        """Run the indicator on just its input columns and return its outputs."""
+        work = float64_copy(base.loc[:, list(self.spec.inputs)])
+        result = self.spec.func(work, **self.params)
+        return result.loc[:, [col for col in result.columns if col not in self.spec.inputs]]
+
+    @property
+    def key(self) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        """Hashable identity of the indicator and its parameters."""
+        return self.name, tuple(sorted((param, repr(value)) for param, value in self.params.items()))
+
+    def compute_latest(self, base: pd.DataFrame, k: int = 1) -> pd.DataFrame:
+        """Like `compute` but only for the last ``k`` rows (see `latest_values`)."""
+        work = base.loc[:, list(self.spec.inputs)]
+        result = latest_values(work, self.spec.func, k=k, **self.params)
+        return result.loc[:, [col for col in result.columns if col not in self.spec.inputs]]
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {}
+
+# The band columns add_bollinger_bands writes, as templates filled from its parameters
+_BB_LOWER, _BB_MIDDLE, _BB_UPPER = bollinger_columns("{length}", "{std}")
+
+
+def register_indicator(spec: IndicatorSpec) -> IndicatorSpec:
+    """Add ``spec`` to the registry; later registrations replace earlier ones."""
+    INDICATORS[spec.name] = spec
+    return spec
+
+
+def get_indicator(name: str) -> IndicatorSpec:
+    try:
+        return INDICATORS[name]
+    except KeyError:
+        raise KeyError(f"Unknown indicator '{name}'. Registered: {', '.join(INDICATORS)}") from None
+
+
+class LazyIndicatorFrame:
+    """
+    Price frame whose indicator columns are computed on first read.
+
+    Only indicators listed in ``enabled`` (a list of names or a mapping of name to
+    parameter overrides) are available. Reading any output of an indicator runs
+    it once over its inputs and memoizes every column it produced.
+
+    Pass the same ``memo`` mapping to frames built over the same ``base`` (e.g.
+    across Streamlit reruns) to share computed outputs between them.
+
+    ``low_memory`` (default: `utils.memory.LOW_MEMORY`) narrows ``base`` and
+    every computed output with `compact_frame` and only exposes each
+    indicator's `display_columns`.
+    """
+
+    def __init__(
+        self,
+        base: pd.DataFrame,
+        enabled: Iterable[str] | Mapping[str, Mapping[str, Any]] = (),
+        registry: Optional[Mapping[str, IndicatorSpec]] = None,
+        memo: Optional[MutableMapping[Tuple, pd.DataFrame]] = None,
+        low_memory: Optional[bool] = None,
+    ):
+        registry = INDICATORS if registry is None else registry
+        if not isinstance(enabled, Mapping):
+            enabled = {name: {} for name in enabled}
+        self.low_memory = memory.LOW_MEMORY if low_memory is None else low_memory
+        self.base = memory.compact_frame(base.copy(deep=False)) if self.low_memory else base
+        self.indicators: List[ResolvedIndicator] = [
+            registry[name].resolve(overrides) for name, overrides in enabled.items()
+        ]
+        self._owner: Dict[str, ResolvedIndicator] = {
+            col: ind
+            for ind in self.indicators
+            for col in (ind.display_columns if self.low_memory else ind.outputs)
+        }
+        self._cache: Dict[str, pd.Series] = {}
+        self._latest: Dict[str, Any] = {}
+        self._computed: set = set()
+        self._memo = memo
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.base.columns or column in self._owner
+
+    @property
+    def index(self) -> pd.Index:
+        return self.base.index
+
+    @property
+    def columns(self) -> List[str]:
+        """Base columns followed by the declared outputs of enabled indicators."""
+        return list(self.base.columns) + [col for col in self._owner if col not in self.base.columns]
+
+    @property
+    def signal_columns(self) -> List[str]:
+        return [ind.signal for ind in self.indicators if ind.signal]
+
+    @property
+    def computed(self) -> List[str]:
+        """Names of the indicators that have been materialized so far."""
+        return [ind.name for ind in self.indicators if ind.name in self._computed]
+
+    def _materialize(self, indicator: ResolvedIndicator) -> None:
+        if indicator.name in self._computed:
+            return
+        outputs = self._memo.get(indicator.key) if self._memo is not None else None
+        if outputs is None:
+            with track(f"indicators.{indicator.name}") as recorder:
+                outputs = indicator.compute(self.base)
+                recorder.rows = len(outputs)
+            if self.low_memory:
+                outputs = memory.compact_frame(outputs, keep=indicator.display_columns)
+            if self._memo is not None:
+                self._memo[indicator.key] = outputs
+        for col in outputs.columns:
+            self._cache[col] = outputs[col]
+        self._computed.add(indicator.name)
+
+    def __getitem__(self, column: str) -> pd.Series:
+        if column in self._cache:
+            record_cache("indicators.lazy_frame", True)
+            return self._cache[column]
+        if column in self.base.columns:
+            return self.base[column]
+        indicator = self._owner.get(column)
+        if indicator is None:
+            raise KeyError(column)
+        record_cache("indicators.lazy_frame", False)
+        self._materialize(indicator)
+        if column not in self._cache:
+            raise KeyError(f"Indicator '{indicator.name}' did not produce column '{column}'.")
+        return self._cache[column]
+
+    def get(self, column: str, default=None):
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def latest(self, column: str, default=None):
+        """
+        Return the last value of ``column`` (or ``default`` if unavailable).
+
+        Indicators that have not been materialized are evaluated over their
+        warm-up window only, so reading KPI values never computes full history.
+        """
+        if len(self.base) == 0:
+            return default
+        if column in self._cache:
+            return self._cache[column].iloc[-1]
+        if column in self.base.columns:
+            return self.base[column].iloc[-1]
+        indicator = self._owner.get(column)
+        if indicator is None:
+            return default
+        if column not in self._latest:
+            row = indicator.compute_latest(self.base).iloc[-1]
+            self._latest.update(row.to_dict())
+        return self._latest.get(column, default)
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Materialize ``columns`` (default: everything enabled) into a DataFrame."""
+        columns = self.columns if columns is None else list(columns)
+        return pd.DataFrame({col: self[col] for col in columns}, index=self.base.index)
+
+
+register_indicator(
+    IndicatorSpec(
+        name="rsi",
+        label="Relative Strength Index",
+        func=add_rsi,
+        outputs=("RSI", "RSI_signal"),
+        params={"length": 14, "lower": RSI_OVERSOLD, "upper": RSI_OVERBOUGHT},
+        signal="RSI_signal",
+        traces=(TraceStyle("RSI", "RSI", dict(color="#9B7BFF", width=1.6, dash="dash"), secondary=True),),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="macd",
+        label="MACD (12-26-9)",
+        func=add_macd,
+        outputs=("MACD_12_26_9", "MACDh_12_26_9", "MACDs_12_26_9", "MACD_signal"),
+        signal="MACD_signal",
+        traces=(
+            TraceStyle("MACD_12_26_9", "MACD", dict(color="#4AF5C8", width=1.8), secondary=True),
+            TraceStyle("MACDs_12_26_9", "MACD Signal", dict(color="#FF9A76", width=1.5), secondary=True),
+        ),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="ma_cross",
+        label="Moving Average Crossover",
+        func=add_ma_cross,
+        outputs=("SMA_short", "SMA_long", "MA_signal"),
+        params={"short": 50, "long": 200},
+        signal="MA_signal",
+        traces=(
+            TraceStyle("SMA_short", "SMA Short", dict(color="#F5B74A", width=1.5)),
+            TraceStyle("SMA_long", "SMA Long", dict(color="#FF6F91", width=1.5)),
+        ),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="ema_cross",
+        label="EMA Crossover",
+        func=add_ema_cross,
+        outputs=("EMA_short", "EMA_long", "EMA_signal"),
+        params={"short": 12, "long": 26},
+        signal="EMA_signal",
+        traces=(
+            TraceStyle("EMA_short", "EMA Short", dict(color="#7FD1AE", width=1.4)),
+            TraceStyle("EMA_long", "EMA Long", dict(color="#C792EA", width=1.4)),
+        ),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="bbands",
+        label="Bollinger Bands",
+        func=add_bollinger_bands,
+        outputs=(_BB_LOWER, _BB_MIDDLE, _BB_UPPER, "BB_signal"),
+        params={"length": 20, "std": 2.0},
+        signal="BB_signal",
+        traces=(
+            TraceStyle(_BB_UPPER, "BB Upper", dict(color="rgba(95,215,255,0.35)", width=1.3)),
+            TraceStyle(_BB_LOWER, "BB Lower", dict(color="rgba(95,215,255,0.35)", width=1.3)),
+        ),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="donchian",
+        label="Donchian Channels",
+        func=add_donchian,
+        inputs=("High", "Low", "Close"),
+        outputs=("DCL_{length}", "DCM_{length}", "DCU_{length}", "DC_signal"),
+        params={"length": 20},
+        signal="DC_signal",
+        traces=(
+            TraceStyle("DCU_{length}", "Donchian Upper", dict(color="rgba(250,204,21,0.45)", width=1.2)),
+            TraceStyle("DCL_{length}", "Donchian Lower", dict(color="rgba(250,204,21,0.45)", width=1.2)),
+        ),
+        choices={"length": (20, 55)},
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="stochastic",
+        label="Stochastic (14-3-3)",
+        func=add_stochastic,
+        inputs=("High", "Low", "Close"),
+        outputs=("STOCHk_{length}_{d}_{smooth_k}", "STOCHd_{length}_{d}_{smooth_k}", "STOCH_signal"),
+        params={"length": 14, "d": 3, "smooth_k": 3, "lower": 20, "upper": 80},
+        signal="STOCH_signal",
+        traces=(
+            TraceStyle("STOCHk_{length}_{d}_{smooth_k}", "Stoch %K", dict(color="#38BDF8", width=1.3), secondary=True),
+            TraceStyle("STOCHd_{length}_{d}_{smooth_k}", "Stoch %D", dict(color="#F472B6", width=1.2, dash="dot"), secondary=True),
+        ),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="williams_r",
+        label="Williams %R",
+        func=add_williams_r,
+        inputs=("High", "Low", "Close"),
+        outputs=("WILLR_{length}", "WILLR_signal"),
+        params={"length": 14, "lower": -80, "upper": -20},
+        signal="WILLR_signal",
+        traces=(TraceStyle("WILLR_{length}", "Williams %R", dict(color="#A3E635", width=1.3), secondary=True),),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="atr",
+        label="Average True Range",
+        func=add_atr,
+        inputs=("High", "Low", "Close"),
+        outputs=("ATRr_{length}", "ATR_signal"),
+        params={"length": 14, "multiplier": 1.5},
+        signal="ATR_signal",
+        traces=(TraceStyle("ATRr_{length}", "ATR", dict(color="#FB923C", width=1.3), secondary=True),),
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="vwap",
+        label="VWAP",
+        func=add_vwap,
+        inputs=("High", "Low", "Close", "Volume"),
+        outputs=("VWAP",),
+        params={"anchor": "W"},
+        traces=(TraceStyle("VWAP", "VWAP", dict(color="#E2E8F0", width=1.4, dash="dot")),),
+        choices={"anchor": ("W", "D", "M")},
+    )
+)
+register_indicator(
+    IndicatorSpec(
+        name="rolling_vwap",
+        label="Rolling VWAP",
+        func=add_rolling_vwap,
+        inputs=("High", "Low", "Close", "Volume"),
+        outputs=("VWAP_{window}",),
+        params={"window": 20},
+        traces=(TraceStyle("VWAP_{window}", "Rolling VWAP", dict(color="#94A3B8", width=1.2, dash="dot")),),
+        choices={"window": (20, 50, 100)},
+    )
+)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.synthetic import generate_ohlcv
+from signals.archive import WARMUP_TOLERANCE, SignalArchive, signal_events
+from signals.indicators import add_macd, warmup_bars
+from signals.registry import LazyIndicatorFrame
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return SignalArchive(tmp_path / "archive.sqlite3")
+
+
+@pytest.fixture(scope="module")
+def prices():
+    return generate_ohlcv(1500, seed=3)
+
+
+def test_events_are_transitions(prices):
+    frame = LazyIndicatorFrame(prices, ["macd", "ma_cross"])
+    events = signal_events(frame)
+    macd = events[events["indicator"] == "macd"]
+    signal = frame["MACD_signal"]
+    flips = signal.ne(signal.shift(1)) & (np.arange(len(signal)) >= warmup_bars(add_macd, tol=WARMUP_TOLERANCE))
+    assert list(macd["timestamp"]) == list(signal.index[flips])
+    assert (macd["direction"].to_numpy()[1:] != macd["direction"].to_numpy()[:-1]).all()
+    crosses = events[events["indicator"] == "ma_cross"]
+    assert set(crosses["timestamp"]) == set(frame["MA_signal"].dropna().index)
+    assert macd["timestamp"].min() > prices.index[100]
+
+
+def test_range_query_by_year(archive, prices):
+    archive.record("BTC-USD", "1d", LazyIndicatorFrame(prices, ["rsi", "ma_cross"]))
+    year = prices.index[700].year
+    crosses = archive.query("BTC-USD", "ma_cross", start=str(year), end=str(year))
+    assert len(crosses) > 0
+    assert (crosses["timestamp"].dt.year == year).all()
+    assert set(crosses["direction"]) <= {"Buy", "Sell"}
+    expected = signal_events(LazyIndicatorFrame(prices, ["ma_cross"]))
+    expected = expected[expected["timestamp"].dt.year == year]
+    assert list(crosses["timestamp"]) == list(expected["timestamp"])
+    np.testing.assert_allclose(crosses["price"], expected["price"])
+    assert archive.query("ETH-USD", "ma_cross").empty
+
+
+def test_last_signal_per_indicator_and_params(archive, prices):
+    frame = LazyIndicatorFrame(prices, {"rsi": {}, "macd": {}, "ma_cross": {"short": 20, "long": 50}})
+    archive.record("BTC-USD", "1d", frame)
+    archive.record("BTC-USD", "1d", LazyIndicatorFrame(prices, ["ma_cross"]))
+    last = archive.last_signals("BTC-USD", "Buy")
+    assert len(last) == 4  # rsi, macd and two ma_cross parameter sets
+    events = signal_events(frame)
+    expected = events[events["direction"] == "Buy"].groupby("indicator")["timestamp"].max()
+    for row in last[last["params"] != '{"long": 200, "short": 50}'].itertuples():
+        assert row.timestamp == expected[row.indicator]
+    fast = archive.query("BTC-USD", "ma_cross", params={"short": 20, "long": 50})
+    assert len(fast) == len(events[events["indicator"] == "ma_cross"])
+
+
+def test_rerecording_is_idempotent_and_windows_start_clean(archive, prices):
+    full = LazyIndicatorFrame(prices, ["macd"])
+    assert archive.record("BTC-USD", "1d", full) == archive.count()
+    window = LazyIndicatorFrame(prices.iloc[-300:], ["macd"])
+    archive.record("BTC-USD", "1d", window)
+    # Events inside the window's warm-up are skipped, so nothing new is added
+    assert archive.count() == len(signal_events(full))
+    assert archive.latest_timestamp("BTC-USD") == signal_events(full)["timestamp"].max()
+
+
+def test_rerecording_drops_events_a_revised_last_bar_no_longer_shows(archive, prices):
+    events = signal_events(LazyIndicatorFrame(prices, ["macd"]))
+    for stamp in events["timestamp"]:
+        # The in-progress last bar crosses; a refresh moves its close back and the cross is gone
+        live = prices.loc[:stamp]
+        revised = live.copy()
+        revised.loc[stamp, "Close"] = live["Close"].iloc[-2]
+        if stamp not in set(signal_events(LazyIndicatorFrame(revised, ["macd"]))["timestamp"]):
+            break
+    archive.record("BTC-USD", "1d", LazyIndicatorFrame(live, ["macd"]))
+    assert archive.latest_timestamp("BTC-USD") == stamp
+
+    archive.record("BTC-USD", "1d", LazyIndicatorFrame(revised, ["macd"]))
+    assert stamp not in set(archive.query("BTC-USD", "macd")["timestamp"])
+    assert archive.count() == len(signal_events(LazyIndicatorFrame(revised, ["macd"])))
+
+
+def test_limit_and_timezone_aware_bounds(archive, prices):
+    archive.record("BTC-USD", "1d", LazyIndicatorFrame(prices, ["macd"]))
+    last3 = archive.query("BTC-USD", limit=3)
+    assert len(last3) == 3 and last3["timestamp"].is_monotonic_increasing
+    start = pd.Timestamp(last3["timestamp"].iloc[0]).tz_localize("UTC")
+    assert len(archive.query("BTC-USD", start=start)) == 3
+
+
+def test_only_live_downloads_are_archived(archive, prices, monkeypatch, capsys):
+    import data.fetch_btc as fetch_btc
+    from signals.archive import archivable, backfill
+
+    live = prices.copy()
+    live.attrs["price_source"] = "yfinance"
+    archive.record("BTC-USD", "1d", LazyIndicatorFrame(live, ["macd"]))
+    before = archive.count()
+    assert archivable(live) and not archivable(prices)
+
+    monkeypatch.setattr(fetch_btc, "_yfinance", lambda: None)  # offline: synthetic bars
+    assert backfill(archive, ["BTC-USD"], ["1h"], 3650, ["macd"]) == {}
+    assert "Skipping BTC-USD 1h: no live prices (synthetic)" in capsys.readouterr().out
+    assert archive.count() == before
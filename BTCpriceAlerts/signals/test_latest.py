@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals.indicators import (
+    LATEST_TOLERANCE,
+    add_atr,
+    add_bollinger_bands,
+    add_donchian,
+    add_ema_cross,
+    add_macd,
+    add_ma_cross,
+    add_rolling_vwap,
+    add_rsi,
+    add_stochastic,
+    add_vwap,
+    add_williams_r,
+    latest_values,
+    warmup_bars,
+)
+from signals.registry import LazyIndicatorFrame
+
+
+@pytest.fixture()
+def price_data():
+    rng = np.random.default_rng(9)
+    n = 2000
+    close = 30000 + np.cumsum(rng.normal(0, 150, n))
+    return pd.DataFrame(
+        {
+            "High": close + 60,
+            "Low": close - 60,
+            "Close": close,
+            "Volume": rng.uniform(100, 300, n),
+        },
+        index=pd.date_range("2020-01-01", periods=n, freq="h", name="Date"),
+    )
+
+
+@pytest.mark.parametrize(
+    "func,params",
+    [
+        (add_rsi, {}),
+        (add_macd, {}),
+        (add_ma_cross, {}),
+        (add_ema_cross, {}),
+        (add_bollinger_bands, {}),
+        (add_rolling_vwap, {"window": 48}),
+        (add_vwap, {"anchor": "W"}),
+        (add_donchian, {"length": 55}),
+        (add_stochastic, {}),
+        (add_williams_r, {}),
+        (add_atr, {}),
+    ],
+)
+def test_latest_values_match_full_history(price_data, func, params):
+    full = func(price_data.copy(), **params).iloc[-5:]
+    fast = latest_values(price_data, func, k=5, **params)
+
+    assert list(fast.index) == list(full.index)
+    price_scale = price_data["Close"].max() - price_data["Close"].min()
+    for col in full.columns:
+        if not pd.api.types.is_numeric_dtype(full[col]):
+            assert list(fast[col].fillna("Neutral")) == list(full[col].fillna("Neutral")), col
+        else:
+            np.testing.assert_allclose(fast[col], full[col], atol=LATEST_TOLERANCE * price_scale, err_msg=col)
+
+
+def test_warmup_is_much_shorter_than_history(price_data):
+    assert warmup_bars(add_ma_cross) == 201
+    assert warmup_bars(add_macd) < 300
+    assert warmup_bars(add_vwap) is None
+
+
+def test_lazy_frame_latest_skips_full_materialization(price_data):
+    frame = LazyIndicatorFrame(price_data, ["rsi", "ma_cross"])
+
+    rsi = frame.latest("RSI")
+    assert frame.computed == []
+    assert rsi == pytest.approx(add_rsi(price_data.copy())["RSI"].iloc[-1])
+    assert frame.latest("EMA_signal", "Neutral") == "Neutral"
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals import indicators
+from signals.indicators import add_bollinger_bands, add_ma_cross, add_rsi, warmup_bars
+from signals.registry import INDICATORS, IndicatorSpec, LazyIndicatorFrame
+
+
+@pytest.fixture()
+def price_data():
+    rng = np.random.default_rng(5)
+    close = 30000 + np.cumsum(rng.normal(0, 100, 300))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 50,
+            "Low": close - 50,
+            "Close": close,
+            "Volume": rng.uniform(100, 200, 300),
+        },
+        index=pd.date_range("2023-01-01", periods=300, name="Date"),
+    )
+
+
+def test_columns_are_computed_on_first_read(price_data):
+    frame = LazyIndicatorFrame(price_data, ["rsi", "macd", "ma_cross"])
+
+    assert frame.computed == []
+    assert "MA_signal" in frame.columns
+    rsi = frame["RSI"]
+    assert frame.computed == ["rsi"]
+    assert frame["RSI"] is rsi
+    pd.testing.assert_series_equal(rsi, add_rsi(price_data.copy())["RSI"])
+
+
+def test_parameter_overrides_resolve_output_names(price_data):
+    frame = LazyIndicatorFrame(price_data, {"bbands": {"length": 10}, "rolling_vwap": {"window": 50}})
+    expected = add_bollinger_bands(price_data.copy(), length=10, std=2.0)
+
+    assert frame.signal_columns == ["BB_signal"]
+    np.testing.assert_allclose(frame["BBU_10_2.0"], expected["BBU_10_2.0"])
+    assert frame["VWAP_50"].notna().sum() == len(price_data) - 49
+
+
+def test_bollinger_outputs_match_pandas_ta_names(price_data, monkeypatch):
+    class FakeTa:
+        # Newer pandas_ta releases repeat the deviation in every column name
+        @staticmethod
+        def bbands(close, length, std):
+            bands = indicators._bollinger(close, length, std)
+            return bands.rename(columns=lambda col: f"{col}_{std}").assign(**{f"BBB_{length}_{std}_{std}": 1.0})
+
+    monkeypatch.setattr(indicators, "_ta", lambda: FakeTa)
+    frame = LazyIndicatorFrame(price_data, {"bbands": {"length": 10}})
+    assert frame.latest("BBU_10_2.0") > frame.latest("BBL_10_2.0")
+    assert frame["BB_signal"].isin(["Buy", "Sell"]).any()
+
+
+def test_warmup_comes_from_the_indicator_functions():
+    ma_cross = INDICATORS["ma_cross"].resolve({"long": 100})
+    assert ma_cross.warmup_bars() == warmup_bars(add_ma_cross, long=100) == 101
+    assert INDICATORS["vwap"].resolve().warmup_bars() is None
+
+
+def test_unknown_and_disabled_columns(price_data):
+    frame = LazyIndicatorFrame(price_data, ["rsi"])
+
+    assert frame.latest("MACD_signal", "Neutral") == "Neutral"
+    with pytest.raises(KeyError):
+        frame["MACD_12_26_9"]
+
+
+def test_custom_registry(price_data):
+    def add_range(df):
+        df["Range"] = df["High"] - df["Low"]
+        return df
+
+    registry = {**INDICATORS, "range": IndicatorSpec("range", "Range", add_range, inputs=("High", "Low"), outputs=("Range",))}
+    frame = LazyIndicatorFrame(price_data, ["range"], registry=registry)
+
+    assert frame.to_frame(["Close", "Range"])["Range"].eq(100).all()
+
+
+def test_memo_is_shared_between_frames(price_data, monkeypatch):
+    memo = {}
+    first = LazyIndicatorFrame(price_data, ["rsi"], memo=memo)["RSI"]
+
+    monkeypatch.setattr("signals.registry.ResolvedIndicator.compute", pytest.fail)
+    again = LazyIndicatorFrame(price_data, ["rsi"], memo=memo)
+    assert again["RSI"].equals(first)
+
+
+def test_low_memory_drift_is_bounded(price_data):
+    full = LazyIndicatorFrame(price_data, list(INDICATORS), low_memory=False)
+    low = LazyIndicatorFrame(price_data, list(INDICATORS), low_memory=True)
+    scale = price_data["Close"].abs().max()
+
+    assert "MACDh_12_26_9" in full.columns and "MACDh_12_26_9" not in low.columns
+    for col in low.columns:
+        if low[col].dtype.kind == "f":
+            assert low[col].dtype == np.float32
+            # Price-scale outputs keep float32 precision; RSI is on a 0-100 scale
+            tolerance = 1e-3 if col == "RSI" else 2e-7 * scale
+            np.testing.assert_allclose(low[col], full[col], rtol=0, atol=tolerance, err_msg=col)
+        else:
+            mismatched = low[col].astype(object).fillna("Neutral") != full[col].fillna("Neutral")
+            assert mismatched.mean() <= 0.01, col
+    assert low.latest("RSI") == pytest.approx(full.latest("RSI"), abs=1e-3)
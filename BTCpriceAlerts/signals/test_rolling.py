@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.synthetic import generate_ohlcv
+from signals.indicators import add_atr, add_donchian, add_stochastic, add_williams_r
+from signals.rolling import (
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_quantile,
+    rolling_true_range,
+    true_range,
+    wilder_mean,
+)
+
+
+@pytest.fixture(scope="module")
+def values():
+    rng = np.random.default_rng(5)
+    x = np.cumsum(rng.normal(size=1003))
+    x[[10, 500, 501]] = np.nan
+    return x
+
+
+@pytest.fixture(scope="module")
+def bars():
+    return generate_ohlcv(600, seed=11)
+
+
+@pytest.mark.parametrize("window", [1, 2, 7, 20, 1003, 2000])
+@pytest.mark.parametrize("name", ["max", "min", "mean"])
+def test_matches_pandas_rolling(values, window, name):
+    ours = {"max": rolling_max, "min": rolling_min, "mean": rolling_mean}[name](values, window)
+    expected = getattr(pd.Series(values).rolling(window), name)().to_numpy()
+    np.testing.assert_allclose(ours, expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [5, 20, 60])
+@pytest.mark.parametrize("q", [0.0, 0.1, 0.5, 0.93, 1.0])
+def test_quantile_matches_pandas(values, window, q):
+    expected = pd.Series(values).rolling(window).quantile(q).to_numpy()
+    np.testing.assert_allclose(rolling_quantile(values, window, q), expected, equal_nan=True)
+
+
+def test_true_range_and_wilder_mean(bars):
+    high, low, close = (bars[col].to_numpy() for col in ("High", "Low", "Close"))
+    prev = bars["Close"].shift(1)
+    expected = pd.concat([bars["High"] - bars["Low"], (bars["High"] - prev).abs(), (bars["Low"] - prev).abs()], axis=1)
+    np.testing.assert_allclose(true_range(high, low, close), expected.max(axis=1))
+
+    seeded, smoothed = np.mean(close[:14]), []
+    for value in close[14:]:
+        seeded += (value - seeded) / 14
+        smoothed.append(seeded)
+    atr = wilder_mean(close, 14)
+    assert np.isnan(atr[:13]).all()
+    np.testing.assert_allclose(atr[13], close[:14].mean())
+    np.testing.assert_allclose(atr[14:], smoothed)
+
+    window_range = rolling_true_range(high, low, close, 10)
+    np.testing.assert_allclose(window_range[50], max(high[41:51].max(), close[40:50].max()) - min(low[41:51].min(), close[40:50].min()))
+
+
+def test_wilder_mean_of_length_one_is_the_input(bars, values):
+    np.testing.assert_array_equal(wilder_mean(values, 1), values)
+
+    with np.errstate(all="raise"):
+        df = add_atr(bars.copy(), length=1)
+    high, low, close = (bars[col].to_numpy() for col in ("High", "Low", "Close"))
+    np.testing.assert_allclose(df["ATRr_1"], true_range(high, low, close))
+    assert df["ATRr_1"].iloc[1:].notna().all()
+
+
+def test_range_indicators_match_pandas_definitions(bars):
+    df = add_williams_r(add_stochastic(add_donchian(bars.copy())))
+    highest14 = bars["High"].rolling(14).max()
+    lowest14 = bars["Low"].rolling(14).min()
+    np.testing.assert_allclose(df["DCU_20"], bars["High"].rolling(20).max(), equal_nan=True)
+    np.testing.assert_allclose(df["DCL_20"], bars["Low"].rolling(20).min(), equal_nan=True)
+    raw_k = 100 * (bars["Close"] - lowest14) / (highest14 - lowest14)
+    stoch_k = raw_k.rolling(3).mean()
+    np.testing.assert_allclose(df["STOCHk_14_3_3"], stoch_k, equal_nan=True)
+    np.testing.assert_allclose(df["STOCHd_14_3_3"], stoch_k.rolling(3).mean(), equal_nan=True)
+    np.testing.assert_allclose(df["WILLR_14"], -100 * (highest14 - bars["Close"]) / (highest14 - lowest14), equal_nan=True)
+
+
+def test_range_indicator_signals(bars):
+    df = add_atr(add_williams_r(add_stochastic(add_donchian(bars.copy()))))
+    for column in ("DC_signal", "STOCH_signal", "WILLR_signal", "ATR_signal"):
+        assert set(df[column].dropna()) <= {"Buy", "Sell"}
+        assert df[column].notna().any(), column
+    breakout = df["Close"] > df["DCU_20"].shift(1)
+    assert (df["DC_signal"] == "Buy").equals(breakout)
+    assert ((df["WILLR_signal"] == "Buy") == (df["WILLR_14"] < -80)).all()
+    move = df["Close"].diff()
+    assert ((df["ATR_signal"] == "Sell") == (move < -1.5 * df["ATRr_14"].shift(1))).all()
+
+
+def test_rejects_bad_windows():
+    with pytest.raises(ValueError):
+        rolling_max([1.0, 2.0], 0)
+    with pytest.raises(ValueError):
+        rolling_quantile([1.0, 2.0], 2, 1.5)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals.indicators import StreamingVWAP, add_rolling_vwap, add_vwap
+
+
+@pytest.fixture()
+def hourly_bars():
+    rng = np.random.default_rng(3)
+    n = 24 * 10
+    close = 30000 + np.cumsum(rng.normal(0, 40, n))
+    df = pd.DataFrame(
+        {
+            "High": close + 25,
+            "Low": close - 25,
+            "Close": close,
+            "Volume": rng.uniform(1, 50, n),
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq="h", name="Date"),
+    )
+    return df
+
+
+def _groupby_vwap(df, key):
+    typical = (df["High"] + df["Low"] + df["Close"]) / 3
+    pv = (typical * df["Volume"]).groupby(key).cumsum()
+    return pv / df["Volume"].groupby(key).cumsum()
+
+
+def test_session_vwap_resets_daily(hourly_bars):
+    enriched = add_vwap(hourly_bars.copy(), anchor="D")
+    expected = _groupby_vwap(hourly_bars, hourly_bars.index.date)
+
+    np.testing.assert_allclose(enriched["VWAP"], expected, rtol=1e-9)
+    first_of_day = enriched.index.hour == 0
+    typical = (hourly_bars["High"] + hourly_bars["Low"] + hourly_bars["Close"]) / 3
+    np.testing.assert_allclose(enriched.loc[first_of_day, "VWAP"], typical[first_of_day])
+
+
+def test_vwap_custom_anchors(hourly_bars):
+    anchors = [pd.Timestamp("2024-01-03 12:00"), pd.Timestamp("2024-01-07 06:00")]
+    enriched = add_vwap(hourly_bars.copy(), anchor=anchors)
+    segment = np.searchsorted(pd.DatetimeIndex(anchors).asi8, hourly_bars.index.asi8, side="right")
+
+    np.testing.assert_allclose(enriched["VWAP"], _groupby_vwap(hourly_bars, segment), rtol=1e-9)
+
+
+def test_rolling_vwap_matches_pandas(hourly_bars):
+    enriched = add_rolling_vwap(hourly_bars.copy(), window=20)
+    typical = (hourly_bars["High"] + hourly_bars["Low"] + hourly_bars["Close"]) / 3
+    expected = (typical * hourly_bars["Volume"]).rolling(20).sum() / hourly_bars["Volume"].rolling(20).sum()
+
+    np.testing.assert_allclose(enriched["VWAP_20"], expected, rtol=1e-9)
+    assert enriched["VWAP_20"].iloc[:19].isna().all()
+
+
+@pytest.mark.parametrize("anchor,window,column", [("D", None, "VWAP"), (None, 20, "VWAP_20")])
+def test_streaming_vwap_matches_vectorized(hourly_bars, anchor, window, column):
+    if window:
+        expected = add_rolling_vwap(hourly_bars.copy(), window=window)[column]
+    else:
+        expected = add_vwap(hourly_bars.copy(), anchor=anchor)[column]
+
+    stream = StreamingVWAP(anchor=anchor, window=window)
+    values = [
+        stream.update(ts, row.High, row.Low, row.Close, row.Volume)
+        for ts, row in zip(hourly_bars.index, hourly_bars.itertuples())
+    ]
+
+    np.testing.assert_allclose(values, expected, rtol=1e-9)
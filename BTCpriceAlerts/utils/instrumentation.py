@@ -0,0 +1,280 @@
+"""
+Lightweight timing instrumentation for the fetch → indicator → chart path.
+
+Instrumentation is off by default (or on with ``BTC_METRICS=1``). While off,
+`timed` wrappers cost one global flag check and `track` yields a shared no-op
+recorder, so the hooks can stay on hot functions permanently.
+
+Metrics are process-wide and only ever accumulate while recording, so
+several viewers (a Prometheus scrape, a benchmark) can read them at once; a
+viewer interested in one stretch of time takes a `snapshot` before it and
+`diff`s against it afterwards.
+
+A Streamlit session wants its own calls only, and only on the reruns that
+show its debug panel: `begin_capture` records the calls made on the current
+thread (a session's script thread) into a private table, even while
+process-wide recording is off, until `end_capture` returns it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+_enabled = os.environ.get("BTC_METRICS", "") not in ("", "0")
+_log_path: Optional[Path] = None
+_lock = threading.Lock()
+
+
+@dataclass
+class Metric:
+    """Aggregated measurements for one instrumented operation."""
+
+    name: str
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+    rows: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+_metrics: Dict[str, Metric] = {}
+# Private tables of the threads inside `begin_capture`, by thread id
+_captures: Dict[int, Dict[str, Metric]] = {}
+
+
+def enable(log_path: Union[str, Path, None] = None) -> None:
+    """Turn recording on; ``log_path`` (kept until replaced) appends every event as a JSON line."""
+    global _enabled, _log_path
+    _enabled = True
+    if log_path:
+        _log_path = Path(log_path)
+
+
+def disable() -> None:
+    """Turn recording off and stop the JSON-lines log."""
+    global _enabled, _log_path
+    _enabled = False
+    _log_path = None
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _metrics.clear()
+
+
+def begin_capture() -> None:
+    """Record this thread's calls into a fresh private table (see `end_capture`)."""
+    with _lock:
+        _captures[threading.get_ident()] = {}
+
+
+def end_capture() -> List[Dict]:
+    """
+    Stop capturing on this thread and return what was captured, as `snapshot`
+    rows; empty if no capture was open (so it also closes one left open by an
+    interrupted run).
+    """
+    with _lock:
+        table = _captures.pop(threading.get_ident(), {})
+    return _rows(table)
+
+
+def _tables() -> List[Dict[str, Metric]]:
+    """The tables this thread records into; call with ``_lock`` held."""
+    tables = [_metrics] if _enabled else []
+    captured = _captures.get(threading.get_ident())
+    if captured is not None:
+        tables.append(captured)
+    return tables
+
+
+def _metric(table: Dict[str, Metric], name: str) -> Metric:
+    metric = table.get(name)
+    if metric is None:
+        metric = table[name] = Metric(name)
+    return metric
+
+
+def _log(event: Dict) -> None:
+    if _log_path is None:
+        return
+    event["ts"] = time.time()
+    with _log_path.open("a") as handle:
+        handle.write(json.dumps(event) + "\n")
+
+
+def record(name: str, seconds: float, rows: Optional[int] = None) -> None:
+    """Add one timed call of ``name`` to the metrics."""
+    if not (_enabled or _captures):
+        return
+    with _lock:
+        for table in _tables():
+            metric = _metric(table, name)
+            metric.calls += 1
+            metric.total_seconds += seconds
+            metric.last_seconds = seconds
+            metric.max_seconds = max(metric.max_seconds, seconds)
+            if rows:
+                metric.rows += rows
+        if _enabled:
+            _log({"op": name, "seconds": seconds, "rows": rows})
+
+
+def record_cache(name: str, hit: bool) -> None:
+    """Count a cache hit or miss for ``name``."""
+    if not (_enabled or _captures):
+        return
+    with _lock:
+        for table in _tables():
+            metric = _metric(table, name)
+            if hit:
+                metric.cache_hits += 1
+            else:
+                metric.cache_misses += 1
+        if _enabled:
+            _log({"op": name, "cache_hit": hit})
+
+
+class _Recorder:
+    __slots__ = ("rows",)
+
+    def __init__(self) -> None:
+        self.rows: Optional[int] = None
+
+
+_NOOP = _Recorder()
+
+
+@contextmanager
+def track(name: str):
+    """
+    Time the enclosed block as ``name``.
+
+    The yielded recorder accepts ``recorder.rows = n`` to attach a row count.
+    """
+    if not (_enabled or _captures):
+        yield _NOOP
+        return
+    recorder = _Recorder()
+    start = time.perf_counter()
+    try:
+        yield recorder
+    finally:
+        record(name, time.perf_counter() - start, recorder.rows)
+
+
+def _row_count(result, args) -> Optional[int]:
+    for candidate in (result, *args):
+        shape = getattr(candidate, "shape", None)
+        if shape:
+            return int(shape[0])
+    return None
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording duration and row count of every call.
+
+    Rows come from the first DataFrame-like value among the result and the
+    positional arguments.
+    """
+
+    def decorate(func: Callable) -> Callable:
+        label = name or f"{func.__module__}.{func.__name__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (_enabled or _captures):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            record(label, time.perf_counter() - start, _row_count(result, args))
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def snapshot() -> List[Dict]:
+    """Return the current metrics as plain dicts, slowest total first."""
+    return _rows(_metrics)
+
+
+def _rows(table: Dict[str, Metric]) -> List[Dict]:
+    with _lock:
+        rows = [dict(asdict(m), mean_seconds=m.mean_seconds) for m in table.values()]
+    return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+
+def diff(before: List[Dict], after: Optional[List[Dict]] = None) -> List[Dict]:
+    """
+    What was recorded between two snapshots (``after`` defaults to now), for
+    operations with new calls or cache lookups. Counters and totals are
+    differences; ``max_seconds`` and ``last_seconds`` are those of ``after``.
+    """
+    after = snapshot() if after is None else after
+    baseline = {row["name"]: row for row in before}
+    counters = ("calls", "total_seconds", "rows", "cache_hits", "cache_misses")
+    rows = []
+    for row in after:
+        previous = baseline.get(row["name"])
+        if previous is not None:
+            row = dict(row, **{key: row[key] - previous[key] for key in counters})
+        if row["calls"] or row["cache_hits"] or row["cache_misses"]:
+            row["mean_seconds"] = row["total_seconds"] / row["calls"] if row["calls"] else 0.0
+            rows.append(row)
+    return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+
+def export_json(path: Union[str, Path, None] = None, metrics: Optional[List[Dict]] = None) -> str:
+    """Serialize ``metrics`` (default `snapshot`) to JSON, optionally writing it to ``path``."""
+    metrics = snapshot() if metrics is None else metrics
+    payload = json.dumps({"generated_at": time.time(), "metrics": metrics}, indent=2)
+    if path is not None:
+        Path(path).write_text(payload)
+    return payload
+
+
+def export_prometheus(prefix: str = "btc_signal", metrics: Optional[List[Dict]] = None) -> str:
+    """
+    Render ``metrics`` (default `snapshot`) in the Prometheus text exposition
+    format: durations as a ``summary`` (``_sum`` and ``_count`` series), the
+    rest as counters and a gauge.
+    """
+    # (family, type, ((sample suffix, field), ...))
+    families = (
+        ("duration_seconds", "summary", (("_sum", "total_seconds"), ("_count", "calls"))),
+        ("duration_seconds_max", "gauge", (("", "max_seconds"),)),
+        ("rows_total", "counter", (("", "rows"),)),
+        ("cache_hits_total", "counter", (("", "cache_hits"),)),
+        ("cache_misses_total", "counter", (("", "cache_misses"),)),
+    )
+    metrics = snapshot() if metrics is None else metrics
+    lines = []
+    for family, kind, samples in families:
+        metric_name = f"{prefix}_{family}"
+        lines.append(f"# TYPE {metric_name} {kind}")
+        for row in metrics:
+            op = row["name"].replace("\\", "\\\\").replace('"', '\\"')
+            for suffix, field_name in samples:
+                lines.append(f'{metric_name}{suffix}{{op="{op}"}} {row[field_name]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,112 @@
+"""
+Opt-in low-memory storage for price and indicator frames.
+
+With ``BTC_LOW_MEMORY=1`` (or ``low_memory=True`` on `LazyIndicatorFrame`)
+float64 columns are stored as float32 wherever the round trip keeps
+``FLOAT32_RTOL`` relative precision, signal columns become categoricals, and
+indicator intermediates that are neither drawn nor used as signals are dropped.
+Indicators are still computed in float64; only what is kept is narrowed.
+
+    python -m utils.memory --rows 1000000    # per-column report, default vs. low-memory
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+LOW_MEMORY = os.environ.get("BTC_LOW_MEMORY", "") not in ("", "0")
+# float32 keeps ~7 significant digits (relative spacing 6e-8)
+FLOAT32_RTOL = 1e-6
+SIGNAL_CATEGORIES = ("Buy", "Sell", "Neutral")
+
+_FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+def float32_safe(values: np.ndarray, rtol: float = FLOAT32_RTOL) -> bool:
+    """Whether ``values`` survive a float32 round trip within ``rtol``."""
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return True
+    if np.abs(finite).max() >= _FLOAT32_MAX:
+        return False
+    narrowed = finite.astype(np.float32).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        error = np.abs(narrowed - finite) / np.abs(finite)
+    # Values that are exactly zero round-trip exactly; NaN error means 0/0
+    return bool(np.nanmax(error, initial=0.0) <= rtol)
+
+
+def _is_signal(series: pd.Series) -> bool:
+    if series.dtype != object and not pd.api.types.is_string_dtype(series.dtype):
+        return False
+    values = pd.unique(series.dropna())
+    return len(values) <= len(SIGNAL_CATEGORIES) and set(values) <= set(SIGNAL_CATEGORIES)
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    keep: Optional[Iterable[str]] = None,
+    rtol: float = FLOAT32_RTOL,
+) -> pd.DataFrame:
+    """
+    Narrow ``df`` column by column, in place, and return it.
+
+    Columns not in ``keep`` (when given) are dropped. float64 columns become
+    float32 when `float32_safe`; Buy/Sell/Neutral columns become categoricals
+    with `SIGNAL_CATEGORIES`, so ``fillna("Neutral")`` keeps working.
+    Each column is replaced on its own, so the frame is never copied whole.
+    """
+    if keep is not None:
+        keep = set(keep)
+        drop = [col for col in df.columns if col not in keep]
+        if drop:
+            df.drop(columns=drop, inplace=True)
+    for col in list(df.columns):
+        series = df[col]
+        if series.dtype == np.float64:
+            if float32_safe(series.to_numpy(), rtol):
+                df[col] = series.astype(np.float32)
+        elif _is_signal(series):
+            df[col] = pd.Categorical(series, categories=SIGNAL_CATEGORIES)
+    return df
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Bytes per column (index first), with dtype and share of the total."""
+    usage = df.memory_usage(deep=True)
+    dtypes = pd.Series({"Index": df.index.dtype, **df.dtypes.to_dict()})
+    report = pd.DataFrame({"dtype": dtypes.astype(str), "bytes": usage})
+    report["share"] = report["bytes"] / report["bytes"].sum()
+    return report.rename_axis("column")
+
+
+def format_memory_report(report: pd.DataFrame) -> str:
+    lines = [f"{'column':<20} {'dtype':<16} {'MB':>10} {'share':>7}"]
+    for column, row in report.iterrows():
+        lines.append(f"{column:<20} {row['dtype']:<16} {row['bytes'] / 2**20:>10.2f} {row['share']:>7.1%}")
+    lines.append(f"{'total':<20} {'':<16} {report['bytes'].sum() / 2**20:>10.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    from data.synthetic import generate_ohlcv
+    from signals.registry import INDICATORS, LazyIndicatorFrame
+
+    parser = argparse.ArgumentParser(description="Per-column memory of an indicator frame.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    base = generate_ohlcv(args.rows, freq="min")
+    for low_memory in (False, True):
+        frame = LazyIndicatorFrame(base, list(INDICATORS), low_memory=low_memory).to_frame()
+        print(f"\nlow_memory={low_memory}")
+        print(format_memory_report(memory_report(frame)))
+
+
+if __name__ == "__main__":
+    main()
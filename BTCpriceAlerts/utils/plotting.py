@@ -1,6 +1,9 @@
 import plotly.graph_objects as go
 
+from utils.instrumentation import timed
 
+
+@timed()
 def plot_dual_axis(df, x_col, y1_col, y2_col, y1_name="Primary", y2_name="Secondary"):
     """
     Plots two y-axes: one for BTC price, one for macro indicator.
@@ -36,6 +39,7 @@ def plot_dual_axis(df, x_col, y1_col, y2_col, y1_name="Primary", y2_name="Second
     return fig
 
 
+@timed()
 def plot_candlestick(
     df,
     open_col="Open",
@@ -76,3 +80,27 @@ def plot_candlestick(
     )
 
     return fig
+
+
+@timed()
+def add_indicator_traces(fig, frame, indicators):
+    """
+    Add the registered overlay traces of ``indicators`` to ``fig``.
+
+    ``frame`` may be a DataFrame or a `LazyIndicatorFrame`; only the columns
+    drawn here are materialized.
+    """
+    for indicator in indicators:
+        for trace in indicator.traces:
+            if trace.column not in frame:
+                continue
+            fig.add_trace(
+                go.Scatter(
+                    x=frame.index,
+                    y=frame[trace.column],
+                    name=trace.name,
+                    yaxis="y2" if trace.secondary else "y",
+                    line=trace.line,
+                )
+            )
+    return fig
@@ -0,0 +1,106 @@
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from utils import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    instrumentation.reset()
+    yield
+    instrumentation.end_capture()
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_records_nothing():
+    instrumentation.disable()
+
+    @instrumentation.timed("noop")
+    def noop():
+        return 1
+
+    assert noop() == 1
+    with instrumentation.track("block"):
+        pass
+    instrumentation.record_cache("cache", True)
+    assert instrumentation.snapshot() == []
+
+
+def test_timed_records_rows_and_cache(tmp_path):
+    log_path = tmp_path / "metrics.jsonl"
+    instrumentation.enable(log_path=log_path)
+
+    @instrumentation.timed("frame.build")
+    def build(n):
+        return pd.DataFrame({"x": range(n)})
+
+    build(5)
+    build(7)
+    with instrumentation.track("block") as recorder:
+        recorder.rows = 3
+    instrumentation.record_cache("block", hit=True)
+
+    metrics = {row["name"]: row for row in instrumentation.snapshot()}
+    assert metrics["frame.build"]["calls"] == 2
+    assert metrics["frame.build"]["rows"] == 12
+    assert metrics["block"]["cache_hits"] == 1
+    assert len(log_path.read_text().splitlines()) == 4
+
+    exported = json.loads(instrumentation.export_json())
+    assert {row["name"] for row in exported["metrics"]} == {"frame.build", "block"}
+
+    prometheus = instrumentation.export_prometheus()
+    assert "# TYPE btc_signal_duration_seconds summary" in prometheus
+    assert "_count counter" not in prometheus
+    assert 'btc_signal_duration_seconds_count{op="frame.build"} 2' in prometheus
+    assert 'btc_signal_rows_total{op="block"} 3' in prometheus
+
+
+def test_enable_keeps_the_log_and_diff_scopes_a_view(tmp_path):
+    log_path = tmp_path / "metrics.jsonl"
+    instrumentation.enable(log_path=log_path)
+    instrumentation.record("fetch", 0.5, rows=10)
+    before = instrumentation.snapshot()
+
+    # Another session opening its panel neither resets nor stops the log
+    instrumentation.enable()
+    instrumentation.record("fetch", 0.25, rows=4)
+    instrumentation.record_cache("frames", hit=False)
+
+    assert len(log_path.read_text().splitlines()) == 3
+    assert {row["name"]: row["calls"] for row in instrumentation.snapshot()} == {"fetch": 2, "frames": 0}
+    view = {row["name"]: row for row in instrumentation.diff(before)}
+    assert view["fetch"]["calls"] == 1 and view["fetch"]["rows"] == 4
+    assert view["fetch"]["mean_seconds"] == 0.25
+    assert view["frames"]["cache_misses"] == 1
+    assert instrumentation.diff(instrumentation.snapshot()) == []
+
+
+def test_a_capture_sees_only_its_own_thread_and_leaves_recording_off():
+    instrumentation.begin_capture()
+
+    @instrumentation.timed("render")
+    def render():
+        return pd.DataFrame({"x": range(3)})
+
+    render()
+    other = threading.Thread(target=lambda: instrumentation.record("other session", 1.0))
+    other.start()
+    other.join()
+    instrumentation.record_cache("frames", hit=True)
+
+    captured = {row["name"]: row for row in instrumentation.end_capture()}
+    assert set(captured) == {"render", "frames"}
+    assert captured["render"]["calls"] == 1 and captured["render"]["rows"] == 3
+    assert instrumentation.snapshot() == [] and not instrumentation.is_enabled()
+    assert 'btc_signal_cache_hits_total{op="frames"} 1' in instrumentation.export_prometheus(
+        metrics=list(captured.values())
+    )
+
+    # Nothing is captured once the capture ends, and ending it twice is harmless
+    render()
+    assert instrumentation.end_capture() == []
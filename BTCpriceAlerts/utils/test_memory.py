@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from utils.memory import compact_frame, float32_safe, memory_report
+
+
+def test_compact_narrows_in_place():
+    df = pd.DataFrame(
+        {
+            "Close": np.linspace(20000, 70000, 100),
+            "Huge": np.full(100, 1e300),
+            "Signal": np.where(np.arange(100) % 3, "Buy", None),
+            "Note": ["x"] * 100,
+        }
+    )
+    result = compact_frame(df, keep=["Close", "Huge", "Signal"])
+
+    assert result is df
+    assert list(df.columns) == ["Close", "Huge", "Signal"]
+    assert df["Close"].dtype == np.float32
+    assert df["Huge"].dtype == np.float64
+    assert list(df["Signal"].cat.categories) == ["Buy", "Sell", "Neutral"]
+    assert df["Signal"].fillna("Neutral").iloc[0] == "Neutral"
+
+
+def test_float32_safe_limits():
+    assert float32_safe(np.array([np.nan, 0.0, 1.5, -3e4]))
+    assert not float32_safe(np.array([1e-42]))
+    assert not float32_safe(np.array([1e39]))
+
+
+def test_memory_report_halves_floats():
+    df = pd.DataFrame({"Close": np.arange(1000, dtype=float)})
+    before = memory_report(df).loc["Close", "bytes"]
+    after = memory_report(compact_frame(df))
+
+    assert after.loc["Close", "bytes"] == before // 2
+    assert list(after.index) == ["Index", "Close"]
+    assert after["share"].sum() == 1.0